@@ -1,12 +1,13 @@
 from django.contrib import admin
 
-from articles.models import Author, Outlet, Category, Article
+from articles.models import Author, Outlet, Category, Article, Feed, \
+    OutletRun, PollSchedule, OutletCadence, CrawlCheckpoint, FetchFailure
 
 
 class OutletAdmin(admin.ModelAdmin):
     """Changes outlets listing on admin panel."""
     model = Outlet
-    list_display = ['name', 'active', 'website']
+    list_display = ['name', 'active', 'website', 'rate_limit', 'burst']
 
 
 class ArticleAdmin(admin.ModelAdmin):
@@ -21,7 +22,44 @@ class ArticleAdmin(admin.ModelAdmin):
     get_outlet.short_description = 'Outlet'  #Renames column head
 
 
+class OutletRunAdmin(admin.ModelAdmin):
+    """Changes outlets' runs listing on admin panel."""
+    model = OutletRun
+    list_display = ['outlet', 'crawl', 'started_at', 'duration', 'items']
+
+
+class PollScheduleAdmin(admin.ModelAdmin):
+    """Changes polling schedules listing on admin panel."""
+    model = PollSchedule
+    list_display = ['outlet', 'interval', 'next_poll', 'empty_polls']
+
+
+class OutletCadenceAdmin(admin.ModelAdmin):
+    """Changes outlets' cadence listing on admin panel."""
+    model = OutletCadence
+    list_display = ['outlet', 'articles', 'mean', 'median', 'updated_at']
+
+
+class CrawlCheckpointAdmin(admin.ModelAdmin):
+    """Changes interrupted runs' checkpoints listing on admin panel."""
+    model = CrawlCheckpoint
+    list_display = ['outlet', 'updated_at']
+
+
+class FetchFailureAdmin(admin.ModelAdmin):
+    """Changes failed downloads listing on admin panel."""
+    model = FetchFailure
+    list_display = ['host', 'outlet', 'url', 'error', 'created_at']
+    list_filter = ['host', 'outlet']
+
+
 admin.site.register(Author)
 admin.site.register(Outlet, OutletAdmin)
 admin.site.register(Category)
 admin.site.register(Article, ArticleAdmin)
+admin.site.register(Feed)
+admin.site.register(OutletRun, OutletRunAdmin)
+admin.site.register(PollSchedule, PollScheduleAdmin)
+admin.site.register(OutletCadence, OutletCadenceAdmin)
+admin.site.register(CrawlCheckpoint, CrawlCheckpointAdmin)
+admin.site.register(FetchFailure, FetchFailureAdmin)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from articles.scrapers.cadence import update_cadences
+
+
+class Command(BaseCommand):
+    """Computes the outlets' posting cadence statistics."""
+    help = 'Updates the outlets\' posting cadence with their newest articles.'
+
+    def add_arguments(self, parser):
+        """Allows computing the statistics from scratch."""
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Computes the statistics from all articles again.'
+        )
+
+
+    def handle(self, *args, **options):
+        """Updates every outlet's cadence and reports it, in hours."""
+        self.stdout.write('{:<20} {:>8} {:>8} {:>8} {:>8}'.format(
+            'outlet', 'articles', 'mean', 'median', 'p90'
+        ))
+
+        for cadence in update_cadences(options['rebuild']):
+            self.stdout.write('{:<20} {:>8} {:>8} {:>8} {:>8}'.format(
+                cadence.outlet.name[:20], cadence.articles,
+                self.hours(cadence.mean), self.hours(cadence.median),
+                self.hours(cadence.p90)
+            ))
+
+
+    @staticmethod
+    def hours(seconds):
+        """Formats a time in hours, if it is known."""
+        return '-' if seconds is None else '{:.2f}'.format(seconds / 3600)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from articles.scrapers.bloom import rebuild_url_index
+
+
+class Command(BaseCommand):
+    """Rebuilds the index of stored articles' urls used by the scrapers."""
+    help = 'Rebuilds the url index from the articles table and saves it.'
+
+    def handle(self, *args, **options):
+        """Rebuilds the index and reports its size and error rate."""
+        index = rebuild_url_index()
+
+        self.stdout.write(
+            'Indexed {} urls in {} KB, false positive rate: {:.4%}.'.format(
+                len(index),
+                len(index.array) // 1024,
+                index.false_positive_rate()
+            )
+        )
@@ -0,0 +1,25 @@
+# Generated by Django 2.0 on 2026-10-18 19:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0016_auto_20171229_1750'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feed',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=255, unique=True)),
+                ('etag', models.CharField(default='', max_length=255)),
+                ('last_modified', models.CharField(default='', max_length=255)),
+                ('body_hash', models.CharField(default='', max_length=64)),
+                ('outlet', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='articles.Outlet')),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.0 on 2026-10-18 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0017_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outlet',
+            name='burst',
+            field=models.PositiveIntegerField(default=4),
+        ),
+        migrations.AddField(
+            model_name='outlet',
+            name='rate_limit',
+            field=models.FloatField(default=1.0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.0 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0018_outlet_rate_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='last_date',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='feed',
+            name='last_url',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='outlet',
+            name='watermark_overlap',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.0 on 2026-10-18 20:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0019_feed_watermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutletRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('crawl', models.CharField(db_index=True, max_length=32)),
+                ('started_at', models.DateTimeField(null=True)),
+                ('duration', models.FloatField(null=True)),
+                ('items', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(default='')),
+                ('outlet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='articles.Outlet')),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.0 on 2026-10-18 21:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0020_outletrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PollSchedule',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interval', models.FloatField(default=0)),
+                ('next_poll', models.DateTimeField(null=True)),
+                ('last_poll', models.DateTimeField(null=True)),
+                ('empty_polls', models.PositiveIntegerField(default=0)),
+                ('outlet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='articles.Outlet')),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.0 on 2026-10-18 21:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0021_pollschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutletCadence',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_date', models.DateTimeField(null=True)),
+                ('articles', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('gaps', models.TextField(default='[]')),
+                ('hours', models.TextField(default='[]')),
+                ('mean', models.FloatField(null=True)),
+                ('median', models.FloatField(null=True)),
+                ('p25', models.FloatField(null=True)),
+                ('p75', models.FloatField(null=True)),
+                ('p90', models.FloatField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('outlet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='articles.Outlet')),
+            ],
+        ),
+    ]
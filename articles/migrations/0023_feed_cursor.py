@@ -0,0 +1,18 @@
+# Generated by Django 2.0 on 2026-10-18 21:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0022_outletcadence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='cursor',
+            field=models.CharField(default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.0 on 2026-10-18 22:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0023_feed_cursor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('records', models.TextField(default='{}')),
+                ('authors', models.TextField(default='{}')),
+                ('pending', models.TextField(default='[]')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('outlet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='articles.Outlet')),
+            ],
+        ),
+    ]
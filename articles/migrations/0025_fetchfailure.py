@@ -0,0 +1,26 @@
+# Generated by Django 2.0 on 2026-10-18 23:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0024_crawlcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FetchFailure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('crawl', models.CharField(db_index=True, default='', max_length=32)),
+                ('host', models.CharField(db_index=True, max_length=255)),
+                ('url', models.CharField(max_length=255)),
+                ('error', models.TextField(default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('outlet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='articles.Outlet')),
+            ],
+        ),
+    ]
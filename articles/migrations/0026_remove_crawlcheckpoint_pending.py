@@ -0,0 +1,17 @@
+# Generated by Django 2.0 on 2026-10-18 23:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0025_fetchfailure'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='crawlcheckpoint',
+            name='pending',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.0 on 2026-10-18 23:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0026_remove_crawlcheckpoint_pending'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='crawlcheckpoint',
+            name='authors',
+        ),
+        migrations.RemoveField(
+            model_name='crawlcheckpoint',
+            name='records',
+        ),
+        migrations.CreateModel(
+            name='CheckpointEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=8)),
+                ('key', models.TextField()),
+                ('value', models.TextField(default='null')),
+                ('checkpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='articles.CrawlCheckpoint')),
+            ],
+        ),
+    ]
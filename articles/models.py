@@ -28,6 +28,14 @@ class Outlet(models.Model):
     description = models.TextField(blank=True)
     active = models.BooleanField(default=True)
 
+    # Crawling politeness: requests per second to the outlet's website and how
+    # many requests can be made at once after some idle time.
+    rate_limit = models.FloatField(default=1.0)
+    burst = models.PositiveIntegerField(default=4)
+
+    # Seconds before the feed's watermark still checked for late edits
+    watermark_overlap = models.PositiveIntegerField(default=0)
+
     objects = ActiveManager()
 
     def delete(self):
@@ -90,3 +98,153 @@ class Article(models.Model):
     def __str__(self):
         """Return a human readable representation of the model instance."""
         return "{}".format(self.title)
+
+
+
+class Feed(models.Model):
+    """
+    This class keeps the state of an articles' feed between runs: the
+    validators of its last download, so unchanged feeds can be skipped, and
+    its watermark (the newest item seen), so feed processing can stop at the
+    first item already seen, and its cursor.
+    """
+    url = models.CharField(max_length=255, blank=False, unique=True)
+    outlet = models.ForeignKey(Outlet, on_delete=models.CASCADE, null=True)
+    etag = models.CharField(max_length=255, default='')
+    last_modified = models.CharField(max_length=255, default='')
+    body_hash = models.CharField(max_length=64, default='')
+    last_date = models.DateTimeField(null=True)
+    last_url = models.CharField(max_length=255, default='')
+
+    # Where the next run starts from on feeds that can be asked for what is
+    # new since then, e.g. the newest status id of a twitter timeline.
+    cursor = models.CharField(max_length=255, default='')
+
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{}".format(self.url)
+
+
+
+class OutletRun(models.Model):
+    """
+    This class records an outlet's run inside a crawl, i.e. a periodic fetch
+    of every active outlet, each one on its own task. Runs of the same crawl
+    share its `crawl` id; a run is finished once its `duration` is known.
+    """
+    crawl = models.CharField(max_length=32, db_index=True)
+    outlet = models.ForeignKey(Outlet, on_delete=models.CASCADE)
+    started_at = models.DateTimeField(null=True)
+    duration = models.FloatField(null=True)
+    items = models.PositiveIntegerField(default=0)
+    error = models.TextField(default='')
+
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{} ({})".format(self.outlet, self.crawl)
+
+
+
+class PollSchedule(models.Model):
+    """
+    This class keeps when an outlet should be polled next. Its `interval`
+    follows the outlet's posting cadence and grows after polls that found
+    nothing new (`empty_polls` in a row).
+    """
+    outlet = models.OneToOneField(Outlet, on_delete=models.CASCADE)
+    interval = models.FloatField(default=0)
+    next_poll = models.DateTimeField(null=True)
+    last_poll = models.DateTimeField(null=True)
+    empty_polls = models.PositiveIntegerField(default=0)
+
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{} ({})".format(self.outlet, self.next_poll)
+
+
+
+class OutletCadence(models.Model):
+    """
+    This class keeps an outlet's posting cadence statistics. They are updated
+    incrementally: only the articles newer than `last_date` are read on each
+    update, and they add to the histograms of the time between articles
+    (`gaps`, by logarithmic bins) and of the hour of the week they were
+    posted (`hours`), from which the statistics are computed.
+    """
+    outlet = models.OneToOneField(Outlet, on_delete=models.CASCADE)
+    last_date = models.DateTimeField(null=True)
+    articles = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0)
+    gaps = models.TextField(default='[]')
+    hours = models.TextField(default='[]')
+
+    mean = models.FloatField(null=True)
+    median = models.FloatField(null=True)
+    p25 = models.FloatField(null=True)
+    p75 = models.FloatField(null=True)
+    p90 = models.FloatField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{}".format(self.outlet)
+
+
+
+class CrawlCheckpoint(models.Model):
+    """
+    This class keeps the progress of an outlet's run that did not finish
+    (e.g. its worker was restarted): the records extracted from the pages it
+    downloaded and the authors it resolved, as its entries. The next run
+    resumes from them and the checkpoint is deleted once a run finishes.
+    """
+    outlet = models.OneToOneField(Outlet, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{} ({})".format(self.outlet, self.updated_at)
+
+
+
+class CheckpointEntry(models.Model):
+    """
+    This class keeps a page's record or an author saved by a checkpoint, as
+    JSON. There is a row for each one, so saving a checkpoint only inserts
+    what was extracted since it was last saved.
+    """
+    checkpoint = models.ForeignKey(
+        CrawlCheckpoint, on_delete=models.CASCADE, related_name='entries'
+    )
+    kind = models.CharField(max_length=8)
+    key = models.TextField()
+    value = models.TextField(default='null')
+
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{} {}".format(self.kind, self.key)
+
+
+
+class FetchFailure(models.Model):
+    """
+    This class records a download that failed on an outlet's run, even after
+    its retries, and why: an error, a deadline or its host's open circuit.
+    """
+    crawl = models.CharField(max_length=32, db_index=True, default='')
+    outlet = models.ForeignKey(Outlet, on_delete=models.CASCADE)
+    host = models.CharField(max_length=255, db_index=True)
+    url = models.CharField(max_length=255)
+    error = models.TextField(default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+    def __str__(self):
+        """Return a human readable representation of the model instance."""
+        return "{} ({})".format(self.url, self.outlet)
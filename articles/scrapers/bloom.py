@@ -0,0 +1,274 @@
+"""
+This file brings a Bloom filter used as an index of the articles' urls already
+stored. Asking it whether a url was seen costs a couple of hashes instead of a
+database query; the answer "yes" may be wrong with a small probability, so
+only then the database is asked to confirm.
+
+Every process (each celery worker) keeps its own index, to which it adds the
+articles it stores. The ones other processes store meanwhile are only added at
+the start of each run (see `refresh_url_index`): the index keeps the id of the
+newest article it knows and adds the urls of the articles stored after it, so
+its "no" is right for every article stored up to then. Articles stored by
+other processes during the run (or whose ids were taken before the newest
+known one, but committed after it) may still be missed, which only costs
+downloading their pages again: storing an article never duplicates it.
+
+When `SCRAPER_URL_INDEX` names a file, each process also saves its index there
+once a run is over, so new processes load it instead of building their own.
+So that no process drops the urls another one added, the saved index is merged
+into the process' one before it is replaced: both bit arrays are OR-ed under
+an exclusive lock on a file next to it. An index saved with another size
+(rebuilt with more room by some process) cannot be merged, so the process'
+one is rebuilt from the articles' table instead.
+"""
+
+import fcntl
+import hashlib
+import math
+import os
+import struct
+import tempfile
+import threading
+
+from django.conf import settings
+
+from articles.models import Article
+
+INDEX = None
+INDEX_LOCK = threading.Lock()
+
+# Saved files start with: bits, hashes, items added, capacity and the id of the
+# newest article added
+HEADER = struct.Struct('<QIQQQ')
+
+
+class BloomFilter(object):
+    """This class implements a Bloom filter sized by capacity and error rate."""
+
+    def __init__(self, capacity, error_rate=0.001, bits=None, hashes=None):
+        self.capacity = max(int(capacity), 1)
+        self.count = 0
+
+        # Every article up to this id was added, see `refresh_url_index`
+        self.last_id = 0
+
+        # Optimal number of bits and hashes for the wanted error rate
+        if not bits:
+            bits = -self.capacity * math.log(error_rate) / math.log(2) ** 2
+
+        if not hashes:
+            hashes = bits / self.capacity * math.log(2)
+
+        self.bits = max(int(bits), 8)
+        self.hashes = max(int(round(hashes)), 1)
+        self.array = bytearray((self.bits + 7) // 8)
+
+
+    def positions(self, key):
+        """
+        Gives the bits of a key. Two 64 bits hashes are combined to simulate
+        as many independent hashes as needed (Kirsch-Mitzenmacher).
+        """
+        digest = hashlib.blake2b(key.encode('utf8'), digest_size=16).digest()
+        first, second = struct.unpack('<QQ', digest)
+
+        return ((first + i * second) % self.bits for i in range(self.hashes))
+
+
+    def add(self, key):
+        """Adds a key to the filter."""
+        for position in self.positions(key):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+
+    def __contains__(self, key):
+        """Tells if a key may have been added (it surely was not if False)."""
+        array = self.array
+
+        for position in self.positions(key):
+            if not array[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+
+    def __len__(self):
+        """Gives how many keys were added."""
+        return self.count
+
+
+    def false_positive_rate(self):
+        """Estimates the current probability of a wrong `True` answer."""
+        exponent = -self.hashes * self.count / self.bits
+        return (1 - math.exp(exponent)) ** self.hashes
+
+
+    def union(self, other):
+        """
+        Adds the keys of another filter with the same bits and hashes to this
+        one, returning False if it has not. The keys both filters have are not
+        known, so how many there are is estimated from the bits set.
+        """
+        if (other.bits, other.hashes) != (self.bits, self.hashes):
+            return False
+
+        merged = int.from_bytes(self.array, 'little') | \
+            int.from_bytes(other.array, 'little')
+        self.array = bytearray(merged.to_bytes(len(self.array), 'little'))
+
+        ones = bin(merged).count('1')
+
+        if ones >= self.bits:
+            estimate = self.capacity + 1
+        else:
+            estimate = -self.bits / self.hashes * \
+                math.log(1 - ones / self.bits)
+
+        self.count = max(self.count, other.count, int(round(estimate)))
+
+        # Each filter had every article up to its id, so the union has them
+        # up to the newest one
+        self.last_id = max(self.last_id, other.last_id)
+
+        return True
+
+
+    def save(self, path):
+        """Saves the filter in a file, replacing it at once."""
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temporary = tempfile.mkstemp(dir=directory)
+
+        with os.fdopen(handle, 'wb') as saved:
+            saved.write(HEADER.pack(
+                self.bits, self.hashes, self.count, self.capacity,
+                self.last_id
+            ))
+            saved.write(self.array)
+
+        os.replace(temporary, path)
+
+
+    @classmethod
+    def load(cls, path):
+        """Loads a filter saved by `save`."""
+        with open(path, 'rb') as saved:
+            bits, hashes, count, capacity, last_id = HEADER.unpack(
+                saved.read(HEADER.size)
+            )
+
+            bloom = cls(capacity, bits=bits, hashes=hashes)
+            bloom.count = count
+            bloom.last_id = last_id
+            bloom.array = bytearray(saved.read())
+
+        if len(bloom.array) != (bits + 7) // 8:
+            raise ValueError('The url index file is corrupted.')
+
+        return bloom
+
+
+def build_url_index():
+    """
+    Builds a filter with every stored article's url. It is sized for at least
+    twice the current number of articles, so it has room to grow.
+    """
+    capacity = max(
+        settings.SCRAPER_URL_INDEX_CAPACITY,
+        2 * Article.objects.count()
+    )
+
+    bloom = BloomFilter(capacity, settings.SCRAPER_URL_INDEX_ERROR_RATE)
+
+    for article_id, url in Article.objects.values_list('id', 'url').iterator():
+        bloom.add(url)
+        bloom.last_id = max(bloom.last_id, article_id)
+
+    return bloom
+
+
+def get_url_index():
+    """
+    Returns the process-wide url index. It is loaded from the file given by
+    `SCRAPER_URL_INDEX` if there is one, otherwise it is built from the
+    articles' table. A full index is rebuilt with more room.
+    """
+    global INDEX #pylint: disable=global-statement
+
+    with INDEX_LOCK:
+        if INDEX is None and settings.SCRAPER_URL_INDEX:
+            try:
+                INDEX = BloomFilter.load(settings.SCRAPER_URL_INDEX)
+            except (OSError, ValueError, struct.error):
+                INDEX = None
+
+        if INDEX is None or len(INDEX) > INDEX.capacity:
+            INDEX = build_url_index()
+
+    return INDEX
+
+
+def refresh_url_index():
+    """
+    Adds to the url index the articles stored after the newest one it knows,
+    by this process or any other one, and returns it. It is called at the
+    start of every run.
+    """
+    index = get_url_index()
+
+    with INDEX_LOCK:
+        stored = Article.objects.filter(id__gt=index.last_id).order_by('id')
+
+        for article_id, url in stored.values_list('id', 'url').iterator():
+            # This process' own articles were already added
+            if url not in index:
+                index.add(url)
+
+            index.last_id = article_id
+
+    return index
+
+
+def save_url_index(merge=True):
+    """
+    Saves the url index if it is loaded and there is a file for it. Unless
+    `merge` is False, the index saved by other processes is merged into this
+    one first (see the top of this file).
+    """
+    global INDEX #pylint: disable=global-statement
+
+    path = settings.SCRAPER_URL_INDEX
+
+    with INDEX_LOCK:
+        if INDEX is None or not path:
+            return
+
+        # The lock is released when its file is closed
+        with open(path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            if merge:
+                try:
+                    saved = BloomFilter.load(path)
+                except (OSError, ValueError, struct.error):
+                    saved = None
+
+                if saved is not None and not INDEX.union(saved):
+                    INDEX = build_url_index()
+
+            INDEX.save(path)
+
+
+def rebuild_url_index():
+    """Rebuilds the url index from the articles' table and saves it."""
+    global INDEX #pylint: disable=global-statement
+
+    bloom = build_url_index()
+
+    with INDEX_LOCK:
+        INDEX = bloom
+
+    save_url_index(merge=False)
+
+    return bloom
@@ -0,0 +1,164 @@
+"""
+This file brings a disk-backed cache for downloaded pages. Authors' profiles
+and articles' pages hardly ever change, but the scrapers used to download them
+again on every run; now their bodies are kept compressed on disk, keyed by url.
+
+Each entry is a gzip file named after the url's hash. Its modification time is
+the moment it was stored, which gives its age for the TTL check, and its access
+time is refreshed on every hit, which gives the least recently used entries to
+evict when the cache grows over its size cap.
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+from collections import Counter
+
+from django.conf import settings
+
+CACHE = None
+CACHE_LOCK = threading.Lock()
+
+
+class ResponseCache(object):
+    """This class stores response bodies on disk with TTL and LRU eviction."""
+
+    def __init__(self, directory, max_size, ttls):
+        self.directory = directory
+        self.max_size = max_size
+        self.ttls = ttls
+        self.stats = Counter()
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for _, _, size in self.entries())
+
+
+    def path(self, url):
+        """Gives the entry's file path of a given url."""
+        name = hashlib.sha1(url.encode('utf8')).hexdigest()
+        return os.path.join(self.directory, name + '.gz')
+
+
+    def entries(self):
+        """Lists every entry as (path, access time, size) tuples."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.gz'):
+                stat = entry.stat()
+                yield entry.path, stat.st_atime, stat.st_size
+
+
+    def count(self, key):
+        """Increments one of the cache's counters."""
+        with self.lock:
+            self.stats[key] += 1
+
+
+    def get(self, url, content_type):
+        """
+        Returns the stored body of a url, or None if it is not stored, if it is
+        older than its content type's TTL or if it cannot be read.
+        """
+        ttl = self.ttls.get(content_type, 0)
+        path = self.path(url)
+
+        try:
+            stored_at = os.stat(path).st_mtime
+
+            if time.time() - stored_at > ttl:
+                self.count('expired')
+                self.count('misses')
+                return None
+
+            with gzip.open(path, 'rb') as cached:
+                body = cached.read()
+
+            # Mark this entry as recently used but keep its storage time
+            os.utime(path, (time.time(), stored_at))
+
+        except (OSError, EOFError):
+            self.count('misses')
+            return None
+
+        self.count('hits')
+        return body
+
+
+    def set(self, url, content_type, body):
+        """Stores a body unless its content type should not be cached."""
+        if not self.ttls.get(content_type) or not body:
+            return
+
+        # Write to a temporary file first, so no reader finds a partial entry
+        handle, temporary = tempfile.mkstemp(dir=self.directory)
+
+        with os.fdopen(handle, 'wb') as raw, \
+                gzip.GzipFile(fileobj=raw, mode='wb') as compressed:
+            compressed.write(body)
+
+        os.replace(temporary, self.path(url))
+
+        with self.lock:
+            self.stats['stores'] += 1
+            self.size += os.path.getsize(self.path(url))
+
+        if self.size > self.max_size:
+            self.evict()
+
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache takes up at
+        most 90% of its size cap, so it does not evict again on every store.
+        """
+        with self.lock:
+            entries = sorted(self.entries(), key=lambda entry: entry[1])
+            self.size = sum(size for _, _, size in entries)
+
+            for path, _, size in entries:
+                if self.size <= self.max_size * 0.9:
+                    break
+
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+
+                self.size -= size
+                self.stats['evictions'] += 1
+
+
+def get_cache():
+    """
+    Returns the process-wide response cache, or None if there is no cache
+    directory set (`SCRAPER_CACHE_DIR`).
+    """
+    global CACHE #pylint: disable=global-statement
+
+    if not settings.SCRAPER_CACHE_DIR:
+        return None
+
+    with CACHE_LOCK:
+        if CACHE is None or CACHE.directory != settings.SCRAPER_CACHE_DIR:
+            CACHE = ResponseCache(
+                settings.SCRAPER_CACHE_DIR,
+                settings.SCRAPER_CACHE_MAX_SIZE,
+                settings.SCRAPER_CACHE_TTL
+            )
+
+    return CACHE
+
+
+def cache_stats():
+    """Returns a copy of the cache's counters (hits, misses and so on)."""
+    cache = get_cache()
+
+    if cache is None:
+        return Counter()
+
+    with cache.lock:
+        return Counter(cache.stats)
@@ -0,0 +1,103 @@
+"""
+This file computes the outlets' posting cadence statistics, which used to be
+given by the standalone script `mtime.py`. The time between articles and the
+hour of the week they were posted are counted in histograms with NumPy, so
+updating them only takes the articles posted since the last update, and the
+statistics (mean, median and percentiles) are computed from the histograms.
+"""
+
+import json
+
+import numpy as np
+
+from articles.models import Article, Outlet, OutletCadence
+
+# Bins of the time between articles: 10 per decade, from 1 second to 10^7
+# seconds (almost 4 months). Shorter and longer times go to the edge bins.
+GAP_BINS = np.logspace(0, 7, 71)
+
+HOURS_IN_A_WEEK = 7 * 24
+
+# The Unix epoch was on a Thursday, hours of the week start on Mondays
+EPOCH_HOUR_OF_WEEK = 3 * 24
+
+
+def percentile(counts, q):
+    """
+    Estimates a percentile of the time between articles from its histogram,
+    interpolating inside the percentile's bin on a logarithmic scale.
+    """
+    cumulative = np.cumsum(counts)
+
+    if not len(cumulative) or not cumulative[-1]:
+        return None
+
+    rank = q / 100.0 * cumulative[-1]
+    i = min(int(np.searchsorted(cumulative, rank)), len(counts) - 1)
+
+    before = cumulative[i - 1] if i else 0
+    fraction = (rank - before) / counts[i] if counts[i] else 0
+
+    return float(GAP_BINS[i] * (GAP_BINS[i + 1] / GAP_BINS[i]) ** fraction)
+
+
+def update_cadence(outlet, rebuild=False):
+    """
+    Updates an outlet's cadence with the articles posted after the last one
+    counted (or with all of them, if `rebuild`). Articles stored late with an
+    older date than that are not counted until a rebuild.
+    """
+    cadence, _ = OutletCadence.objects.get_or_create(outlet=outlet)
+
+    if rebuild:
+        cadence = OutletCadence(id=cadence.id, outlet=outlet)
+
+    gaps = np.array(json.loads(cadence.gaps) or np.zeros(len(GAP_BINS) - 1))
+    hours = np.array(json.loads(cadence.hours) or np.zeros(HOURS_IN_A_WEEK))
+
+    articles = Article.objects.filter(outlet_id=outlet.id)
+
+    if cadence.last_date:
+        articles = articles.filter(date__gt=cadence.last_date)
+
+    dates = list(articles.order_by('date').values_list('date', flat=True))
+    stamps = np.array([date.timestamp() for date in dates], dtype=float)
+
+    if dates:
+        # Hour of the week (UTC) of each new article
+        week_hours = (stamps // 3600 + EPOCH_HOUR_OF_WEEK) % HOURS_IN_A_WEEK
+        hours += np.bincount(week_hours.astype(int), minlength=HOURS_IN_A_WEEK)
+
+        # The time between the last article counted and the first new one
+        # is counted as well.
+        if cadence.last_date:
+            stamps = np.insert(stamps, 0, cadence.last_date.timestamp())
+
+        new_gaps = np.diff(stamps)
+        clipped = np.clip(new_gaps, GAP_BINS[0], GAP_BINS[-1])
+        gaps += np.histogram(clipped, bins=GAP_BINS)[0]
+
+        cadence.total += float(new_gaps.sum())
+        cadence.articles += len(dates)
+        cadence.last_date = dates[-1]
+
+    cadence.gaps = json.dumps(gaps.astype(int).tolist())
+    cadence.hours = json.dumps(hours.astype(int).tolist())
+
+    cadence.mean = None
+    if cadence.articles > 1:
+        cadence.mean = cadence.total / (cadence.articles - 1)
+
+    cadence.median = percentile(gaps, 50)
+    cadence.p25 = percentile(gaps, 25)
+    cadence.p75 = percentile(gaps, 75)
+    cadence.p90 = percentile(gaps, 90)
+
+    cadence.save()
+
+    return cadence
+
+
+def update_cadences(rebuild=False):
+    """Updates the cadence of every outlet."""
+    return [update_cadence(o, rebuild) for o in Outlet.objects.order_by('id')]
@@ -0,0 +1,137 @@
+"""
+This file brings the checkpoints of the scrapers' runs. A run's network work
+is its pages and authors' profiles: as they are extracted, their records are
+saved every `SCRAPER_CHECKPOINT_EVERY` of them. If the worker is restarted
+mid-run, the next run of the outlet finds them and downloads only the pages
+and profiles that have no record yet.
+
+Each record and author is saved once, as a row of its own, so a save only
+costs the ones extracted since the last save however long the run is.
+
+The feed itself is downloaded again: its watermark and cursor are only kept
+once a run finishes, so the resumed run reads the same items from it.
+Checkpoints older than `SCRAPER_CHECKPOINT_TTL` seconds are not resumed.
+"""
+
+import datetime
+import json
+
+import dateutil.parser
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from articles.models import CheckpointEntry, CrawlCheckpoint
+
+# The kinds of a checkpoint's entries
+RECORD = 'record'
+AUTHOR = 'author'
+
+
+def load_record(record):
+    """Decodes a record saved by a checkpoint, restoring its date."""
+    record = json.loads(record)
+
+    if record and record.get('date'):
+        record['date'] = dateutil.parser.parse(record['date'])
+
+    return record
+
+
+class Checkpoint(object):
+    """
+    This class keeps a run's progress: the records extracted by page url, the
+    authors resolved by name. It is only saved if it has an outlet.
+    """
+
+    def __init__(self, outlet=None):
+        self.outlet = outlet
+        self.records = {}
+        self.authors = {}
+
+        # The (kind, key) of the entries kept since the last save
+        self.unsaved = []
+
+
+    @classmethod
+    def load(cls, outlet):
+        """Gives an outlet's checkpoint, resuming a recent one if any."""
+        checkpoint = cls(outlet)
+
+        if outlet is None:
+            return checkpoint
+
+        since = timezone.now() - datetime.timedelta(
+            seconds=settings.SCRAPER_CHECKPOINT_TTL
+        )
+        # An expired checkpoint is dropped, not saved on again
+        CrawlCheckpoint.objects.filter(
+            outlet_id=outlet.id, updated_at__lt=since
+        ).delete()
+
+        entries = CheckpointEntry.objects.filter(
+            checkpoint__outlet_id=outlet.id
+        ).order_by('id').values_list('kind', 'key', 'value')
+
+        for kind, key, value in entries.iterator():
+            if kind == RECORD:
+                checkpoint.records[key] = load_record(value)
+            else:
+                checkpoint.authors[key] = json.loads(value)
+
+        return checkpoint
+
+
+    def __bool__(self):
+        return bool(self.records or self.authors)
+
+
+    def add_record(self, url, record):
+        """Keeps the record extracted from a page."""
+        self.records[url] = record
+        self.unsaved += [(RECORD, url)]
+
+
+    def add_author(self, name, author):
+        """Keeps a resolved author, saving every few ones."""
+        self.authors[name] = author
+        self.unsaved += [(AUTHOR, name)]
+
+        if len(self.unsaved) >= settings.SCRAPER_CHECKPOINT_EVERY:
+            self.save()
+
+
+    def save(self):
+        """Saves whatever was kept since the last save."""
+        if self.outlet is None or not self.unsaved:
+            return
+
+        saved, created = CrawlCheckpoint.objects.get_or_create(
+            outlet_id=self.outlet.id
+        )
+
+        CheckpointEntry.objects.bulk_create([
+            CheckpointEntry(
+                checkpoint=saved, kind=kind, key=key, value=json.dumps(
+                    (self.records if kind == RECORD else self.authors)[key],
+                    cls=DjangoJSONEncoder
+                )
+            ) for kind, key in self.unsaved
+        ])
+
+        # Keep the checkpoint from expiring while the run goes on
+        if not created:
+            saved.save()
+
+        self.unsaved = []
+
+
+    def clear(self):
+        """Forgets the progress, once the run is finished."""
+        self.records.clear()
+        self.authors.clear()
+        self.unsaved = []
+
+        if self.outlet is not None:
+            CrawlCheckpoint.objects.filter(outlet_id=self.outlet.id).delete()
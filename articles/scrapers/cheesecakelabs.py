@@ -1,7 +1,7 @@
 import re
 
+from articles.scrapers.records import ArticleRecord
 from articles.scrapers.scraper import WebScraper
-from articles.models import Article
 
 class CheesecakeLabs(WebScraper):
     """
@@ -75,7 +75,7 @@ class CheesecakeLabs(WebScraper):
 
 
         # Get article's contents
-        content = parsed.xpath('/html/head')
+        content = self.xpath('/html/head')(parsed)
         if content:
             og_description = 'meta[@property="og:description"]'
             data['content'] = self.get_text_or_attr(content[0], \
@@ -84,7 +84,7 @@ class CheesecakeLabs(WebScraper):
 
         # Find authors
         data['authors'] = []
-        authors = parsed.xpath('.//span[@class="author vcard"]')
+        authors = self.xpath('.//span[@class="author vcard"]')(parsed)
         about_xpath = './/div[@class="author-description"]/p[2]'
         about = self.get_text_or_attr(parsed, about_xpath)
 
@@ -99,7 +99,7 @@ class CheesecakeLabs(WebScraper):
             if name and len(name) == 2:
                 data['authors'][0]['name'] = name[1]
 
-            about = parsed.xpath(about_xpath)
+            about = self.xpath(about_xpath)(parsed)
             if about:
                 data['authors'][0]['about'] = self.clear_text(about)
 
@@ -115,6 +115,10 @@ class CheesecakeLabs(WebScraper):
 
         Google's API result is in JSON format.
         """
+        # Find every new article's url first, so all the articles' pages can
+        # be downloaded at once.
+        found = []
+
         for item in data['items']:
             url = None
 
@@ -154,17 +158,33 @@ class CheesecakeLabs(WebScraper):
                 url = self.remove_query(found_article['url'])
 
 
+            # The feed is ordered newest first, so the items from here on were
+            # already seen on the last runs.
+            date = self.parse_datetime_passing_errors(item['published'])
+
+            if self.reached_watermark(date, url):
+                break
+
+
             # We don't want to add again an article, so we search for it
-            if Article.objects.filter(url=url).count() > 0:
+            if self.already_stored(url):
                 continue
 
+            found += [(item, url)]
+
+
+        # Fetch the articles' information directly from CheesecakeLabs blog,
+        # extracting their pages on the parsing pool
+        records = self.extract_pages(
+            [url for _, url in found], self.article_page_type, 'article_info'
+        )
+
 
-            # Fetch article's information directly from CheesecakeLabs blog
-            parsed = self.parse(url, self.article_page_type)
-            article = self.article_info(parsed)
+        for item, url in found:
 
+            article = records.get(url)
 
-            if article == {}:
+            if not article:
                 continue
 
 
@@ -182,4 +202,4 @@ class CheesecakeLabs(WebScraper):
                 article['date'] = date
 
 
-            yield article
+            yield ArticleRecord.from_dict(article)
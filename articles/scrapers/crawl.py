@@ -0,0 +1,172 @@
+"""
+This file brings the steps of a crawl, i.e. a periodic fetch of every active
+outlet. Instead of running the scrapers one after another, a crawl starts one
+run per outlet, so they can go on concurrently on different celery tasks: a
+slow outlet does not delay the others and a failing one does not abort them.
+Each run is recorded as an `OutletRun`, whose rows make up the crawl's report.
+"""
+
+import datetime
+import logging
+import time
+import traceback
+import uuid
+
+from collections import Counter, OrderedDict
+
+from django.utils import timezone
+
+from articles.models import FetchFailure, Outlet, OutletRun
+from articles.scrapers import fetcher
+from articles.scrapers.cheesecakelabs import CheesecakeLabs
+from articles.scrapers.engadget import Engadget
+from articles.scrapers.mashable import Mashable
+from articles.scrapers.schedule import record_poll
+from articles.scrapers.techcrunch import TechCrunch
+
+LOGGER = logging.getLogger(__name__)
+
+# The scraper of each outlet, by the outlet's name
+SCRAPERS = OrderedDict([
+    ('TechCrunch', TechCrunch),
+    ('Cheesecake Labs', CheesecakeLabs),
+    ('Mashable', Mashable),
+    ('Engadget', Engadget),
+])
+
+
+def start_crawl(names=None):
+    """
+    Starts a crawl with a pending run for every active outlet that has a
+    scraper (only those with the given names, if any). It returns the crawl's
+    id and the outlets' names.
+    """
+    crawl = uuid.uuid4().hex
+
+    if names is None:
+        names = SCRAPERS
+
+    names = [name for name in SCRAPERS if name in names]
+
+    outlets = list(Outlet.objects.filter(active=True, name__in=names))
+    outlets.sort(key=lambda outlet: names.index(outlet.name))
+
+    OutletRun.objects.bulk_create([
+        OutletRun(crawl=crawl, outlet=outlet) for outlet in outlets
+    ])
+
+    return crawl, [outlet.name for outlet in outlets]
+
+
+def run_outlet(crawl, name):
+    """
+    Fetches an outlet's articles as part of a crawl, recording how long it
+    took, how many articles it stored and what went wrong, if anything. Errors
+    (and failed downloads) are recorded and logged rather than raised. The
+    outlet's next poll is scheduled by what this one found.
+    """
+    scraper = SCRAPERS[name]()
+
+    run, _ = OutletRun.objects.get_or_create(
+        crawl=crawl, outlet=scraper.outlet
+    )
+    run.started_at = timezone.now()
+
+    start = time.monotonic()
+
+    try:
+        if scraper.outlet.active:
+            LOGGER.info('%s download just started.', name)
+            scraper.get_articles()
+
+    except Exception: #pylint: disable=broad-except
+        LOGGER.exception('%s download failed.', name)
+        run.error = traceback.format_exc()
+
+    # Articles are stored a chunk at a time, so a failed run may have stored
+    # some of them too
+    run.items = scraper.report.created
+
+    run.duration = time.monotonic() - start
+    run.save()
+
+    record_failures(crawl, scraper.outlet, scraper.fetch_run)
+
+    if scraper.outlet.active:
+        record_poll(scraper.outlet, run.items)
+
+    return run
+
+
+def record_failures(crawl, outlet, fetch_run):
+    """
+    Records the downloads that failed on an outlet's run, logging how many
+    failed on each host, so hosts being skipped can be told apart.
+    """
+    if fetch_run is None or not fetch_run.failures:
+        return []
+
+    failures = FetchFailure.objects.bulk_create([
+        FetchFailure(
+            crawl=crawl, outlet=outlet, host=fetcher.get_domain(url),
+            url=url[:255], error='{}: {}'.format(type(error).__name__, error)
+        ) for url, error in fetch_run.failures
+    ])
+
+    hosts = Counter(failure.host for failure in failures)
+
+    LOGGER.warning(
+        '%s: %d downloads failed (%s).', outlet, len(failures),
+        ', '.join('{} {}'.format(host, n) for host, n in hosts.most_common())
+    )
+
+    return failures
+
+
+def crawl_report(crawl):
+    """
+    Returns a crawl's report once every run is finished, or None before that.
+    The report has each outlet's duration, items and error, the total number
+    of items and failures, and the crawl's wall time: from the first run's
+    start to the last run's end.
+    """
+    runs = OutletRun.objects.filter(crawl=crawl).order_by('id')
+    runs = list(runs.select_related('outlet'))
+
+    if not runs or any(run.duration is None for run in runs):
+        return None
+
+    started = min(run.started_at for run in runs)
+    finished = max(
+        run.started_at + datetime.timedelta(seconds=run.duration)
+        for run in runs
+    )
+
+    return {
+        'crawl': crawl,
+        'outlets': OrderedDict(
+            (run.outlet.name, {
+                'duration': run.duration,
+                'items': run.items,
+                'error': run.error,
+            }) for run in runs
+        ),
+        'items': sum(run.items for run in runs),
+        'failures': sum(1 for run in runs if run.error),
+        'wall_time': (finished - started).total_seconds(),
+    }
+
+
+def log_report(report):
+    """Logs a crawl's report, one line per outlet."""
+    for name, run in report['outlets'].items():
+        LOGGER.info(
+            '%s: %d articles in %.1fs%s', name, run['items'], run['duration'],
+            ' (failed)' if run['error'] else ''
+        )
+
+    LOGGER.info(
+        'Crawl %s: %d articles from %d outlets (%d failed) in %.1fs.',
+        report['crawl'], report['items'], len(report['outlets']),
+        report['failures'], report['wall_time']
+    )
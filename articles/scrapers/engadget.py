@@ -3,15 +3,15 @@ import urllib.parse
 
 from django.template.defaultfilters import slugify
 
+from articles.scrapers.records import ArticleRecord
 from articles.scrapers.scraper import WebScraper
-from articles.models import Article
 
 class Engadget(WebScraper):
     """
     This class provides the required methods to scrape an article from Engadget
     outlet. Fetching an article from Engadget follows the above steps:
 
-    1) Download the Engadget XML feed at `feed_url`
+    1) Stream the Engadget XML feed at `feed_url`, item by item.
 
     2) Go through every item on this feed and for each one extract informations
        such as title, url, pub_date, categories, content, thumb and authors.
@@ -30,7 +30,7 @@ class Engadget(WebScraper):
         super(Engadget, self).__init__('Engadget')
 
         self.feed_url = 'http://www.engadget.com/rss.xml'
-        self.feed_type = 'xml'
+        self.feed_type = 'xml-stream'
         self.author_page_type = 'html'
         self.article_page_type = 'html'
         self.article_url = None
@@ -52,8 +52,20 @@ class Engadget(WebScraper):
         form given in utils' function `create_article`.
         """
 
-        # Iterates over every item (article) in xml
-        for item in parsed_xml.xpath("//item"):
+        # The new articles are found lazily, so their authors' pages are
+        # downloaded a chunk at a time. Every author is resolved once and the
+        # articles are handed over as records.
+        for article in self.resolve_authors(self.find_articles(parsed_xml)):
+            yield ArticleRecord.from_dict(article)
+
+
+    def find_articles(self, parsed_xml):
+        """
+        This method iterates over every item (article) in Engadget's feed,
+        yielding the new ones along with their authors' names.
+        """
+
+        for item in self.feed_items(parsed_xml):
 
             article = {}
 
@@ -75,11 +87,6 @@ class Engadget(WebScraper):
             article['url'] = self.remove_query(url)
 
 
-            # If article's URL is already stored, don't parse it again
-            if Article.objects.filter(url=article['url']).count() > 0:
-                continue
-
-
             # It is interesting to have the publication date as a `dateutil`
             # object, so we can do whatever manipulation we want.
             pub_date = self.get_text_or_attr(item, 'pubDate')
@@ -89,19 +96,15 @@ class Engadget(WebScraper):
                 continue
 
 
-            # Get the author attribute and tries to fetch informations about
-            # him/her. An article can have more than one author
-            author_names = self.get_text_or_attr(item, 'dc:creator')
+            # The feed is ordered newest first, so the items from here on were
+            # already seen on the last runs.
+            if self.reached_watermark(article['date'], article['url']):
+                break
 
-            if isinstance(author_names, str):
-                author_names = [author_names]
-
-
-            article['authors'] = []
 
-            for i, name in enumerate(author_names):
-                self.article_url = article['url']
-                article['authors'] += [self.get_author(name, i)]
+            # If article's URL is already stored, don't parse it again
+            if self.already_stored(article['url']):
+                continue
 
 
             # Gets the article's description and strip all html tags from it
@@ -120,7 +123,13 @@ class Engadget(WebScraper):
                     article['thumb'] = 'https://s.aolcdn.com/hss/' + thumb
 
 
-            yield article
+            # An article can have more than one author
+            author_names = self.get_text_or_attr(item, 'dc:creator')
+
+            if isinstance(author_names, str):
+                author_names = [author_names]
+
+            yield article, author_names
 
 
     def extract_twitter(self, parsed_html, author_idx=0):
@@ -154,7 +163,7 @@ class Engadget(WebScraper):
 
         # Get description text provided by the author
         xpath = './/div[@class="t-d3"]'
-        items = parsed.xpath(xpath)
+        items = self.xpath(xpath)(parsed)
         author['about'] = self.clear_text(items)
 
 
@@ -175,7 +184,7 @@ class Engadget(WebScraper):
         # Check the article's page for his/her twitter if there is an
         # extract_twitter method.
         if 'twitter' not in author:
-            parsed = self.parse(self.article_url, self.article_page_type)
+            parsed = self.get_page(self.article_url, self.article_page_type)
             author['twitter'] = self.extract_twitter(parsed, author_idx)
 
 
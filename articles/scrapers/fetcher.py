@@ -0,0 +1,671 @@
+"""
+This file brings the fetching engine shared by every scraper. Downloads are
+blocking calls, so the engine runs them on a thread pool driven by an asyncio
+event loop, which bounds how many of them can be in flight at the same time.
+This way a batch of urls takes roughly as long as its slowest page.
+
+Every download goes through a single process-wide session whose connection
+pools keep the connections alive, so a second page from the same host does not
+pay for a new TCP and TLS handshake.
+
+To be polite with the outlets, downloads from an outlet's domain wait for a
+token from that domain's bucket, and no more than `SCRAPER_MAX_CONNECTIONS`
+connections are used at once in the whole process: a streamed download holds
+its own until its body is read and released.
+
+A scraper's run has a deadline, passed down to every download it makes (also
+from the engine's threads), from the wait for its host's turn to the last
+chunk of its body, so a stalled outlet cannot pin a worker. Transient
+errors are retried a few times with jittered backoff, and a host failing again
+and again has its circuit opened: its downloads fail at once for a while. The
+failures are kept by the run, which records them for its outlet.
+
+Bodies are streamed and capped: one over its content type's
+`SCRAPER_MAX_BODY_SIZE` fails as soon as it is known to be, instead of
+filling the worker's memory. The run also keeps how many bytes were read and
+the most a single download held at once, which is reported for every fetch.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import urllib.parse
+import weakref
+
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import twitter
+
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+
+LOGGER = logging.getLogger(__name__)
+
+SESSION = None
+SESSION_LOCK = threading.Lock()
+
+TWITTER = None
+TWITTER_LOCK = threading.Lock()
+
+BUCKETS = {}
+BUCKETS_LOCK = threading.Lock()
+
+BREAKERS = {}
+BREAKERS_LOCK = threading.Lock()
+
+# The run of the current thread, see `start_run`
+LOCAL = threading.local()
+
+# Responses worth asking again for
+TRANSIENT_STATUSES = [429, 500, 502, 503, 504]
+
+CONNECTIONS = threading.BoundedSemaphore(settings.SCRAPER_MAX_CONNECTIONS)
+
+
+
+class TokenBucket(object):
+    """
+    This class implements a token bucket: tokens drip in at `rate` per second
+    and up to `burst` of them can be saved for later. Each download spends one
+    token and, if there is none left, waits for its turn.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+
+    def reserve(self):
+        """
+        Takes a token and returns how long to wait before using it. Tokens
+        may go negative, which queues the callers in the order they came.
+        """
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            if self.tokens >= 0:
+                return 0
+
+            return -self.tokens / self.rate
+
+
+    def acquire(self, timeout=None):
+        """
+        Blocks until a token is available and returns True. If that would
+        take longer than `timeout` seconds, the token is given back and False
+        is returned at once.
+        """
+        wait = self.reserve()
+
+        if timeout is not None and wait > timeout:
+            with self.lock:
+                self.tokens += 1
+
+            return False
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return True
+
+
+class DeadlineExceeded(requests.RequestException):
+    """Raised by downloads asked for after their run's deadline."""
+
+
+class CircuitOpen(requests.RequestException):
+    """Raised by downloads from a host whose circuit is open."""
+
+
+class BodyTooLarge(requests.RequestException):
+    """Raised by bodies over the size allowed for their content type."""
+
+
+class ConnectionSlot(object):
+    """
+    This class keeps one of the `SCRAPER_MAX_CONNECTIONS` connections taken
+    from `CONNECTIONS` by a download. The slot is given back as soon as the
+    response is over, but a streamed one holds it until its body is released
+    (or the response is collected, should a reader forget to). It is given
+    back only once.
+    """
+
+    def __init__(self):
+        self.holding = False
+        self.released = False
+        self.lock = threading.Lock()
+
+
+    def hold(self, response):
+        """Keeps the slot until the streamed response is released."""
+        self.holding = True
+        response.connection_slot = self
+        weakref.finalize(response, self.release)
+
+
+    def release(self):
+        """Gives the slot back, unless it already was."""
+        with self.lock:
+            if self.released:
+                return
+
+            self.released = True
+
+        CONNECTIONS.release()
+
+
+class CircuitBreaker(object):
+    """
+    This class implements a host's circuit breaker: after `threshold` failed
+    downloads in a row the circuit opens and the host is not called for
+    `cooldown` seconds. Then a single download is let through; if it works,
+    the circuit closes, otherwise it opens again.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened = None
+        self.lock = threading.Lock()
+
+
+    def allow(self):
+        """Tells if a download may go on, letting one through after a while."""
+        with self.lock:
+            if self.opened is None:
+                return True
+
+            if time.monotonic() - self.opened >= self.cooldown:
+                # Half open: the next failure opens it again right away
+                self.opened = None
+                self.failures = self.threshold - 1
+                return True
+
+            return False
+
+
+    def succeed(self):
+        """Closes the circuit."""
+        with self.lock:
+            self.failures = 0
+            self.opened = None
+
+
+    def fail(self):
+        """Counts a failure, opening the circuit past the threshold."""
+        with self.lock:
+            self.failures += 1
+
+            if self.failures >= self.threshold:
+                self.opened = time.monotonic()
+
+
+class FetchRun(object):
+    """
+    This class keeps a scraper's run for the downloads it makes: its deadline
+    (a `time.monotonic` instant, or None), the downloads that failed, as
+    (url, error) pairs, the bytes read and the most bytes held at once by a
+    single download.
+    """
+
+    def __init__(self, timeout=None):
+        self.deadline = None
+        if timeout:
+            self.deadline = time.monotonic() + timeout
+
+        self.failures = []
+        self.downloaded = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+
+    def remaining(self):
+        """Gives the seconds left until the deadline (None if there is none)."""
+        if self.deadline is None:
+            return None
+
+        return self.deadline - time.monotonic()
+
+
+    def expired(self):
+        """Tells if the run is over its deadline."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+
+    def fail(self, url, error):
+        """Keeps a failed download."""
+        with self.lock:
+            self.failures += [(url, error)]
+
+
+    def read(self, url, size, peak):
+        """Keeps how many bytes a download read and held at most at once."""
+        with self.lock:
+            self.downloaded += size
+            self.peak = max(self.peak, peak)
+
+        LOGGER.debug('%s: %d bytes read, at most %d held.', url, size, peak)
+
+
+def start_run(timeout=None):
+    """
+    Starts a run with a deadline `timeout` seconds ahead for the downloads of
+    the current thread (and of the batches it hands to `fetch_all`).
+    """
+    LOCAL.run = FetchRun(timeout)
+    return LOCAL.run
+
+
+def current_run():
+    """Gives the run of the current thread, if there is one."""
+    return getattr(LOCAL, 'run', None)
+
+
+def get_breaker(host):
+    """Finds the circuit breaker of a host, creating it on first use."""
+    with BREAKERS_LOCK:
+        if host not in BREAKERS:
+            BREAKERS[host] = CircuitBreaker(
+                settings.SCRAPER_BREAKER_FAILURES,
+                settings.SCRAPER_BREAKER_COOLDOWN
+            )
+
+        return BREAKERS[host]
+
+
+def create_session():
+    """
+    Creates a session whose adapters keep one connection pool per host. Each
+    pool holds at most `SCRAPER_POOL_SIZE` connections and blocks any thread
+    asking for more, so no host gets more connections than that.
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=settings.SCRAPER_POOL_HOSTS,
+        pool_maxsize=settings.SCRAPER_POOL_SIZE,
+        pool_block=True,
+    )
+
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+
+    return session
+
+
+def get_session():
+    """
+    Returns the process-wide session, creating it on first use. Being lazy
+    matters for celery's prefork workers: each child process gets its own
+    session instead of sharing sockets inherited from the parent.
+    """
+    global SESSION #pylint: disable=global-statement
+
+    with SESSION_LOCK:
+        if SESSION is None:
+            SESSION = create_session()
+
+    return SESSION
+
+
+def get_twitter_api():
+    """
+    Returns the process-wide twitter client, created on first use with the
+    credentials given by the environment.
+    """
+    global TWITTER #pylint: disable=global-statement
+
+    with TWITTER_LOCK:
+        if TWITTER is None:
+            TWITTER = twitter.Api(
+                timeout=settings.SCRAPER_READ_TIMEOUT,
+                consumer_key=os.environ.get('TWITTER_CONSUMER_KEY'),
+                consumer_secret=os.environ.get('TWITTER_CONSUMER_SECRET'),
+                access_token_key=os.environ.get('TWITTER_ACCESS_TOKEN_KEY'),
+                access_token_secret=os.environ.get(
+                    'TWITTER_ACCESS_TOKEN_SECRET'
+                ),
+            )
+
+    return TWITTER
+
+
+def get_domain(url):
+    """Gives the host of an url (or of a bare domain) without `www.`."""
+    if '//' not in url:
+        url = '//' + url
+
+    host = urllib.parse.urlsplit(url).hostname or ''
+
+    if host.startswith('www.'):
+        host = host[4:]
+
+    return host
+
+
+def limit_host(website, rate, burst):
+    """
+    Sets the rate limit of a website's domain and all its subdomains. The
+    bucket is only replaced if the limits changed, so queued downloads keep
+    their turns.
+    """
+    domain = get_domain(website or '')
+
+    if not domain or not rate or rate <= 0:
+        return
+
+    with BUCKETS_LOCK:
+        bucket = BUCKETS.get(domain)
+
+        if not bucket or (bucket.rate, bucket.burst) != (rate, burst):
+            BUCKETS[domain] = TokenBucket(rate, max(burst, 1))
+
+
+def get_bucket(url):
+    """Finds the bucket limiting an url's host, if there is any."""
+    host = get_domain(url)
+
+    with BUCKETS_LOCK:
+        while host:
+            if host in BUCKETS:
+                return BUCKETS[host]
+
+            # Try the parent domain (e.g. social.techcrunch.com's)
+            host = host.partition('.')[2]
+
+    return None
+
+
+def download(url, **kwargs):
+    """
+    Downloads a given url through the shared session, respecting its host's
+    rate limit and the global cap of simultaneous connections.
+    """
+    run = current_run()
+
+    try:
+        return download_with_retries(url, run, **kwargs)
+
+    except requests.RequestException as error:
+        if run:
+            run.fail(url, error)
+
+        raise
+
+
+def download_with_retries(url, run=None, **kwargs):
+    """
+    Downloads an url as `download` does, within the run's deadline. Timeouts,
+    connection errors and transient statuses are retried up to
+    `SCRAPER_RETRIES` times, waiting a random time up to an exponentially
+    growing backoff, unless the host's circuit is open.
+    """
+    host = get_domain(url)
+    breaker = get_breaker(host) if host else None
+    timeout = kwargs.pop('timeout', (
+        settings.SCRAPER_CONNECT_TIMEOUT,
+        settings.SCRAPER_READ_TIMEOUT
+    ))
+
+    for attempt in range(settings.SCRAPER_RETRIES + 1):
+        if breaker and not breaker.allow():
+            raise CircuitOpen('The circuit of {} is open.'.format(host))
+
+        remaining = run.remaining() if run else None
+
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded('The run is over its deadline.')
+
+        # Waiting for the host's turn is also bounded by the deadline
+        bucket = get_bucket(url)
+
+        if bucket and not bucket.acquire(remaining):
+            raise DeadlineExceeded('The run is over its deadline.')
+
+        remaining = run.remaining() if run else None
+
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded('The run is over its deadline.')
+
+        # So is waiting for a connection, which a streamed response keeps
+        # until its body is released
+        if not CONNECTIONS.acquire(timeout=remaining):
+            raise DeadlineExceeded('The run is over its deadline.')
+
+        slot = ConnectionSlot()
+
+        # The waits may have used up the time left, which would make the
+        # request's timeout negative
+        remaining = run.remaining() if run else None
+
+        if remaining is not None and remaining <= 0:
+            slot.release()
+            raise DeadlineExceeded('The run is over its deadline.')
+
+        try:
+            response = get_session().get(url, timeout=tuple(
+                t if remaining is None else min(t, remaining)
+                for t in timeout
+            ), **kwargs)
+
+            if response.status_code not in TRANSIENT_STATUSES:
+                if breaker:
+                    breaker.succeed()
+
+                if kwargs.get('stream'):
+                    slot.hold(response)
+
+                return response
+
+            # Give the connection back to its pool, or it is held forever
+            response.close()
+
+            error = requests.HTTPError(
+                '{} answered {}.'.format(url, response.status_code),
+                response=response
+            )
+
+        except (requests.ConnectionError, requests.Timeout) as exception:
+            error = exception
+
+        finally:
+            if not slot.holding:
+                slot.release()
+
+        if breaker:
+            breaker.fail()
+
+        if attempt == settings.SCRAPER_RETRIES:
+            raise error
+
+        backoff = settings.SCRAPER_RETRY_BACKOFF * 2 ** attempt
+        wait = random.uniform(0, backoff)
+
+        if remaining is not None:
+            wait = min(wait, max(remaining, 0))
+
+        LOGGER.info('Retrying %s in %.1fs: %s', url, wait, error)
+        time.sleep(wait)
+
+
+def iter_body(response, max_size=None, hold=False):
+    """
+    Yields the body of a streamed response in chunks, releasing it (see
+    `release`) once the body is over or the reader stops early. A body over
+    `max_size` bytes fails with `BodyTooLarge` as soon as it is known to be,
+    by its declared length or by what was read, and one still being read at
+    the run's deadline fails with `DeadlineExceeded`.
+
+    The bytes read are recorded on the current run, along with the most of
+    them held at once: a chunk, or the whole body if the reader keeps it
+    (`hold`).
+    """
+    run = current_run()
+    size = peak = 0
+
+    try:
+        declared = str(response.headers.get('Content-Length', ''))
+
+        if max_size and declared.isdigit() and int(declared) > max_size:
+            raise BodyTooLarge('{} declares {} bytes, over {}.'.format(
+                response.url, declared, max_size
+            ))
+
+        for chunk in response.iter_content(settings.SCRAPER_CHUNK_SIZE):
+            size += len(chunk)
+
+            # Each read is bounded by the read timeout, the whole body by the
+            # run's deadline
+            if run and run.expired():
+                raise DeadlineExceeded(
+                    '{} was not read by the deadline.'.format(response.url)
+                )
+
+            if max_size and size > max_size:
+                raise BodyTooLarge('{} is over {} bytes.'.format(
+                    response.url, max_size
+                ))
+
+            peak = size if hold else max(peak, len(chunk))
+            yield chunk
+
+    except (BodyTooLarge, DeadlineExceeded) as error:
+        if run:
+            run.fail(response.url, error)
+
+        raise
+
+    finally:
+        release(response)
+
+        if run:
+            run.read(response.url, size, peak)
+
+
+def release(response):
+    """
+    Closes a streamed response, giving its connection back to its pool, and
+    gives its slot among the `SCRAPER_MAX_CONNECTIONS` back to the process.
+    """
+    try:
+        response.close()
+    finally:
+        slot = getattr(response, 'connection_slot', None)
+
+        if slot is not None:
+            slot.release()
+
+
+def read_body(response, max_size=None):
+    """Reads the whole body of a streamed response, as `iter_body` does."""
+    return b''.join(iter_body(response, max_size, hold=True))
+
+
+def connection_stats():
+    """
+    Reports, for each host, how many requests were made and how many of them
+    needed a new connection. The difference is the number of handshakes saved
+    by keeping connections alive.
+    """
+    stats = {}
+
+    for adapter in set(get_session().adapters.values()):
+        pools = adapter.poolmanager.pools
+
+        for key in pools.keys():
+            pool = pools[key]
+            host = stats.setdefault(pool.host, Counter())
+            host['requests'] += pool.num_requests
+            host['connections'] += pool.num_connections
+
+    for host in stats.values():
+        host['reused'] = max(host['requests'] - host['connections'], 0)
+
+    return stats
+
+
+def connection_totals():
+    """Sums up the connection counters of every host."""
+    totals = Counter()
+
+    for host in connection_stats().values():
+        totals.update(host)
+
+    return totals
+
+
+async def gather(urls, function, concurrency, executor):
+    """
+    Schedules `function` for every url on the executor, but never lets more
+    than `concurrency` of them run at once. Errors are logged and the url's
+    result is set to None, so one bad page does not spoil the whole batch.
+    """
+    loop = asyncio.get_event_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        """Runs the blocking function for a single url."""
+        async with semaphore:
+            try:
+                return await loop.run_in_executor(executor, function, url)
+            except Exception as error: #pylint: disable=broad-except
+                LOGGER.warning('Could not fetch %s: %s', url, error)
+                return None
+
+    return await asyncio.gather(*[fetch(url) for url in urls])
+
+
+def fetch_all(urls, function=download, concurrency=None):
+    """
+    Applies `function` (a download by default) to every given url with bounded
+    concurrency and returns a dictionary mapping each url to its result. The
+    urls keep their order and repeated ones are fetched only once.
+    """
+
+    urls = list(OrderedDict.fromkeys(url for url in urls if url))
+
+    if not urls:
+        return OrderedDict()
+
+    if not concurrency:
+        concurrency = settings.SCRAPER_CONCURRENCY
+
+    # The engine's threads download on behalf of the caller's run
+    run = current_run()
+
+    def run_function(url):
+        """Applies the function to an url within the caller's run."""
+        LOCAL.run = run
+        return function(url)
+
+    # A private event loop keeps this function safe to call from synchronous
+    # code, such as celery tasks, which may have their own loop set.
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(urls)))
+
+    try:
+        results = loop.run_until_complete(
+            gather(urls, run_function, concurrency, executor)
+        )
+    finally:
+        executor.shutdown(wait=True)
+        loop.close()
+
+    return OrderedDict(zip(urls, results))
@@ -0,0 +1,87 @@
+"""
+This file brings the identity caches used by the scrapers. Outlets are looked
+up by name once per worker (for a few minutes at most, and forgotten as soon as
+any outlet is saved or deleted in this process); authors and categories are
+kept by an identity map living as long as a scraper's run, so an author or a
+tag repeated across a feed costs no extra queries.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from articles.models import Outlet
+
+OUTLETS = {}
+OUTLETS_LOCK = threading.Lock()
+
+
+class IdentityMap(object):
+    """
+    This class maps model instances by their natural keys (e.g. a category's
+    slug). Keys may have a scope, such as the outlet an author writes for.
+    """
+
+    def __init__(self):
+        self.instances = {}
+
+
+    def get(self, model, key, scope=None):
+        """Gives the instance with a given key, if it is known."""
+        return self.instances.get((model, scope, key))
+
+
+    def add(self, model, key, instance, scope=None):
+        """Remembers an instance by its key."""
+        self.instances[(model, scope, key)] = instance
+
+
+    def find(self, model, keys, scope=None):
+        """Gives a dictionary with the known instances among the given keys."""
+        found = {}
+
+        for key in keys:
+            instance = self.instances.get((model, scope, key))
+
+            if instance is not None:
+                found[key] = instance
+
+        return found
+
+
+    def clear(self):
+        """Forgets every instance."""
+        self.instances.clear()
+
+
+def get_outlet(name):
+    """
+    Finds an outlet by name, asking the database at most once every
+    `SCRAPER_IDENTITY_TTL` seconds. Missing outlets are not cached.
+    """
+    now = time.monotonic()
+
+    with OUTLETS_LOCK:
+        cached = OUTLETS.get(name)
+
+        if cached and now - cached[1] < settings.SCRAPER_IDENTITY_TTL:
+            return cached[0]
+
+    outlet = Outlet.objects.filter(name=name).first()
+
+    if outlet:
+        with OUTLETS_LOCK:
+            OUTLETS[name] = (outlet, now)
+
+    return outlet
+
+
+@receiver(post_save, sender=Outlet)
+@receiver(post_delete, sender=Outlet)
+def forget_outlets(**kwargs): #pylint: disable=unused-argument
+    """Any change on outlets may change the cached ones, so forget them."""
+    with OUTLETS_LOCK:
+        OUTLETS.clear()
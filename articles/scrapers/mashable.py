@@ -1,7 +1,7 @@
 import django.template.defaultfilters as filters
 
+from articles.scrapers.records import ArticleRecord
 from articles.scrapers.scraper import WebScraper
-from articles.models import Article
 
 
 class Mashable(WebScraper):
@@ -28,21 +28,15 @@ class Mashable(WebScraper):
         self.feed_type = 'twitter'
         self.author_page_type = 'html'
         self.article_page_type = 'html'
-        self.author_url = None
 
 
     def get_authors_page(self, author_name):
         """
-        This method provides the author's profile url, the url can be set
-        previously at the `author_url` attribute; but it can only be used once.
+        This method provides the author's profile url, given by his/her name
+        slugified. The profile found on one of his/her articles is preferred,
+        see `author_page`.
         """
 
-        if self.author_url:
-            # Use and remove `author_url`
-            url, self.author_url = self.author_url, None
-
-            return url
-
         return 'http://mashable.com/author/' + filters.slugify(author_name)
 
 
@@ -78,11 +72,6 @@ class Mashable(WebScraper):
             'content')
 
 
-        # If article's URL is already stored, don't parse it again
-        if Article.objects.filter(url=data['url']).count() > 0:
-            return {}
-
-
         # Get the article's thumbnail
         thumb = self.get_text_or_attr(parsed, 'meta[@property="og:image"]', \
             'content')
@@ -102,33 +91,23 @@ class Mashable(WebScraper):
 
         # At this point, there is no Mashable article with more than one author
         # we know about. When this case comes up, we need to deal with it here.
-        # A for loop should suffice.
-        author = {
-            'name': author_name
-        }
+        # A for loop should suffice. The author is resolved afterwards, along
+        # with every other article's authors, by `resolve_authors`.
+        data['authors'] = [{'name': author_name}]
 
-        # Tries to find his/her profile page
+        # Tries to find his/her profile page. By default, the author's url
+        # profile is given by his/her name slugified, but if his page is found
+        # at the parsed HTML, it is used instead.
         page = self.get_text_or_attr(parsed, 'span[@class="author_name"]/a', \
             'href')
 
-        prefix = 'http://mashable.com'
-
-        # By default, the author's url profile is given by his/her name
-        # slugified, but if his page is found at the parsed HTML, use it.
-        self.author_url = prefix + '/author/' + filters.slugify(author_name)
         if page:
-            self.author_url = prefix + page
-
-        # Set his profile page as the url to be fetched by `get_author`
-        author.update(self.get_author(author_name, 0))
-
-
-        # Add author to the list
-        data['authors'] = [author]
+            data['authors'][0]['profile'] = 'http://mashable.com' + page
 
 
         # Get article's content
-        items = parsed.xpath('.//section[@class="article-content blueprint"]/p')
+        xpath = './/section[@class="article-content blueprint"]/p'
+        items = self.xpath(xpath)(parsed)
         data['content'] = self.clear_text(items)
 
 
@@ -142,6 +121,12 @@ class Mashable(WebScraper):
         form given in utils' function `create_article`.
         """
 
+        # Find the article's link of every status first, so all the articles'
+        # pages can be downloaded at once. The same article may be tweeted more
+        # than once, but its page is downloaded only once.
+        found = []
+        links = set()
+
         for status in statuses:
             link = None
 
@@ -155,14 +140,73 @@ class Mashable(WebScraper):
                 continue
 
 
-            # Downloads and parses the article's page
-            parsed = self.parse(link, self.article_page_type)
-            article = self.article_info(parsed)
+            # The timeline is ordered newest first, so the statuses from here
+            # on were already seen on the last runs.
+            date = self.parse_datetime_passing_errors(status.created_at)
+
+            if self.reached_watermark(date, link):
+                break
 
 
-            if article == {}:
+            # Skip articles already seen on this run or stored before; the
+            # page's canonical url is checked again by `article_info`.
+            if link in links:
+                continue
+
+            if self.already_stored(self.remove_query(link)):
                 continue
 
+            links.add(link)
+            found += [(status, link)]
+
+
+        # Extract the articles' pages on the parsing pool. The shortened links
+        # don't tell the article's url, so each page's head is read first and
+        # its body is only downloaded if the canonical url is not in the url
+        # index (which the checks above already built on this thread).
+        links = [link for _, link in found]
+        records = self.extract_pages(
+            links, self.article_page_type, 'article_info',
+            fetch=self.fetch_new_page
+        )
+
+        # The index may give false positives: the pages whose articles are not
+        # really stored are downloaded in full after all.
+        missed = [
+            link for link in links if link in self.maybe_stored and \
+            not self.already_stored(self.maybe_stored[link])
+        ]
+
+        for link in missed:
+            del self.maybe_stored[link]
+
+        if missed:
+            records.update(self.extract_pages(
+                missed, self.article_page_type, 'article_info'
+            ))
+
+
+        articles = []
+
+        for status, link in found:
+
+            article = records.get(link)
+
+            if not article:
+                continue
+
+
+            # If article's URL is already stored, don't parse it again
+            if self.already_stored(article['url']):
+                continue
+
+
+            # Keep the author's profile page found at the article's one
+            author = article['authors'][0]
+
+            if 'profile' in author:
+                self.author_pages.setdefault(author['name'], author['profile'])
+
 
             # In case there is no pub_date in the article's page, use the pub
             # date of the twitter status itself.
@@ -175,7 +219,13 @@ class Mashable(WebScraper):
                 article['date'] = date
 
 
-            yield article
+            articles += [(article, [a['name'] for a in article['authors']])]
+
+
+        # Resolve every author once, downloading the profile pages of all
+        # unknown authors concurrently, and hand the articles over as records
+        for article in self.resolve_authors(articles):
+            yield ArticleRecord.from_dict(article)
 
 
     def extract_author(self, parsed, author_idx=0):
@@ -202,7 +252,7 @@ class Mashable(WebScraper):
 
 
         # Get description text provided by the author
-        items = parsed.xpath('.//div[@class="profile-about"]')
+        items = self.xpath('.//div[@class="profile-about"]')(parsed)
         author['about'] = self.clear_text(items)
 
 
@@ -0,0 +1,86 @@
+"""
+This file brings the memo of parsed pages kept by a scraper along a run. An
+article's page may be asked for once per author (to find each one's profile
+link or twitter handle) and an author's profile through both the slug guess
+and the link found on the article; with the memo, each page is downloaded and
+parsed only once. The memo is bounded by how many elements the parsed pages
+have (`SCRAPER_PAGE_MEMO_SIZE`), which is what their memory grows with, and
+the least recently used pages are dropped first.
+"""
+
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+def page_size(parsed):
+    """Gives how many elements a parsed page has (1 if it is not a tree)."""
+    if hasattr(parsed, 'getroottree'):
+        return sum(1 for _ in parsed.getroottree().iter())
+
+    return 1
+
+
+class PageMemo(object):
+    """
+    This class keeps parsed pages by url and content type, the most recently
+    used last.
+    """
+
+    def __init__(self, max_size=None):
+        if max_size is None:
+            max_size = settings.SCRAPER_PAGE_MEMO_SIZE
+
+        self.max_size = max_size
+        self.size = 0
+        self.pages = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def __contains__(self, key):
+        return key in self.pages
+
+
+    def get(self, url, content_type):
+        """Gives a parsed page, if it is kept, as the most recently used."""
+        key = (url, content_type)
+        page = self.pages.get(key)
+
+        if page is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.pages.move_to_end(key)
+
+        return page[0]
+
+
+    def add(self, url, content_type, parsed):
+        """
+        Keeps a parsed page, forgetting the least recently used ones until
+        everything fits. Pages larger than the whole memo are not kept.
+        """
+        key = (url, content_type)
+        size = page_size(parsed)
+
+        if key in self.pages:
+            self.size -= self.pages.pop(key)[1]
+
+        if parsed is None or size > self.max_size:
+            return
+
+        self.pages[key] = (parsed, size)
+        self.size += size
+
+        while self.size > self.max_size:
+            _, (_, dropped) = self.pages.popitem(last=False)
+            self.size -= dropped
+
+
+    def clear(self):
+        """Forgets every page."""
+        self.pages.clear()
+        self.size = 0
@@ -0,0 +1,164 @@
+"""
+This file brings the records handed by the scrapers' extractors to
+`WebScraper.create_articles`. They used to be plain dictionaries, checked
+key by key against freshly built lists of required and accepted keys every
+time one was stored. Records have fixed `__slots__` instead, so they are
+smaller than dictionaries, and they are checked once, when they are built:
+their constructors only take the keys a record accepts and require the keys
+it needs. Only if a dictionary does not fit is it compared against the key
+sets, computed once for all records, to tell what is wrong with it.
+"""
+
+EXCEPTIONS = {
+    'unacceptable': 'There are unacceptable attributes on your request.',
+    'required': 'You must provide all required parameters to add an article.',
+}
+
+
+def check_keys(data, required, accepted):
+    """Checks that a dictionary has every required key and no other one."""
+    if not data.keys() <= accepted:
+        raise ValueError(EXCEPTIONS['unacceptable'])
+
+    if not data.keys() >= required:
+        raise ValueError(EXCEPTIONS['required'])
+
+
+def build(cls, data):
+    """
+    Builds a record of a class from a dictionary. If the dictionary does not
+    fit the class' constructor, a `ValueError` tells whether it misses some
+    required key or has some unacceptable one.
+    """
+    if isinstance(data, cls):
+        return data
+
+    try:
+        return cls(**data)
+    except TypeError:
+        check_keys(data, cls.REQUIRED, cls.ACCEPTED)
+        raise
+
+
+def present_fields(record, keys, kind=object):
+    """Gives a record's fields among the given keys which are of a kind."""
+    fields = {}
+
+    for key in keys:
+        value = getattr(record, key)
+
+        if value is not None and isinstance(value, kind):
+            fields[key] = value
+
+    return fields
+
+
+class AuthorRecord(object):
+    """
+    This class keeps an author's information as found by a scraper. Only his
+    or her name is required; the fields not found are None.
+    """
+
+    __slots__ = (
+        'name', 'twitter', 'avatar', 'facebook', 'linkedin', 'about',
+        'profile', 'website'
+    )
+
+    REQUIRED = frozenset(['name'])
+    ACCEPTED = frozenset(__slots__)
+
+    # The fields stored on new authors (the name is their key)
+    STORED = __slots__[1:]
+
+    def __init__(self, name, twitter=None, avatar=None, facebook=None, \
+            linkedin=None, about=None, profile=None, website=None):
+        self.name = name
+        self.twitter = twitter
+        self.avatar = avatar
+        self.facebook = facebook
+        self.linkedin = linkedin
+        self.about = about
+        self.profile = profile
+        self.website = website
+
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds an author's record from a dictionary, checking its keys."""
+        return build(cls, data)
+
+
+    def fields(self):
+        """Gives the fields found for the author, but his/her name."""
+        return present_fields(self, self.STORED)
+
+
+    def as_dict(self):
+        """Gives the record as the dictionary it could be built from."""
+        return dict(self.fields(), name=self.name)
+
+
+class ArticleRecord(object):
+    """
+    This class keeps an article's information as found by a scraper, with
+    the records of its authors (at least one) and its categories' names.
+    """
+
+    __slots__ = (
+        'title', 'url', 'date', 'content', 'authors', 'categories', 'thumb'
+    )
+
+    REQUIRED = frozenset(['title', 'url', 'date', 'content', 'authors'])
+    ACCEPTED = frozenset(__slots__)
+
+    # The fields stored on the article itself when they are texts
+    STORED = ('title', 'content', 'thumb')
+
+    def __init__(self, title, url, date, content, authors, categories=(), \
+            thumb=None):
+        self.title = title
+        self.url = url
+        self.date = date
+        self.content = content
+        self.thumb = thumb
+
+        self.authors = [build(AuthorRecord, author) for author in authors]
+
+        if not self.authors:
+            raise ValueError(EXCEPTIONS['required'])
+
+        # If the article has just one category, it may come as str
+        if isinstance(categories, str):
+            categories = [categories]
+
+        self.categories = list(categories)
+
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds an article's record from a dictionary, checking its keys."""
+        return build(cls, data)
+
+
+    def fields(self):
+        """Gives the article's own fields which are texts, but its url."""
+        return present_fields(self, self.STORED, str)
+
+
+    def as_dict(self):
+        """Gives the record as the dictionary it could be built from."""
+        data = {
+            'title': self.title,
+            'url': self.url,
+            'date': self.date,
+            'content': self.content,
+            'authors': [author.as_dict() for author in self.authors],
+        }
+
+        if self.categories:
+            data['categories'] = list(self.categories)
+
+        if self.thumb is not None:
+            data['thumb'] = self.thumb
+
+        return data
@@ -0,0 +1,107 @@
+"""
+This file brings the report of a scraper's run. Instead of collecting every
+stored article to count them afterwards, a run stores its articles in chunks
+of `SCRAPER_INGEST_CHUNK` as they are extracted and only keeps counters: the
+feed items seen, those skipped for being already stored, the articles created,
+the article pages that could not be downloaded, the authors' profiles fetched,
+the bytes downloaded and the time spent on each stage.
+
+The stored articles are not kept, and TechCrunch's and Engadget's are found
+lazily and have their authors resolved a chunk at a time too. What a run still
+keeps whole is its parsed feed (unless it is streamed) and, for the outlets
+whose articles are extracted from their own pages, the records of every new
+page of the feed: those are downloaded and checkpointed in batches.
+
+Once the run is over, however it ends, the report is logged as a single
+structured line.
+"""
+
+import json
+import logging
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+
+LOGGER = logging.getLogger(__name__)
+
+# The stages of a run, in the order they happen
+STAGES = ['feed', 'extract', 'store']
+
+
+def chunked(iterable, size):
+    """Yields lists of `size` items of an iterable until it is over."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+class RunReport(object):
+    """
+    This class counts what a scraper's run did and how long each of its
+    stages took (in seconds).
+    """
+
+    def __init__(self):
+        self.seen = 0
+        self.duplicates = 0
+        self.created = 0
+        self.failed = 0
+        self.authors = 0
+        self.downloaded = 0
+        self.peak = 0
+        self.times = OrderedDict((stage, 0.0) for stage in STAGES)
+
+
+    @contextmanager
+    def stage(self, name):
+        """Adds the time spent within this context to a stage."""
+        start = time.monotonic()
+
+        try:
+            yield
+        finally:
+            self.times[name] += time.monotonic() - start
+
+
+    def timed(self, name, iterable):
+        """
+        Yields the items of an iterable, adding the time spent producing them
+        to a stage; the time the consumer spends on each one is not counted.
+        """
+        iterator = iter(iterable)
+
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+
+            yield item
+
+
+    def as_dict(self):
+        """Gives the report as a dictionary, ready to be serialized."""
+        return OrderedDict([
+            ('seen', self.seen),
+            ('duplicates', self.duplicates),
+            ('created', self.created),
+            ('failed', self.failed),
+            ('authors', self.authors),
+            ('downloaded', self.downloaded),
+            ('peak', self.peak),
+            ('times', OrderedDict(
+                (stage, round(seconds, 3))
+                for stage, seconds in self.times.items()
+            )),
+        ])
+
+
+    def log(self, outlet):
+        """Logs the report as a single json line."""
+        LOGGER.info('%s: run report %s', outlet, json.dumps(self.as_dict()))
@@ -0,0 +1,106 @@
+"""
+This file brings the adaptive polling schedule of the outlets. Instead of
+polling every outlet at the same fixed hours, each one is polled about as
+often as it posts: its expected time between articles is estimated from its
+latest articles' dates and from how many articles its last poll found. Hot
+outlets are polled often and quiet ones rarely, always between
+`SCRAPER_POLL_MIN_INTERVAL` and `SCRAPER_POLL_MAX_INTERVAL` seconds, and
+polls that find nothing new make the next one come later and later.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from articles.models import Article, Outlet, PollSchedule
+
+
+def posting_interval(outlet):
+    """
+    Estimates the seconds between an outlet's articles from the dates of its
+    latest `SCRAPER_POLL_HISTORY` articles, or None if it has less than two.
+    """
+    dates = list(
+        Article.objects.filter(outlet_id=outlet.id)
+        .order_by('-date')
+        .values_list('date', flat=True)[:settings.SCRAPER_POLL_HISTORY]
+    )
+
+    if len(dates) < 2:
+        return None
+
+    return (dates[0] - dates[-1]).total_seconds() / (len(dates) - 1)
+
+
+def poll_interval(schedule, items, now):
+    """
+    Gives the seconds until an outlet's next poll, after a poll that found
+    `items` new articles. The expected time between articles is the posting
+    history's, averaged with the one seen since the last poll when it found
+    something; it is then doubled (`SCRAPER_POLL_BACKOFF`) for each empty
+    poll in a row.
+    """
+    interval = posting_interval(schedule.outlet)
+
+    if items and schedule.last_poll:
+        seen = (now - schedule.last_poll).total_seconds() / items
+        interval = seen if interval is None else (interval + seen) / 2
+
+    if interval is None:
+        interval = settings.SCRAPER_POLL_MAX_INTERVAL
+
+    # Past a few empty polls the interval is at its maximum anyway
+    backoff = min(schedule.empty_polls, 32)
+    interval *= settings.SCRAPER_POLL_BACKOFF ** backoff
+
+    return min(
+        max(interval, settings.SCRAPER_POLL_MIN_INTERVAL),
+        settings.SCRAPER_POLL_MAX_INTERVAL
+    )
+
+
+def claim_due_outlets(names, now=None):
+    """
+    Gives the names, among the given ones, of the active outlets due to be
+    polled; outlets never polled are always due. Their next poll is pushed
+    `SCRAPER_POLL_LEASE` seconds ahead, so they are not polled again while
+    this poll goes on; `record_poll` schedules the actual next one.
+    """
+    now = now or timezone.now()
+
+    outlets = Outlet.objects.filter(active=True, name__in=names)
+    polled = PollSchedule.objects.filter(outlet__in=outlets, next_poll__gt=now)
+    polled = set(polled.values_list('outlet_id', flat=True))
+
+    due = [outlet for outlet in outlets if outlet.id not in polled]
+    lease = now + datetime.timedelta(seconds=settings.SCRAPER_POLL_LEASE)
+
+    for outlet in due:
+        PollSchedule.objects.update_or_create(
+            outlet=outlet, defaults={'next_poll': lease}
+        )
+
+    return [outlet.name for outlet in due]
+
+
+def record_poll(outlet, items, now=None):
+    """
+    Records that an outlet was polled and found `items` new articles (a
+    failed poll counts as an empty one), scheduling its next poll.
+    """
+    now = now or timezone.now()
+
+    schedule, _ = PollSchedule.objects.get_or_create(outlet=outlet)
+
+    if items:
+        schedule.empty_polls = 0
+    else:
+        schedule.empty_polls += 1
+
+    schedule.interval = poll_interval(schedule, items, now)
+    schedule.next_poll = now + datetime.timedelta(seconds=schedule.interval)
+    schedule.last_poll = now
+    schedule.save()
+
+    return schedule
@@ -1,24 +1,34 @@
+import hashlib
 import json
-import os
-import re
-import twitter
+import logging
+import datetime
 import dateutil.parser
-import requests
+
+from collections import OrderedDict
 
 from lxml import etree, html
 
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.template.defaultfilters import slugify, title
+from django.utils import timezone
 from django.utils.html import strip_tags
 
-from articles.models import Author, Category, Outlet, Article
+from articles.models import Author, Category, Outlet, Article, Feed
+from articles.scrapers import bloom, cache, checkpoint, fetcher, identity, \
+    memo, report, workers
+from articles.scrapers.records import ArticleRecord, \
+    EXCEPTIONS as RECORD_EXCEPTIONS
+
+LOGGER = logging.getLogger(__name__)
 
 EXCEPTIONS = {
     'feed': 'You must set the articles\' feed configs (i.e. url and type).',
     'extract_method': 'Scraper must provide an `extract_articles` method.',
     'download': 'A parsing method was not implemented for this data type.',
     'not_parsed': 'The available method couldn\'t parse your url.',
-    'unacceptable': 'There are unacceptable attributes on your request.',
-    'required': 'You must provide all required parameters to add an article.',
+    'unacceptable': RECORD_EXCEPTIONS['unacceptable'],
+    'required': RECORD_EXCEPTIONS['required'],
     'outlet': 'You must provide an outlet to create articles.',
     'nsmap': 'The namespace must be a dictionary.',
     'author': 'You must set the authors\' page configs (i.e. url and type).',
@@ -26,6 +36,35 @@ EXCEPTIONS = {
     'get_authors_page': 'Scraper must provide an `get_authors_page` method.',
 }
 
+# These content types are downloaded over HTTP
+HTTP_TYPES = ['xml', 'html', 'json', 'xml-stream', 'html-head']
+
+# These content types are parsed while they are downloaded
+STREAM_TYPES = ['xml-stream', 'html-head']
+
+# Statuses asked for per page of twitter timelines (the API's maximum)
+TIMELINE_SIZE = 200
+
+# Namespaces every scraper knows; `nsmap` may add to or change them
+NAMESPACES = {
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'media': 'http://search.yahoo.com/mrss/',
+    'feedburner': 'http://rssnamespace.org/feedburner/ext/1.0',
+}
+
+# Html elements whose text is serialized as it is, see `element_text`
+RAW_TEXT_TAGS = ['script', 'style']
+
+# Characters removed from cleared texts, see `clear_text`
+BREAK_LINES = str.maketrans('', '', '\n\t')
+
+
+def escape_text(text):
+    """Escapes a html text node's `&`, `<` and `>` characters."""
+    text = text.replace('&', '&amp;')
+    return text.replace('<', '&lt;').replace('>', '&gt;')
+
+
 class WebScraper(object):
     """This class provides some helpful method to scraping web content."""
 
@@ -38,8 +77,37 @@ class WebScraper(object):
         self.outlet = None
         self.nsmap = None
 
+        # Pages parsed on this run, see `memo.PageMemo`
+        self.pages = memo.PageMemo()
+
+        # The newest item (date and url) seen on the feed's last run and the
+        # newest one seen on this run, see `reached_watermark`.
+        self.watermark = None
+        self.newest = None
+
+        # Authors and categories found on this run, see `identity.IdentityMap`
+        self.identity = identity.IdentityMap()
+
+        # Authors known not to be stored yet and the profile pages found for
+        # some authors on the articles, see `resolve_authors`
+        self.new_authors = set()
+        self.author_pages = {}
+
+        # Pages and authors extracted on this run, see `checkpoint.Checkpoint`
+        self.checkpoint = checkpoint.Checkpoint()
+
+        # The deadline and failed downloads of this run, see `fetcher.FetchRun`
+        self.fetch_run = None
+
+        # Canonical urls of the pages not downloaded by `fetch_new_page`
+        self.maybe_stored = {}
+        self.failed_pages = set()
+
+        # What this run did, see `report.RunReport`
+        self.report = report.RunReport()
+
         if name:
-            self.outlet = Outlet.objects.filter(name=name).first()
+            self.outlet = identity.get_outlet(name)
 
 
     def extract_articles(self, data):
@@ -72,6 +140,21 @@ class WebScraper(object):
         author and categories. The data will be checked to make sure no
         unacceptable input comes in and every required attribute is met.
         """
+        return self.create_articles([data])[0]
+
+
+    def create_articles(self, articles_data):
+        """
+        This function stores a batch of articles with their authors and
+        categories (see `create_article`), given as records or as dictionaries
+        to build them from (see `records.ArticleRecord`). Instead of a few
+        queries for each article, author and category, everything is resolved
+        with set-based queries and bulk inserts in a single transaction.
+        Articles, authors and categories already stored are reused, just like
+        `get_or_create` would.
+
+        It returns the articles in the same order as their data.
+        """
 
         if not hasattr(self, 'outlet'):
             raise ValueError(EXCEPTIONS['outlet'])
@@ -79,72 +162,200 @@ class WebScraper(object):
         if not isinstance(self.outlet, Outlet):
             raise ValueError(EXCEPTIONS['outlet'])
 
-        self.check_data(data)
+        # Records were checked when they were built, dictionaries are now
+        records = [ArticleRecord.from_dict(data) for data in articles_data]
 
-        # Form a dictionary with all article's information but its `url`, the
-        # article's information can be seen as anything whose type is str
-        # inside `data`. However, `date` does not live up by this rule, so we
-        # add it manually to article_def.
-        url = data.pop('url')
 
-        # Get exiting categories from data, if the article has just one, it
-        # will come as str; in that case, convert it to a unitary list.
-        categories = []
+        # Split every article's record in its own attributes, its authors and
+        # its categories. The article's information is its text fields but its
+        # `url`, plus its `date`.
+        articles = OrderedDict()
+        authors = OrderedDict()
+        categories = OrderedDict()
+        links = []
 
-        if 'categories' in data:
-            categories = data.pop('categories')
+        for record in records:
+            url = record.url
 
-            if isinstance(categories, str):
-                categories = [categories]
+            article = record.fields()
+            article['date'] = record.date
+            article['outlet_id'] = self.outlet.id
 
+            articles.setdefault(url, article)
 
-        # After removing the url and categories from data, we can parse the
-        # dictionary for string values. Every string value should be an article
-        # property.
-        article = {key: data[key] for key in data if isinstance(data[key], str)}
-        article['date'] = data.pop('date')
-        article['outlet_id'] = self.outlet.id
 
-        article, _ = Article.objects.get_or_create(
-            url=url,
-            defaults=article
-        )
+            # Every author's information but his/her name, for new authors
+            for author in record.authors:
+                if author.name not in authors:
+                    authors[author.name] = author.fields()
 
 
-        # Store non existing authors and assign them to the article
-        for author_info in data['authors']:
+            slugs = []
+            for cat_name in record.categories:
+                slug = slugify(cat_name)
+                categories.setdefault(slug, title(cat_name))
+                slugs += [slug]
 
-            # Form a dictionary with all author's information but his/her name
-            author = {k: author_info[k] for k in author_info if k != 'name'}
+            links += [(url, [a.name for a in record.authors], slugs)]
 
-            author, _ = Author.objects.get_or_create(
-                name=author_info['name'],
-                outlet_id=self.outlet.id,
-                defaults=author
-            )
 
-            article.authors.add(author)
+        with transaction.atomic():
+            articles, created = self.bulk_get_or_create(
+                Article, 'url', articles,
+            )
 
+            # Authors and categories seen before on this run are not looked up
+            authors, _ = self.bulk_get_or_create(
+                Author, 'name', authors,
+                self.identity.find(Author, authors, self.outlet.id),
+                outlet_id=self.outlet.id
+            )
 
-        # Store non existing categories and assign them to the article
-        for cat_name in categories:
-            category, _ = Category.objects.get_or_create(
-                slug=slugify(cat_name),
-                defaults={
-                    'name': title(cat_name)
-                }
+            categories, _ = self.bulk_get_or_create(
+                Category, 'slug',
+                OrderedDict((s, {'name': categories[s]}) for s in categories),
+                self.identity.find(Category, categories)
             )
 
-            article.categories.add(category)
 
+            # Relate articles to their authors and categories. Only articles
+            # stored before may already have some of these relations.
+            author_links = set()
+            category_links = set()
+
+            for url, names, slugs in links:
+                article_id = articles[url].id
+                author_links |= {(article_id, authors[n].id) for n in names}
+                category_links |= {(article_id, categories[s].id) for s in slugs}
+
+            stored = [a.id for url, a in articles.items() if url not in created]
+
+            self.bulk_link(Article.authors.through, 'author_id', \
+                author_links, stored)
+            self.bulk_link(Article.categories.through, 'category_id', \
+                category_links, stored)
+
+
+        # Only remember them once they are surely stored
+        for name, author in authors.items():
+            self.identity.add(Author, name, author, self.outlet.id)
+
+        for slug, category in categories.items():
+            self.identity.add(Category, slug, category)
+
+        index = bloom.get_url_index()
+        for url in created:
+            index.add(url)
+
+        self.report.created += len(created)
+
+        return [articles[url] for url, _, _ in links]
+
+
+    @staticmethod
+    def bulk_get_or_create(model, key, defaults, known=None, **fields):
+        """
+        This method finds the `model` instances whose `key` field is in the
+        given `defaults` dictionary keys, creating the missing ones with their
+        default values in a single insert. Instances already `known` (by key)
+        are not looked up. If a concurrent run inserted some of them first,
+        the missing ones are got or created one at a time. It returns a
+        dictionary mapping each key to its instance and the set of keys just
+        created.
+        """
+
+        instances = dict(known or {})
+        wanted = [k for k in defaults if k not in instances]
+
+        if not wanted:
+            return instances, set()
+
+        query = {key + '__in': wanted}
+        query.update(fields)
+
+        for instance in model.objects.filter(**query):
+            instances.setdefault(getattr(instance, key), instance)
+
+        missing = [k for k in defaults if k not in instances]
+
+        if not missing:
+            return instances, set()
 
-        return article
+        new_instances = []
+        for k in missing:
+            values = dict(defaults[k], **fields)
+            values[key] = k
+            new_instances += [model(**values)]
+
+        # Another run may insert some of the missing instances between the
+        # select and the insert. The insert is then undone (up to its own
+        # savepoint) and they are got or created one by one instead.
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(new_instances)
+        except IntegrityError:
+            created = set()
+
+            for k in missing:
+                lookup = dict(fields, **{key: k})
+                instance, new = model.objects.get_or_create(
+                    defaults=defaults[k], **lookup
+                )
+
+                instances[k] = instance
+
+                if new:
+                    created.add(k)
+
+            return instances, created
+
+
+        # Only some databases give back the new primary keys, fetch them
+        query = {key + '__in': missing}
+        query.update(fields)
+
+        for instance in model.objects.filter(**query):
+            instances.setdefault(getattr(instance, key), instance)
+
+        return instances, set(missing)
+
+
+    @staticmethod
+    def bulk_link(through, field, links, stored):
+        """
+        This method inserts many-to-many relations between articles and
+        another model, given as (article id, other id) pairs, skipping those
+        the already `stored` articles have.
+        """
+
+        if stored:
+            existing = through.objects.filter(article_id__in=stored)
+            links = links - set(existing.values_list('article_id', field))
+
+        through.objects.bulk_create([
+            through(**{'article_id': article_id, field: other_id})
+            for article_id, other_id in sorted(links)
+        ])
 
 
     def get_articles(self):
+        """
+        This function downloads a given outlet's articles and stores them (see
+        `iter_articles`) without keeping them. It returns the run's report.
+        """
+
+        for _ in self.iter_articles():
+            pass
+
+        return self.report
+
+
+    def iter_articles(self):
         """
         This function downloads a given outlet's articles and call its
-        extraction method.
+        extraction method. The articles are stored in chunks as they are
+        extracted, and yielded once they are. The run's report is logged once
+        it is over, whether it succeeded or not.
         """
 
         # Verify if the class calling this method provides an articles' feed
@@ -153,22 +364,310 @@ class WebScraper(object):
             raise TypeError(EXCEPTIONS['feed'])
 
 
-        # Download and parse the articles' feed
-        parsed = self.parse(self.feed_url, self.feed_type)
+        # Authors, categories and pages are only trusted for the length of a
+        # run
+        self.identity.clear()
+        self.pages.clear()
+        self.new_authors.clear()
+        self.author_pages.clear()
+        self.maybe_stored.clear()
+        self.failed_pages.clear()
+        self.report = report.RunReport()
+
+        # Resume the outlet's last run if it was interrupted
+        self.checkpoint = checkpoint.Checkpoint.load(self.outlet)
+
+        if self.checkpoint:
+            LOGGER.info(
+                '%s: resuming from %d pages and %d authors.', self.outlet,
+                len(self.checkpoint.records), len(self.checkpoint.authors)
+            )
+
+        # Every download of this run must be over by its deadline
+        self.fetch_run = fetcher.start_run(settings.SCRAPER_RUN_DEADLINE)
+
+        # The report is logged however the run ends: an unchanged feed, an
+        # error or a consumer who stopped early
+        try:
+            yield from self.run_stages()
+        finally:
+            self.report.downloaded = self.fetch_run.downloaded
+            self.report.peak = self.fetch_run.peak
+            self.report.log(self.outlet)
+
+
+    def run_stages(self):
+        """
+        This method runs the stages of `iter_articles` once its run is set:
+        it reads the feed, extracts its articles and stores them a chunk at a
+        time, yielding them, and keeps the feed's state if nothing failed.
+        """
+
+        # Be polite with the outlet's website using its own rate limits
+        if self.outlet:
+            fetcher.limit_host(
+                self.outlet.website, self.outlet.rate_limit, self.outlet.burst
+            )
+
+        # Know the articles other processes stored since the last run
+        bloom.refresh_url_index()
+
+        connections = fetcher.connection_totals()
+        cached = cache.cache_stats()
+
+        feed, _ = Feed.objects.get_or_create(
+            url=self.feed_url,
+            defaults={'outlet': self.outlet}
+        )
+
+        if feed.last_date:
+            self.watermark = (feed.last_date, feed.last_url)
+
+
+        # Download and parse the articles' feed. HTTP feeds are asked only for
+        # what changed since the last run; if nothing did, the extraction is
+        # skipped altogether. Twitter timelines are asked only for the statuses
+        # newer than the feed's cursor.
+        with self.report.stage('feed'):
+            if self.feed_type in HTTP_TYPES:
+                chunks = self.fetch_feed(feed)
+
+                if chunks is None:
+                    LOGGER.info('%s: the feed did not change.', self.outlet)
+                    return
+
+                parsed = self.parse_chunks(chunks, self.feed_type)
+
+            elif self.feed_type == 'twitter':
+                parsed = self.fetch_timeline(feed)
+
+            else:
+                parsed = self.parse(self.feed_url, self.feed_type)
+
+
         if parsed is None:
             raise TypeError(EXCEPTIONS['not_parsed'])
 
 
         # The parsed feed will be inputed to the article extractor who will
-        # yield every article it can find and process.
-        results = []
+        # yield every article it can find and process. They are stored a
+        # chunk at a time, so only that many are ever kept.
+        found = self.report.timed('extract', self.extract_articles(parsed))
 
-        for article_info in self.extract_articles(parsed):
-            article = self.create_article(article_info)
-            results += [article]
-            print(article)
+        for chunk in report.chunked(found, settings.SCRAPER_INGEST_CHUNK):
+            with self.report.stage('store'):
+                articles = self.create_articles(chunk)
 
-        return results
+            yield from articles
+
+
+        # Only now the feed's validators, watermark and cursor can be kept,
+        # otherwise a failed run would make the next ones skip the articles it
+        # missed. The same goes for a run whose article pages could not all be
+        # downloaded (for errors, open circuits or its deadline): the feed is
+        # read again next time, and its checkpoint spares the pages it got.
+        self.report.failed = len(self.failed_pages)
+
+        if self.failed_pages:
+            LOGGER.warning(
+                '%s: %d pages could not be downloaded, the feed is kept as it '
+                'was.', self.outlet, len(self.failed_pages)
+            )
+        else:
+            if self.newest and (not feed.last_date or \
+                    self.newest[0] > feed.last_date):
+                feed.last_date, feed.last_url = self.newest
+
+            feed.save()
+            self.checkpoint.clear()
+
+        bloom.save_url_index()
+        self.pages.clear()
+
+
+        # Report how many handshakes were saved by reusing connections and
+        # how many downloads were saved by the response cache.
+        totals = fetcher.connection_totals() - connections
+        cached = cache.cache_stats() - cached
+
+        LOGGER.info(
+            '%s: %d requests over %d new connections (%d reused).',
+            self.outlet, totals['requests'], totals['connections'],
+            totals['reused']
+        )
+
+        LOGGER.info(
+            '%s: %d cache hits and %d misses.',
+            self.outlet, cached['hits'], cached['misses']
+        )
+
+        LOGGER.info(
+            '%s: %d pages parsed, %d reused.',
+            self.outlet, self.pages.misses, self.pages.hits
+        )
+
+
+    def fetch_feed(self, feed):
+        """
+        This method downloads the articles' feed sending the validators kept
+        from its last download. It returns None if the server answers that
+        the feed was not modified or if its body is exactly the same as before;
+        otherwise the feed's validators are updated (but not saved) and the
+        response is returned.
+        """
+
+        headers = {}
+
+        if feed.etag:
+            headers['If-None-Match'] = feed.etag
+
+        if feed.last_modified:
+            headers['If-Modified-Since'] = feed.last_modified
+
+
+        response = fetcher.download(
+            self.feed_url, headers=headers, stream=True
+        )
+        max_size = self.max_body_size(self.feed_type)
+
+        if response.status_code == 304:
+            fetcher.release(response)
+            return None
+
+
+        feed.etag = response.headers.get('ETag', '')
+        feed.last_modified = response.headers.get('Last-Modified', '')
+
+
+        # Streamed feeds are parsed as they arrive, so their body cannot be
+        # compared before their extraction starts.
+        if self.feed_type in STREAM_TYPES:
+            feed.body_hash = ''
+            return fetcher.iter_body(response, max_size)
+
+
+        # Not every server supports conditional requests, so the body's hash
+        # is the fallback validator.
+        content = fetcher.read_body(response, max_size)
+        body_hash = hashlib.sha1(content).hexdigest()
+
+        if body_hash == feed.body_hash:
+            return None
+
+        feed.body_hash = body_hash
+
+        return [content]
+
+
+    def fetch_timeline(self, feed):
+        """
+        This method downloads the statuses of the feed's twitter timeline
+        posted after the newest one seen on the last runs, whose id is kept as
+        the feed's cursor. The timeline gives at most `TIMELINE_SIZE` statuses
+        at once, newest first, so older pages are asked for (by `max_id`)
+        until one is empty or the cursor is reached. Without a cursor (on the
+        feed's first run) only the newest page is asked for, instead of the
+        whole timeline. The cursor is updated (but not saved) to the newest
+        status downloaded now.
+        """
+
+        api = fetcher.get_twitter_api()
+        query = {'screen_name': self.feed_url, 'count': TIMELINE_SIZE}
+        since_id = int(feed.cursor) if feed.cursor else None
+
+        if since_id:
+            query['since_id'] = since_id
+
+        statuses = []
+
+        while True:
+            page = [
+                status for status in api.GetUserTimeline(**query)
+                if (not since_id or status.id > since_id) and \
+                ('max_id' not in query or status.id <= query['max_id'])
+            ]
+
+            if not page:
+                break
+
+            statuses += page
+
+            if not since_id:
+                break
+
+            query['max_id'] = min(status.id for status in page) - 1
+
+        if statuses:
+            feed.cursor = str(max(status.id for status in statuses))
+
+        return statuses
+
+
+    @staticmethod
+    def article_exists(url):
+        """
+        This method checks if an article's url is already stored. The url
+        index answers first and the database is only asked to confirm when the
+        index says the url may be there.
+        """
+
+        if not url or url not in bloom.get_url_index():
+            return False
+
+        return Article.objects.filter(url=url).exists()
+
+
+    def already_stored(self, url):
+        """
+        This method tells if a feed's article is already stored (see
+        `article_exists`), counting it as a duplicate on the run's report.
+        """
+
+        if self.article_exists(url):
+            self.report.duplicates += 1
+            return True
+
+        return False
+
+
+    def reached_watermark(self, date, url):
+        """
+        This method tells if a feed's item is at or below the watermark, i.e.
+        it is not newer than the newest item seen on the last run. As feeds are
+        ordered newest first, extractors can stop at this item. Items within
+        the outlet's `watermark_overlap` seconds below the watermark are still
+        let through, so late edits are caught.
+
+        It also keeps the newest item seen, to move the watermark forward when
+        the run is over, and counts every item on the run's report.
+        """
+
+        self.report.seen += 1
+
+        if not isinstance(date, datetime.datetime):
+            return False
+
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date, timezone.utc)
+
+
+        if not self.newest or date > self.newest[0]:
+            self.newest = (date, url)
+
+        if not self.watermark:
+            return False
+
+
+        last_date, last_url = self.watermark
+
+        overlap = 0
+        if self.outlet:
+            overlap = self.outlet.watermark_overlap
+
+        if not overlap and url == last_url:
+            return True
+
+        return date <= last_date - datetime.timedelta(seconds=overlap)
 
 
     def get_author(self, author_name, author_idx=0):
@@ -187,10 +686,16 @@ class WebScraper(object):
             raise TypeError(EXCEPTIONS['author'])
 
 
-        search = Author.objects.filter(
-            name=author_name,
-            outlet_id=self.outlet.id
-        ).count()
+        stored = self.identity.get(Author, author_name, self.outlet.id)
+
+        if stored is None and author_name not in self.new_authors:
+            stored = Author.objects.filter(
+                name=author_name,
+                outlet_id=self.outlet.id
+            ).first()
+
+            if stored is not None:
+                self.identity.add(Author, author_name, stored, self.outlet.id)
 
 
         author = {
@@ -198,10 +703,12 @@ class WebScraper(object):
         }
 
 
-        if search == 0:
+        if stored is None:
+            self.report.authors += 1
+
             # Download and parse html author's page
-            author_url = self.get_authors_page(author_name)
-            parsed = self.parse(author_url, self.author_page_type)
+            author_url = self.author_page(author_name)
+            parsed = self.get_page(author_url, self.author_page_type)
 
             # Extract wanted information from his/her page
             author.update(self.extract_author(parsed, author_idx))
@@ -210,6 +717,252 @@ class WebScraper(object):
         return author
 
 
+    def author_page(self, author_name):
+        """
+        Gives an author's profile url: the one found on his/her articles, if
+        any, or the one given by `get_authors_page`.
+        """
+        return self.author_pages.get(author_name) or \
+            self.get_authors_page(author_name)
+
+
+    def resolve_authors(self, found):
+        """
+        This method is the second pass of an extraction. Given the articles
+        found on the first one along with their authors' names, it resolves
+        every author once, however many articles he/she wrote: the stored ones
+        are found with a single query, the profile pages of the others are
+        downloaded concurrently and each one is extracted once. The authors
+        are then joined back onto their articles, which are yielded.
+
+        The articles are taken `SCRAPER_INGEST_CHUNK` at a time, so when they
+        are found lazily only that many are kept. Resolved authors are kept by
+        the run's checkpoint, so a resumed run does not resolve them again.
+        """
+        resolved = self.checkpoint.authors
+
+        for chunk in report.chunked(found, settings.SCRAPER_INGEST_CHUNK):
+            self.prefetch_authors(
+                name for _, names in chunk for name in names
+                if name not in resolved
+            )
+
+            for article, author_names in chunk:
+                article['authors'] = []
+
+                for i, name in enumerate(author_names):
+                    if name not in resolved:
+                        # Extracting an author may look for him/her, as the
+                        # i-th author, on the page of the article he/she was
+                        # found.
+                        self.article_url = article['url']
+                        self.checkpoint.add_author(
+                            name, self.get_author(name, i)
+                        )
+
+                    article['authors'] += [dict(resolved[name])]
+
+                yield article
+
+            self.checkpoint.save()
+
+
+    def prefetch(self, urls, content_type='html'):
+        """
+        Downloads and parses a batch of urls concurrently, unless their pages
+        were already parsed on this run. The parsed pages are kept in the
+        run's memo, where `get_page` finds them.
+        """
+        urls = [url for url in urls if (url, content_type) not in self.pages]
+
+        parsed_pages = fetcher.fetch_all(
+            urls, lambda url: self.parse(url, content_type)
+        )
+
+        for url, parsed in parsed_pages.items():
+            if parsed is not None:
+                self.pages.add(url, content_type, parsed)
+
+
+    def extract_pages(self, urls, content_type, method, *args, fetch=None):
+        """
+        Downloads a batch of pages concurrently and extracts a record from
+        each one with the given method (by its name), which must only read the
+        page: it may run on another process, see `workers`. The records are
+        returned by url; pages that could not be downloaded or extracted give
+        None, and the ones not downloaded are kept in `failed_pages`. The
+        bodies are downloaded by `fetch_content`, unless another `fetch`
+        function is given (which may give None to skip a page).
+
+        The records are kept by the run's checkpoint, which is saved every
+        `SCRAPER_CHECKPOINT_EVERY` pages, so a resumed run only downloads the
+        pages that were left.
+        """
+        urls = list(OrderedDict.fromkeys(url for url in urls if url))
+        records = self.checkpoint.records
+
+        pending = [url for url in urls if url not in records]
+        step = settings.SCRAPER_CHECKPOINT_EVERY
+
+        if fetch is None:
+            fetch = lambda url: self.fetch_content(url, content_type)
+
+        for start in range(0, len(pending), step):
+            bodies = fetcher.fetch_all(pending[start:start + step], fetch)
+
+            # The pages that could not be downloaded (not the skipped ones)
+            # keep the feed's watermark from moving past their articles
+            self.failed_pages.update(
+                url for url, body in bodies.items()
+                if body is None and url not in self.maybe_stored
+            )
+
+            extracted = workers.extract_pages(
+                (type(self), self.page_config()), method, bodies,
+                content_type, args
+            )
+
+            for url, record in extracted.items():
+                if record is not None:
+                    self.checkpoint.add_record(url, record)
+
+            self.checkpoint.save()
+
+        # Extractors may change their records, but not the checkpoint's
+        return OrderedDict(
+            (url, dict(records[url]) if url in records else None)
+            for url in urls
+        )
+
+
+    def fetch_new_page(self, url):
+        """
+        Downloads an article's page unless the article is already stored. The
+        page is streamed and its head parsed first: if its canonical url may
+        be stored, as the url index tells, the download stops there and None
+        is given, keeping the canonical url in `maybe_stored`. Otherwise, the
+        rest of the page is downloaded and its whole body is given.
+        """
+        chunks = fetcher.iter_body(
+            fetcher.download(url, stream=True),
+            self.max_body_size(self.article_page_type), hold=True
+        )
+        head, read = self.read_head(chunks)
+
+        canonical = self.canonical_url(head)
+
+        if canonical and canonical in bloom.get_url_index():
+            chunks.close()
+            self.maybe_stored[url] = canonical
+            return None
+
+        return b''.join(read) + b''.join(chunks)
+
+
+    def canonical_url(self, parsed):
+        """Finds a page's canonical url (without its query) on its head."""
+        if parsed is None:
+            return None
+
+        url = self.get_text_or_attr(parsed, 'meta[@property="og:url"]', \
+            'content') or self.get_text_or_attr(parsed, \
+            'link[@rel="canonical"]', 'href')
+
+        if isinstance(url, str):
+            return self.remove_query(url)
+
+        return None
+
+
+    def page_config(self):
+        """
+        Gives what a page's extraction may need from the scraper besides its
+        class: the namespaces and the plain attributes, such as the urls and
+        content types.
+        """
+        config = {'nsmap': self.nsmap}
+
+        for attr, value in vars(self).items():
+            if isinstance(value, str):
+                config[attr] = value
+
+        return config
+
+
+    def prefetch_authors(self, author_names):
+        """
+        Downloads at once the profile pages of every given author who is not
+        stored yet, so `get_author` finds them ready.
+        """
+        if not self.outlet or not self.author_page_type:
+            return
+
+        author_names = set(author_names)
+        author_names -= set(self.identity.find(
+            Author, author_names, self.outlet.id
+        ))
+
+        if not author_names:
+            return
+
+        for stored in Author.objects.filter(name__in=author_names - \
+                self.new_authors, outlet_id=self.outlet.id):
+            self.identity.add(Author, stored.name, stored, self.outlet.id)
+            author_names.discard(stored.name)
+
+        self.new_authors |= author_names
+
+        urls = [self.author_page(n) for n in author_names]
+        self.prefetch(urls, self.author_page_type)
+
+
+    def get_page(self, url, content_type='html'):
+        """
+        Returns a parsed page, using the one parsed before on this run (or
+        prefetched) if it is still kept by the run's memo.
+        """
+        parsed = self.pages.get(url, content_type)
+
+        if parsed is None:
+            parsed = self.parse(url, content_type)
+            self.pages.add(url, content_type, parsed)
+
+        return parsed
+
+
+    def xpath(self, expression):
+        """
+        This method gives the compiled XPath of an expression using this
+        scraper's namespaces. Compiling an expression costs far more than
+        evaluating it, so every scraper class keeps a registry of compiled
+        expressions, keyed by the expression and the namespaces changed by
+        `nsmap`, built up as they are first used.
+        """
+
+        if self.nsmap and not isinstance(self.nsmap, dict):
+            raise ValueError(EXCEPTIONS['nsmap'])
+
+        # This namespace mapping may change with different outlets, that's why
+        # the registry's key has it.
+        key = (expression, tuple(sorted(self.nsmap.items())) \
+            if self.nsmap else ())
+
+        registry = type(self).__dict__.get('xpaths')
+
+        if registry is None:
+            registry = {}
+            type(self).xpaths = registry
+
+        compiled = registry.get(key)
+
+        if compiled is None:
+            namespaces = dict(NAMESPACES, **dict(key[1]))
+            compiled = etree.XPath(expression, namespaces=namespaces)
+            registry[key] = compiled
+
+        return compiled
+
+
     def get_text_or_attr(self, item, key, attr=None):
         """
         This function returns a string or a list of strings containing
@@ -222,24 +975,8 @@ class WebScraper(object):
                   instead of the text.
         """
 
-        # This namespace mapping may change with different outlets, that why
-        # this method cannot be static.
-        nsmap = {
-            'dc': 'http://purl.org/dc/elements/1.1/',
-            'media': 'http://search.yahoo.com/mrss/',
-            'feedburner': 'http://rssnamespace.org/feedburner/ext/1.0',
-        }
-
-        if hasattr(self, 'nsmap'):
-            if self.nsmap and not isinstance(self.nsmap, dict):
-                raise ValueError(EXCEPTIONS['nsmap'])
-
-            if self.nsmap:
-                nsmap.update(self.nsmap)
-
-
         # Searches for a given key on parsed document's root
-        search = item.xpath('.//' + key, namespaces=nsmap)
+        search = self.xpath('.//' + key)(item)
 
 
         found = len(search)
@@ -273,35 +1010,209 @@ class WebScraper(object):
 
 
     @staticmethod
-    def parse(url, content_type='xml'):
-        """This method downloads and parses a url with a given type."""
+    def parse_content(content, content_type='xml'):
+        """This method parses a downloaded body with a given type."""
 
         if content_type == 'xml':
-            response = requests.get(url)
-            return etree.fromstring(response.content)
+            return etree.fromstring(content)
 
 
         elif content_type == 'html':
-            response = requests.get(url)
-            return html.fromstring(response.content)
+            return html.fromstring(content)
 
 
         elif content_type == 'json':
-            response = requests.get(url)
-            return json.loads(response.text)
+            return json.loads(content)
 
 
-        elif content_type == 'twitter':
-            api = twitter.Api(
-                consumer_key=os.environ.get('TWITTER_CONSUMER_KEY'),
-                consumer_secret=os.environ.get('TWITTER_CONSUMER_SECRET'),
-                access_token_key=os.environ.get('TWITTER_ACCESS_TOKEN_KEY'),
-                access_token_secret=os.environ.get('TWITTER_ACCESS_TOKEN_SECRET'),
+        raise NotImplementedError(EXCEPTIONS['download'])
+
+
+    @staticmethod
+    def max_body_size(content_type):
+        """Gives the most bytes a body of a content type may have (if any)."""
+        return settings.SCRAPER_MAX_BODY_SIZE.get(content_type)
+
+
+    @staticmethod
+    def parse_chunks(chunks, content_type='xml'):
+        """
+        This method parses a body from its chunks of bytes, feeding them to an
+        incremental parser as they arrive: the whole body is never held next
+        to its tree. Streamed types give their items (or head) as they are
+        parsed; json is only parsed once all of it arrived.
+        """
+
+        if content_type == 'html-head':
+            head, _ = WebScraper.read_head(chunks)
+
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+            return head
+
+
+        elif content_type in STREAM_TYPES:
+            return WebScraper.iter_items(chunks)
+
+
+        elif content_type == 'json':
+            return WebScraper.parse_content(b''.join(chunks), content_type)
+
+
+        elif content_type == 'xml':
+            parser = etree.XMLParser()
+
+
+        elif content_type == 'html':
+            parser = html.HTMLParser()
+
+
+        else:
+            raise NotImplementedError(EXCEPTIONS['download'])
+
+
+        for chunk in chunks:
+            parser.feed(chunk)
+
+        return parser.close()
+
+
+    @staticmethod
+    def parse_response(response, content_type='xml'):
+        """
+        This method parses a streamed response, whose body may not be larger
+        than its content type's `SCRAPER_MAX_BODY_SIZE`.
+        """
+        max_size = WebScraper.max_body_size(content_type)
+
+        if content_type == 'json':
+            content = fetcher.read_body(response, max_size)
+            return WebScraper.parse_content(content, content_type)
+
+        chunks = fetcher.iter_body(response, max_size)
+
+        return WebScraper.parse_chunks(chunks, content_type)
+
+
+    @staticmethod
+    def read_head(chunks, max_size=None):
+        """
+        This method parses a html document from its chunks of bytes only
+        until its head is over, or until `max_size` bytes were read
+        (`SCRAPER_HEAD_MAX_SIZE` by default), whichever comes first. It
+        returns the document parsed so far, whose `head` has its metadata (or
+        None if nothing could be parsed), and the chunks read; the rest of them
+        are left to the caller.
+        """
+        if max_size is None:
+            max_size = settings.SCRAPER_HEAD_MAX_SIZE
+
+        parser = etree.HTMLPullParser(events=('end',), tag='head')
+        read = []
+        size = 0
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            read += [chunk]
+            size += len(chunk)
+
+            if list(parser.read_events()) or size >= max_size:
+                break
+
+        try:
+            return parser.close(), read
+        except etree.XMLSyntaxError:
+            return None, read
+
+
+    @staticmethod
+    def iter_items(chunks, tag='item'):
+        """
+        This method parses a XML document from its chunks of bytes, yielding
+        every `tag` element as soon as it is complete. After it is processed,
+        the element is cleared and removed from the tree, so the memory used
+        does not depend on how many items the document has.
+        """
+        parser = etree.XMLPullParser(events=('end',), tag=tag)
+
+        def read_events():
+            """Yields the complete elements and then throws them away."""
+            for _, element in parser.read_events():
+                yield element
+
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from read_events()
+
+        parser.close()
+        yield from read_events()
+
+
+    @staticmethod
+    def feed_items(parsed, tag='item'):
+        """
+        This method gives the items of a parsed feed, which can be either a
+        whole tree or a stream of items given by `iter_items`.
+        """
+        if isinstance(parsed, etree._Element): #pylint: disable=protected-access
+            return parsed.xpath('//' + tag)
+
+        return parsed
+
+
+    @staticmethod
+    def fetch_content(url, content_type='xml'):
+        """
+        This method downloads the body of a url. If the response cache is on,
+        it is looked up before downloading anything.
+        """
+        responses = cache.get_cache()
+        content = None
+
+        if responses:
+            content = responses.get(url, content_type)
+
+        if content is None:
+            content = fetcher.read_body(
+                fetcher.download(url, stream=True),
+                WebScraper.max_body_size(content_type)
             )
 
+            if responses:
+                responses.set(url, content_type, content)
+
+        return content
+
+
+    @staticmethod
+    def parse(url, content_type='xml'):
+        """
+        This method downloads and parses a url with a given type. If the
+        response cache is on, it is looked up before downloading anything;
+        otherwise the body is parsed as it is downloaded.
+        """
+
+        if content_type in STREAM_TYPES or \
+                content_type in HTTP_TYPES and not cache.get_cache():
+            response = fetcher.download(url, stream=True)
+            return WebScraper.parse_response(response, content_type)
+
+
+        elif content_type in HTTP_TYPES:
+            content = WebScraper.fetch_content(url, content_type)
+            return WebScraper.parse_content(content, content_type)
+
+
+        elif content_type == 'twitter':
+            api = fetcher.get_twitter_api()
             return api.GetUserTimeline(screen_name=url)
 
-        raise NotImplementedError(EXCEPTIONS['parse'])
+        raise NotImplementedError(EXCEPTIONS['download'])
 
 
     @staticmethod
@@ -334,56 +1245,10 @@ class WebScraper(object):
     def check_data(data):
         """
         This function checks the data integrity of `create_article` function's
-        input. We check for required and accepted parameters.
+        input. We check for required and accepted parameters, by building the
+        article's record (see `records.ArticleRecord`).
         """
-        required = {
-            'article': ['title', 'url', 'date', 'content', 'authors'],
-            'authors': ['name']
-        }
-
-        accepted = {
-            'article': required['article'] + ['categories', 'thumb'],
-            'authors': required['authors'] + ['twitter', 'avatar', 'facebook',\
-                'linkedin', 'about', 'profile', 'website']
-        }
-
-
-        # Check first level dictionary keys
-        req = required['article'][::]
-
-        for key in data:
-            if key not in accepted['article']:
-                raise ValueError(EXCEPTIONS['unacceptable'])
-
-            if key in required['article']:
-                req.remove(key)
-
-        count_req = len(req)
-        if count_req > 0:
-            raise ValueError(EXCEPTIONS['required'])
-
-
-        # Check second level dictionary keys (authors)
-        for author in data['authors']:
-
-            req = required['authors'][::]
-
-            for key in author:
-                if key not in accepted['authors']:
-                    raise ValueError(EXCEPTIONS['unacceptable'])
-
-                if key in required['authors']:
-                    req.remove(key)
-
-            count_req = len(req)
-            if count_req > 0:
-                raise ValueError(EXCEPTIONS['required'])
-
-
-        # Check if there are any authors on data
-        count_authors = len(data['authors'])
-        if not 'authors' in data or count_authors == 0:
-            raise ValueError(EXCEPTIONS['required'])
+        ArticleRecord.from_dict(data)
 
 
     @staticmethod
@@ -391,33 +1256,68 @@ class WebScraper(object):
         """
         Tries to get a clean text (i.e. without html tags and double spaces)
         from a given xpath items.
+
+        Html elements are not serialized and stripped of their tags anymore:
+        their text nodes are read straight from the tree and escaped the way
+        `html.tostring` would write them, so the result is just the same.
         """
 
         if not isinstance(items, list):
             items = [items]
 
-        content = ''
+        texts = []
 
         for item in items:
 
-            # Convert lxml item in string with html tags
             if isinstance(item, html.HtmlElement):
-                item = WebScraper.html_to_string(item)
+                texts += [WebScraper.element_text(item)]
 
-            if isinstance(item, etree._Element):
-                item = item.text
+            elif isinstance(item, etree._Element):
+                if item.text is not None:
+                    texts += [strip_tags(item.text)]
 
-            if item is not None:
+            elif item is not None:
                 # Remove html tags
-                content += strip_tags(item) + ' '
+                texts += [strip_tags(item)]
 
-        # Remove break lines
-        content = re.sub('[\n\t]', '', content)
+        # Remove break lines and double spaces
+        content = ' '.join(texts).translate(BREAK_LINES)
+        content = ' '.join(word for word in content.split(' ') if word)
 
-        # Remove double spaces
-        content = re.sub('[ ]{2,}', ' ', content).strip()
+        return content.strip()
 
-        return content
+
+    @staticmethod
+    def element_text(element):
+        """
+        This method gives the text inside a html element, followed by its
+        tail, escaped as `html.tostring` would write it: `&`, `<`, `>` and
+        non ascii characters become entities, but scripts and styles are
+        written as they are. Those are the only ones that may still look like
+        tags, so only then `strip_tags` has anything to do.
+        """
+
+        if next(element.iter(*RAW_TEXT_TAGS), None) is None:
+            text = escape_text(''.join(element.itertext()))
+            text += escape_text(element.tail or '')
+
+        else:
+            texts = []
+            events = ('start', 'end', 'comment', 'pi')
+
+            for event, node in etree.iterwalk(element, events=events):
+                if event == 'start' and node.text:
+                    if node.tag in RAW_TEXT_TAGS:
+                        texts += [node.text]
+                    else:
+                        texts += [escape_text(node.text)]
+
+                elif event != 'start' and node.tail:
+                    texts += [escape_text(node.tail)]
+
+            text = strip_tags(''.join(texts))
+
+        return text.encode('ascii', 'xmlcharrefreplace').decode('ascii')
 
 
     @staticmethod
@@ -1,7 +1,7 @@
 from django.template.defaultfilters import slugify
 
+from articles.scrapers.records import ArticleRecord
 from articles.scrapers.scraper import WebScraper
-from articles.models import Article
 
 class TechCrunch(WebScraper):
     """
@@ -9,7 +9,7 @@ class TechCrunch(WebScraper):
     TechCrunch outlet. Fetching an article from TechCrunch follows the above
     steps:
 
-    1) Download the TechCrunch XML feed at `feed_url`
+    1) Stream the TechCrunch XML feed at `feed_url`, item by item.
 
     2) Go through every item on this feed and for each one extract informations
        such as title, url, pub_date, categories, content, thumb and authors.
@@ -36,7 +36,7 @@ class TechCrunch(WebScraper):
         super(TechCrunch, self).__init__('TechCrunch')
 
         self.feed_url = 'http://feeds.feedburner.com/TechCrunch/'
-        self.feed_type = 'xml'
+        self.feed_type = 'xml-stream'
         self.author_page_type = 'html'
         self.article_page_type = 'html'
         self.article_url = None
@@ -55,8 +55,20 @@ class TechCrunch(WebScraper):
         form given in utils' function `create_article`.
         """
 
-        # Iterates over every item (article) in xml
-        for item in parsed_xml.xpath("//item"):
+        # The new articles are found lazily, so their authors' pages are
+        # downloaded a chunk at a time. Every author is resolved once and the
+        # articles are handed over as records.
+        for article in self.resolve_authors(self.find_articles(parsed_xml)):
+            yield ArticleRecord.from_dict(article)
+
+
+    def find_articles(self, parsed_xml):
+        """
+        This method iterates over every item (article) in TechCrunch's feed,
+        yielding the new ones along with their authors' names.
+        """
+
+        for item in self.feed_items(parsed_xml):
 
             article = {}
 
@@ -77,13 +89,6 @@ class TechCrunch(WebScraper):
             url = self.get_text_or_attr(item, 'feedburner:origLink')
             article['url'] = self.remove_query(url)
 
-            self.article_url = article['url']
-
-
-            # If article's URL is already stored, don't parse it again
-            if Article.objects.filter(url=article['url']).count() > 0:
-                continue
-
 
             # It is interesting to have the publication date as a `dateutil`
             # object, so we can do whatever manipulation we want.
@@ -91,14 +96,15 @@ class TechCrunch(WebScraper):
             article['date'] = self.parse_datetime_passing_errors(pub_date)
 
 
-            # Get the author attribute and tries to fetch informations about
-            # him/her. An article can have more than one author; on techcrunch's
-            # feed, they are separated by a comma.
-            author_names = self.get_text_or_attr(item, 'dc:creator').split(',')
-            article['authors'] = []
+            # The feed is ordered newest first, so the items from here on were
+            # already seen on the last runs.
+            if self.reached_watermark(article['date'], article['url']):
+                break
+
 
-            for i, name in enumerate(author_names):
-                article['authors'] += [self.get_author(name, i)]
+            # If article's URL is already stored, don't parse it again
+            if self.already_stored(article['url']):
+                continue
 
 
             # Tries to find the article's thumbnail url
@@ -108,14 +114,18 @@ class TechCrunch(WebScraper):
 
 
             # Gets the article's description and strip all html tags from it
-            content = self.clear_text(item.xpath('description'))
+            content = self.clear_text(self.xpath('description')(item))
             content = content.strip(' Read More').strip('&nbsp;').strip()
 
 
             article['content'] = content
 
 
-            yield article
+            # An article can have more than one author; on techcrunch's feed,
+            # they are separated by a comma.
+            author_names = self.get_text_or_attr(item, 'dc:creator').split(',')
+
+            yield article, author_names
 
 
     def extract_author_from_page(self, parsed, author_idx=0):
@@ -128,14 +138,15 @@ class TechCrunch(WebScraper):
 
         author = {}
 
-        author_url = parsed.xpath('//a[@rel="author"]')
+        author_url = self.xpath('//a[@rel="author"]')(parsed)
         if author_url and len(author_url) > author_idx:
             author['profile'] = 'https://techcrunch.com'
             author['profile'] += author_url[author_idx].get('href')
 
 
         # Find the twitter handle associated with the i-th author
-        twitter_handle = parsed.xpath('//span[@class="twitter-handle"]/a')
+        xpath = '//span[@class="twitter-handle"]/a'
+        twitter_handle = self.xpath(xpath)(parsed)
         if twitter_handle and len(twitter_handle) > author_idx:
             author['twitter'] = twitter_handle[author_idx].get('href')
 
@@ -146,7 +157,7 @@ class TechCrunch(WebScraper):
         # this loop, we added a flag on the author dict.
         author['flag'] = 'exit'
 
-        parsed = self.parse(author['profile'], self.author_page_type)
+        parsed = self.get_page(author['profile'], self.author_page_type)
 
         return self.extract_author(parsed, author_idx, author)
 
@@ -169,7 +180,7 @@ class TechCrunch(WebScraper):
         links = []
         xpath = '//div[@class="profile cf"]/div/ul/li/a'
 
-        for url in parsed_html.xpath(xpath):
+        for url in self.xpath(xpath)(parsed_html):
             links += [url.get('href')]
 
         for social in self.classify_links(links):
@@ -178,13 +189,13 @@ class TechCrunch(WebScraper):
 
         # Get description text provided by the author
         xpath = '//div[contains(@class, "profile-text")]/p'
-        items = parsed_html.xpath(xpath)
+        items = self.xpath(xpath)(parsed_html)
         author['about'] = self.clear_text(items)
 
 
         # Get Crunchbase url profile
         xpath = '//div[contains(@class, "profile-text")]/a'
-        website = parsed_html.xpath(xpath)
+        website = self.xpath(xpath)(parsed_html)
 
         if website:
             author['website'] = website[0].get('href')
@@ -192,7 +203,7 @@ class TechCrunch(WebScraper):
 
         # Get his/her avatar url
         xpath = '//div[@class="profile cf"]/div/img'
-        avatar = parsed_html.xpath(xpath)
+        avatar = self.xpath(xpath)(parsed_html)
 
         if avatar:
             author['avatar'] = avatar[0].get('src')
@@ -210,7 +221,7 @@ class TechCrunch(WebScraper):
 
         if 'twitter' not in author and 'flag' not in author:
 
-            parsed = self.parse(self.article_url, self.article_page_type)
+            parsed = self.get_page(self.article_url, self.article_page_type)
             return self.extract_author_from_page(parsed, author_idx)
 
 
@@ -0,0 +1,96 @@
+"""
+This file brings the process pool where downloaded pages are parsed and have
+their records extracted. Parsing whole html pages, walking them with XPath and
+clearing their texts is CPU-bound, so with threads alone a worker uses a
+single core however many pages it downloads at once. With
+`SCRAPER_PARSE_WORKERS` processes, the pages' bodies are handed to the pool
+and only plain records (dictionaries of strings and dates) come back, since
+parsed trees cannot cross processes.
+
+The pool is off by default and the pages are extracted inline: celery's
+prefork workers cannot start processes of their own, so it is meant for
+threaded workers and large backfills.
+"""
+
+import logging
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+LOGGER = logging.getLogger(__name__)
+
+POOL = None
+POOL_LOCK = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the process-wide pool, created on first use, or None if it is
+    off (`SCRAPER_PARSE_WORKERS` is 0).
+    """
+    global POOL #pylint: disable=global-statement
+
+    if settings.SCRAPER_PARSE_WORKERS <= 0:
+        return None
+
+    with POOL_LOCK:
+        if POOL is None:
+            POOL = ProcessPoolExecutor(
+                max_workers=settings.SCRAPER_PARSE_WORKERS
+            )
+
+    return POOL
+
+
+def extract_page(scraper, method, content, content_type, args=()):
+    """
+    Parses a page's body and extracts its record with one of a scraper's
+    methods, which must only read the page. The scraper is given as its class
+    and configuration (see `WebScraper.page_config`) and the method is called
+    on a bare instance made from them: it is not initialized, so the database
+    is never touched from the pool.
+    """
+    scraper_class, config = scraper
+    scraper = scraper_class.__new__(scraper_class)
+    scraper.__dict__.update(config)
+
+    parsed = scraper_class.parse_content(content, content_type)
+
+    return getattr(scraper, method)(parsed, *args)
+
+
+def extract_pages(scraper, method, bodies, content_type, args=()):
+    """
+    Extracts the record of every given body (a dictionary by url) with
+    `extract_page`, on the pool if it is on, and returns the records by url.
+    Errors are logged and the url's record is set to None, just like missing
+    bodies, so one bad page does not spoil the whole batch.
+    """
+    records = OrderedDict((url, None) for url in bodies)
+    urls = [url for url in bodies if bodies[url] is not None]
+
+    pool = get_pool()
+
+    # Every page is submitted before waiting for any of them
+    futures = OrderedDict(
+        (url, pool.submit(
+            extract_page, scraper, method, bodies[url], content_type, args
+        ) if pool else None) for url in urls
+    )
+
+    for url, future in futures.items():
+        try:
+            if future is None:
+                records[url] = extract_page(
+                    scraper, method, bodies[url], content_type, args
+                )
+            else:
+                records[url] = future.result()
+
+        except Exception as error: #pylint: disable=broad-except
+            LOGGER.warning('Could not extract %s: %s', url, error)
+
+    return records
@@ -1,7 +1,9 @@
+import json
+
 from rest_framework import serializers
 from rest_framework.renderers import JSONRenderer
 
-from articles.models import Author, Outlet, Category, Article
+from articles.models import Author, Outlet, Category, Article, OutletCadence
 
 class MyJSONRenderer(JSONRenderer):
     """Overloads default JSONRederer to force pretty print."""
@@ -84,3 +86,25 @@ class ArticleRetrieveSerializer(serializers.ModelSerializer):
         model = Article
         fields = ('id', 'title', 'date', 'url', 'thumb', 'content', 'authors',\
             'outlet', 'categories')
+
+
+
+class OutletCadenceSerializer(serializers.ModelSerializer):
+    """
+    Serializer to map the OutletCadence instance into JSON format. Times are
+    given in seconds and `hours` has the number of articles posted on each
+    hour of the week (UTC), starting on Mondays at midnight.
+    """
+
+    outlet = OutletSerializer(many=False)
+    hours = serializers.SerializerMethodField()
+
+    class Meta:
+        """Meta class to map serializer's fields with the model fields."""
+        model = OutletCadence
+        fields = ('id', 'outlet', 'articles', 'mean', 'median', 'p25', 'p75',\
+            'p90', 'hours', 'last_date', 'updated_at')
+
+    def get_hours(self, obj): #pylint: disable=no-self-use
+        """Gives the hours of the week histogram as a list."""
+        return json.loads(obj.hours)
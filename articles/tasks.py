@@ -1,19 +1,21 @@
 """
 This file contains the entries for article downloading though celery beat.
-The periodicity of each outlet is defined by the average posting frequency,
-computed by the standalone function `mtime.py`.
+Outlets are polled as often as they post, see `articles.scrapers.schedule`,
+and each one is fetched by its own task, see `articles.scrapers.crawl`.
 """
 
 from __future__ import absolute_import, unicode_literals
 
-from articles.scrapers.techcrunch import TechCrunch
-from articles.scrapers.cheesecakelabs import CheesecakeLabs
-from articles.scrapers.mashable import Mashable
-from articles.scrapers.engadget import Engadget
+from articles.scrapers.bloom import get_url_index
+from articles.scrapers.crawl import SCRAPERS, start_crawl, run_outlet, \
+    crawl_report, log_report
+from articles.scrapers.schedule import claim_due_outlets
 
+from celery import group, shared_task
 from celery.task.schedules import crontab
 from celery.decorators import periodic_task
 from celery.utils.log import get_task_logger
+from celery.signals import worker_process_init
 
 from kombu.async import Hub, set_event_loop
 
@@ -23,29 +25,47 @@ LOGGER = get_task_logger(__name__)
 
 
 
+@worker_process_init.connect
+def load_url_index(**kwargs): #pylint: disable=unused-argument
+    """Loads the index of stored articles' urls as soon as a worker starts."""
+    get_url_index()
+
+
+
 @periodic_task(
-    run_every=(crontab(minute=0, hour='0,6,8,10,12,14,16,18,20,22')),
+    run_every=(crontab(minute='*/15')),
     name="fetch_articles",
     ignore_result=True
 )
 def fetch_articles():
-    """This function fetches articles from 4 different sources periodically."""
-    scraper = TechCrunch()
-    if scraper.outlet.active:
-        LOGGER.info("TechCrunch download just started.")
-        scraper.get_articles()
-
-    scraper = CheesecakeLabs()
-    if scraper.outlet.active:
-        LOGGER.info("CheesecaekLabs download just started.")
-        scraper.get_articles()
-
-    scraper = Mashable()
-    if scraper.outlet.active:
-        LOGGER.info("Mashable download just started.")
-        scraper.get_articles()
-
-    scraper = Engadget()
-    if scraper.outlet.active:
-        LOGGER.info("Engadget download just started.")
-        scraper.get_articles()
+    """
+    This function starts a crawl of the outlets due to be polled: one
+    `fetch_outlet` task for each one, so they are fetched concurrently by the
+    workers.
+    """
+    names = claim_due_outlets(SCRAPERS)
+
+    if not names:
+        return
+
+    crawl, names = start_crawl(names)
+
+    LOGGER.info("Crawl %s just started: %s.", crawl, ', '.join(names))
+
+    group(fetch_outlet.s(crawl, name) for name in names).apply_async()
+
+
+
+@shared_task(name="fetch_outlet", ignore_result=True)
+def fetch_outlet(crawl, name):
+    """
+    This function fetches an outlet's articles within a crawl. The last of
+    the crawl's tasks to finish logs its report; there is no result backend
+    to gather them, so the report is made of the runs stored by each task.
+    """
+    run_outlet(crawl, name)
+
+    report = crawl_report(crawl)
+
+    if report:
+        log_report(report)
@@ -8,9 +8,22 @@ from articles.tests.scrapers.techcrunch import *
 from articles.tests.scrapers.cheesecakelabs import *
 from articles.tests.scrapers.mashable import *
 from articles.tests.scrapers.engadget import *
+from articles.tests.scrapers.fetcher import *
+from articles.tests.scrapers.cache import *
+from articles.tests.scrapers.bloom import *
+from articles.tests.scrapers.identity import *
+from articles.tests.scrapers.crawl import *
+from articles.tests.scrapers.schedule import *
+from articles.tests.scrapers.cadence import *
+from articles.tests.scrapers.memo import *
+from articles.tests.scrapers.workers import *
+from articles.tests.scrapers.checkpoint import *
+from articles.tests.scrapers.report import *
+from articles.tests.scrapers.records import *
 
 from articles.tests.views.retrieve_all import *
 from articles.tests.views.author import *
 from articles.tests.views.category import *
 from articles.tests.views.outlet import *
-from articles.tests.views.article import *
\ No newline at end of file
+from articles.tests.views.article import *
+from articles.tests.views.cadence import *
\ No newline at end of file
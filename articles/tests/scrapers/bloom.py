@@ -0,0 +1,178 @@
+import os
+import shutil
+import tempfile
+
+import dateutil.parser
+
+from django.test import TestCase, override_settings
+
+from articles.models import Outlet, Article
+from articles.scrapers import bloom
+from articles.scrapers.bloom import BloomFilter
+from articles.scrapers.scraper import WebScraper
+
+class BloomFilterTestCase(TestCase):
+    """This class defines the test suite for the url index."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.urls = ['https://outlet.com/article-' + str(i) for i in range(2000)]
+        self.directory = tempfile.mkdtemp()
+
+        # Every test starts with a fresh index
+        bloom.INDEX = None
+
+
+    def tearDown(self):
+        """Removes the index's files and forgets the test index."""
+        shutil.rmtree(self.directory)
+        bloom.INDEX = None
+
+
+    def test_bloom_no_false_negatives(self):
+        """Tests if every added key is found."""
+        index = BloomFilter(len(self.urls), 0.01)
+
+        for url in self.urls:
+            index.add(url)
+
+        self.assertEqual(all(url in index for url in self.urls), True)
+        self.assertEqual(len(index), 2000)
+
+
+    def test_bloom_false_positive_rate(self):
+        """Tests if wrong answers are about as rare as they were sized for."""
+        index = BloomFilter(len(self.urls), 0.01)
+
+        for url in self.urls:
+            index.add(url)
+
+        others = ['https://other.com/' + str(i) for i in range(10000)]
+        wrong = sum(1 for url in others if url in index)
+
+        self.assertAlmostEqual(index.false_positive_rate(), 0.01, places=2)
+        self.assertLess(wrong / len(others), 0.03)
+
+
+    def test_bloom_save_load(self):
+        """Tests if a saved index is loaded back the same."""
+        path = os.path.join(self.directory, 'urls.bloom')
+        index = BloomFilter(100)
+
+        for url in self.urls[:100]:
+            index.add(url)
+
+        index.save(path)
+        loaded = BloomFilter.load(path)
+
+        self.assertEqual(loaded.array, index.array)
+        self.assertEqual(len(loaded), 100)
+        self.assertEqual(loaded.hashes, index.hashes)
+
+
+    def test_bloom_save_merges(self):
+        """Tests if saving the index keeps the urls other processes saved."""
+        path = os.path.join(self.directory, 'urls.bloom')
+
+        with override_settings(SCRAPER_URL_INDEX=path):
+            other = bloom.build_url_index()
+
+            for url in self.urls[:100]:
+                other.add(url)
+
+            other.save(path)
+
+            # This process' index was loaded before the other one was saved
+            bloom.INDEX = bloom.build_url_index()
+
+            for url in self.urls[100:200]:
+                bloom.INDEX.add(url)
+
+            bloom.save_url_index()
+            saved = BloomFilter.load(path)
+
+            self.assertEqual(all(url in saved for url in self.urls[:200]), True)
+            self.assertAlmostEqual(len(saved), 200, delta=5)
+
+            # An index of another size is not merged, but rebuilt
+            BloomFilter(100).save(path)
+            bloom.save_url_index()
+
+            self.assertEqual(bloom.INDEX.bits, saved.bits)
+            self.assertEqual(self.urls[0] in bloom.INDEX, False)
+
+
+    def test_bloom_rebuild_from_articles(self):
+        """Tests if the index is built from the articles' table and saved."""
+        outlet = Outlet.objects.create(name='Fictional Outlet')
+        date = dateutil.parser.parse('Fri, 8 Dec 2017 16:11:37 +0000')
+
+        for url in self.urls[:10]:
+            Article.objects.create(
+                title='Title', url=url, date=date, content='.', outlet=outlet
+            )
+
+        path = os.path.join(self.directory, 'urls.bloom')
+
+        with override_settings(SCRAPER_URL_INDEX=path):
+            index = bloom.rebuild_url_index()
+
+            self.assertEqual(len(index), 10)
+            self.assertEqual(os.path.exists(path), True)
+
+            # A new worker loads the saved index instead of querying
+            bloom.INDEX = None
+
+            with self.assertNumQueries(0):
+                self.assertEqual(self.urls[0] in bloom.get_url_index(), True)
+
+
+    def test_bloom_refresh(self):
+        """Tests if articles stored by other processes are added each run."""
+        outlet = Outlet.objects.create(name='Fictional Outlet')
+        date = dateutil.parser.parse('Fri, 8 Dec 2017 16:11:37 +0000')
+
+        first = Article.objects.create(
+            title='Title', url=self.urls[0], date=date, content='.',
+            outlet=outlet
+        )
+
+        index = bloom.get_url_index()
+        self.assertEqual(index.last_id, first.id)
+
+        # Another process stores an article after the index was built
+        other = Article.objects.create(
+            title='Title', url=self.urls[1], date=date, content='.',
+            outlet=outlet
+        )
+        self.assertEqual(self.urls[1] in index, False)
+
+        with self.assertNumQueries(1):
+            self.assertIs(bloom.refresh_url_index(), index)
+
+        self.assertEqual(self.urls[1] in index, True)
+        self.assertEqual((len(index), index.last_id), (2, other.id))
+
+        # Saved indexes know which articles they have
+        path = os.path.join(self.directory, 'urls.bloom')
+        index.save(path)
+        self.assertEqual(BloomFilter.load(path).last_id, other.id)
+
+
+    def test_bloom_article_exists(self):
+        """Tests if the database is only asked when the index may know a url."""
+        outlet = Outlet.objects.create(name='Fictional Outlet')
+        date = dateutil.parser.parse('Fri, 8 Dec 2017 16:11:37 +0000')
+
+        Article.objects.create(
+            title='Title', url=self.urls[0], date=date, content='.',
+            outlet=outlet
+        )
+
+        bloom.get_url_index()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(WebScraper.article_exists(self.urls[1]), False)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(WebScraper.article_exists(self.urls[0]), True)
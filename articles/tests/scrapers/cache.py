@@ -0,0 +1,93 @@
+import gzip
+import os
+import shutil
+import tempfile
+import time
+
+from mock import patch
+
+from django.test import TestCase, override_settings
+
+from articles.scrapers.cache import ResponseCache, cache_stats
+from articles.scrapers.scraper import WebScraper
+from articles.tests.utils import get_file
+
+class ResponseCacheTestCase(TestCase):
+    """This class defines the test suite for the response cache."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.directory = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.directory, 10000, {'html': 60})
+
+
+    def tearDown(self):
+        """Removes the cache's directory."""
+        shutil.rmtree(self.directory)
+
+
+    def test_cache_set_get(self):
+        """Tests if a stored body is given back compressed on disk."""
+        body = get_file('example.html')
+
+        self.cache.set('url:example', 'html', body)
+
+        self.assertEqual(self.cache.get('url:example', 'html'), body)
+        self.assertEqual(self.cache.get('url:other', 'html'), None)
+
+        with gzip.open(self.cache.path('url:example')) as stored:
+            self.assertEqual(stored.read(), body)
+
+        self.assertEqual(self.cache.stats['hits'], 1)
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+
+    def test_cache_ttl(self):
+        """Tests if expired or uncacheable content types are not used."""
+        self.cache.set('url:example', 'html', b'<html></html>')
+        self.cache.set('url:feed', 'xml', b'<rss></rss>')
+
+        self.assertEqual(os.path.exists(self.cache.path('url:feed')), False)
+
+        # Pretend the entry was stored two minutes ago
+        path = self.cache.path('url:example')
+        past = time.time() - 120
+        os.utime(path, (past, past))
+
+        self.assertEqual(self.cache.get('url:example', 'html'), None)
+        self.assertEqual(self.cache.stats['expired'], 1)
+
+
+    def test_cache_lru_eviction(self):
+        """Tests if the least recently used entries are evicted first."""
+        self.cache.max_size = 3 * len(gzip.compress(os.urandom(1000))) + 100
+
+        for i in range(3):
+            self.cache.set('url:' + str(i), 'html', os.urandom(1000))
+            past = time.time() - 50 + i
+            os.utime(self.cache.path('url:' + str(i)), (past, time.time()))
+
+        # Using the oldest entry makes the second one the least recently used
+        self.cache.get('url:0', 'html')
+        self.cache.set('url:3', 'html', os.urandom(1000))
+
+        self.assertNotEqual(self.cache.get('url:0', 'html'), None)
+        self.assertEqual(self.cache.get('url:1', 'html'), None)
+        self.assertEqual(self.cache.stats['evictions'] > 0, True)
+
+
+    @patch('requests.Session.get')
+    def test_cache_parse(self, mock_get):
+        """Tests if the parsing method looks up the cache before downloading."""
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.html')
+        ]
+
+        with override_settings(SCRAPER_CACHE_DIR=self.directory):
+            WebScraper.parse('url:example.html', 'html')
+            parsed = WebScraper.parse('url:example.html', 'html')
+
+            self.assertEqual(cache_stats()['hits'], 1)
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(parsed.getchildren()), 2)
@@ -0,0 +1,89 @@
+import datetime
+import json
+
+from io import StringIO
+
+import dateutil.parser
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from articles.models import Outlet, Article, OutletCadence
+from articles.scrapers import cadence
+
+class CadenceTestCase(TestCase):
+    """This class defines the test suite for the outlets' posting cadence."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.outlet = Outlet.objects.create(name='Fictional Outlet')
+
+        # Monday, December 4th 2017, at midnight (UTC)
+        self.monday = dateutil.parser.parse('Mon, 4 Dec 2017 00:00:00 +0000')
+        self.count = 0
+
+
+    def add_articles(self, hours):
+        """Adds an article every given number of hours after the last one."""
+        for hour in hours:
+            self.count += 1
+            Article.objects.create(
+                title='Article ' + str(self.count),
+                url='url:' + str(self.count),
+                date=self.monday + datetime.timedelta(hours=hour),
+                content='Some content.',
+                outlet=self.outlet
+            )
+
+
+    def test_cadence_statistics(self):
+        """Tests if the statistics are computed from the articles' dates."""
+        self.add_articles([0, 1, 3, 6, 10, 15])
+
+        stats = cadence.update_cadence(self.outlet)
+
+        self.assertEqual(stats.articles, 6)
+        self.assertEqual(stats.mean, 3 * 3600)
+        self.assertEqual(stats.last_date, self.monday + datetime.timedelta(hours=15))
+
+        # Percentiles are estimated inside their histogram's bin
+        self.assertAlmostEqual(stats.median / (3 * 3600), 1, delta=0.26)
+        self.assertAlmostEqual(stats.p90 / (5 * 3600), 1, delta=0.26)
+
+        hours = json.loads(stats.hours)
+        self.assertEqual(len(hours), 168)
+        self.assertEqual([hours[h] for h in [0, 1, 3, 6, 10, 15]], [1] * 6)
+
+
+    def test_cadence_incremental(self):
+        """Tests if updates only read the new articles and match a rebuild."""
+        self.add_articles([0, 1, 3])
+        cadence.update_cadence(self.outlet)
+
+        self.add_articles([30, 200])
+
+        # Get the cadence, read the new articles' dates and save the cadence
+        with self.assertNumQueries(3):
+            updated = cadence.update_cadence(self.outlet)
+
+        rebuilt = cadence.update_cadence(self.outlet, rebuild=True)
+
+        self.assertEqual(OutletCadence.objects.count(), 1)
+
+        for field in ['articles', 'total', 'gaps', 'hours', 'mean', 'median']:
+            self.assertEqual(getattr(updated, field), getattr(rebuilt, field))
+
+        self.assertEqual(json.loads(updated.hours)[200 - 168], 1)
+
+
+    def test_cadence_command(self):
+        """Tests if the command reports every outlet's cadence."""
+        self.add_articles([0, 2])
+        Outlet.objects.create(name='Other Outlet', website='other.com')
+
+        out = StringIO()
+        call_command('compute_cadence', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[1].split()[:4], ['Fictional', 'Outlet', '2', '2.00'])
+        self.assertEqual(lines[2].split(), ['Other', 'Outlet', '0', '-', '-', '-'])
@@ -0,0 +1,125 @@
+import datetime
+import json
+
+from mock import patch, MagicMock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from articles.models import CheckpointEntry, CrawlCheckpoint, Outlet
+from articles.scrapers.checkpoint import Checkpoint
+from articles.scrapers.mashable import Mashable
+from articles.tests.utils import get_file
+
+@override_settings(SCRAPER_CHECKPOINT_EVERY=2)
+class CheckpointTestCase(TestCase):
+    """This class defines the test suite for the runs' checkpoints."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.outlet = Outlet.objects.create(name='Mashable')
+
+        self.scraper = Mashable()
+        self.scraper.checkpoint = Checkpoint.load(self.outlet)
+
+
+    def resumed(self):
+        """Gives a new scraper resuming the outlet's last run."""
+        scraper = Mashable()
+        scraper.checkpoint = Checkpoint.load(self.outlet)
+
+        return scraper
+
+
+    @patch('requests.Session.get')
+    def test_checkpoint_pages(self, mock_get):
+        """Tests if a resumed run only downloads the pages that were left."""
+        mock_get.return_value.iter_content.return_value = [
+            get_file('mashable_article.html')
+        ]
+
+        self.scraper.extract_pages(['url:a', 'url:b'], 'html', 'article_info')
+        self.assertEqual(mock_get.call_count, 2)
+
+        saved = CheckpointEntry.objects.filter(checkpoint__outlet=self.outlet)
+        self.assertEqual(
+            sorted(saved.values_list('key', flat=True)), ['url:a', 'url:b']
+        )
+
+        # The worker was restarted before the run finished
+        records = self.resumed().extract_pages(
+            ['url:a', 'url:b', 'url:c'], 'html', 'article_info'
+        )
+
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(records['url:a'], records['url:c'])
+        self.assertIsInstance(records['url:a']['date'], datetime.datetime)
+
+        # Only the new page's record was saved
+        self.assertEqual(saved.count(), 3)
+        self.assertEqual(
+            json.loads(saved.get(key='url:c').value)['url'],
+            records['url:c']['url']
+        )
+
+
+    @patch('articles.scrapers.scraper.WebScraper.prefetch_authors')
+    @patch('articles.scrapers.scraper.WebScraper.get_author')
+    def test_checkpoint_authors(self, mock_author, mock_prefetch):
+        """Tests if a resumed run does not resolve the same authors again."""
+        mock_author.side_effect = lambda name, i: {'name': name, 'about': 'Hi'}
+
+        found = [({'url': 'url:' + n}, [n]) for n in ['Ann', 'Bob', 'Cid']]
+
+        list(self.scraper.resolve_authors(found))
+        self.assertEqual(mock_author.call_count, 3)
+
+        articles = list(self.resumed().resolve_authors(found))
+        self.assertEqual(mock_author.call_count, 3)
+        self.assertEqual(articles[2]['authors'], [
+            {'name': 'Cid', 'about': 'Hi'}
+        ])
+
+        # Only the authors left are prefetched
+        self.assertEqual(list(mock_prefetch.call_args[0][0]), [])
+
+
+    def test_checkpoint_expired(self):
+        """Tests if old checkpoints are not resumed."""
+        self.scraper.checkpoint.add_author('Ann', {'name': 'Ann'})
+        self.scraper.checkpoint.save()
+
+        self.assertEqual(
+            self.resumed().checkpoint.authors, {'Ann': {'name': 'Ann'}}
+        )
+
+        CrawlCheckpoint.objects.update(
+            updated_at=timezone.now() - datetime.timedelta(days=2)
+        )
+
+        self.assertFalse(self.resumed().checkpoint)
+
+        # Nor saved on again
+        self.assertFalse(CrawlCheckpoint.objects.exists())
+
+
+    @patch('requests.Session.get')
+    def test_checkpoint_cleared(self, mock_get):
+        """Tests if a finished run deletes its checkpoint."""
+        self.scraper.checkpoint.add_author('Ann', {'name': 'Ann'})
+        self.scraper.checkpoint.save()
+
+        scraper = self.resumed()
+        scraper.feed_type = 'json'
+        scraper.feed_url = 'url:example.json'
+        scraper.extract_articles = MagicMock(return_value=[])
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.json')
+        ]
+
+        scraper.get_articles()
+
+        self.assertFalse(CrawlCheckpoint.objects.exists())
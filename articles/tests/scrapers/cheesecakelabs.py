@@ -25,12 +25,14 @@ class CheesecakeLabsScraperTestCase(TestCase):
         self.assertEqual(list(results.keys()), expct)
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_ckl_extract_articles(self, mock_get):
         """Tests if articles are being correctly extracted."""
 
         # This mock is used when some function tries to request from the web
-        mock_get.return_value.content = get_file('cheesecakelabs_article.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('cheesecakelabs_article.html')
+        ]
 
         # Parses and extract information from Cheesecake Articles JSON feed
         article_feed = parse_mocked('cheesecakelabs_articles.json', 'json')
@@ -40,4 +42,15 @@ class CheesecakeLabsScraperTestCase(TestCase):
         self.assertEqual(len(articles_extracted), 19)
 
         # Check data integrity on the first article (mocking makes all equal)
-        self.assertEqual(self.scraper.check_data(articles_extracted[0]), None)
+        article = articles_extracted[0]
+        self.assertEqual(self.scraper.check_data(article.as_dict()), None)
+
+        self.assertEqual(article.title, 'Cheesecake Labs ranked #2 amongst Top Developers in Latin America by Clutch')
+        self.assertEqual(
+            article.url,
+            'https://cheesecakelabs.com/blog/atomic-design-react/'
+        )
+        self.assertEqual([a.name for a in article.authors], ['Alex Cordeiro'])
+        self.assertEqual(article.categories, [
+            'About Us', 'Uncategorized', 'Development', 'Design'
+        ])
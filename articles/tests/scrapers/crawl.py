@@ -0,0 +1,104 @@
+from mock import patch
+
+from django.test import TestCase
+
+from articles.models import FetchFailure, Outlet, OutletRun
+from articles.scrapers import crawl, fetcher
+from articles.scrapers.report import RunReport
+
+class CrawlTestCase(TestCase):
+    """This class defines the test suite for the crawls' steps."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        for name in ['TechCrunch', 'Mashable', 'Engadget', 'Other']:
+            Outlet.objects.create(name=name, website=name.lower() + '.com')
+
+        Outlet.objects.filter(name='Engadget').update(active=False)
+
+
+    def test_crawl_start(self):
+        """Tests if a crawl has a pending run per active scraped outlet."""
+        crawl_id, names = crawl.start_crawl()
+
+        self.assertEqual(names, ['TechCrunch', 'Mashable'])
+        self.assertEqual(OutletRun.objects.filter(crawl=crawl_id).count(), 2)
+
+        # Nothing is reported until every run is finished
+        self.assertEqual(crawl.crawl_report(crawl_id), None)
+
+
+    @staticmethod
+    def stored(created, error=None):
+        """Gives a run storing some articles and, maybe, failing after it."""
+        def get_articles(scraper):
+            """Counts the articles stored on the scraper's report."""
+            scraper.report = RunReport()
+            scraper.report.created = created
+
+            if error:
+                raise error
+
+            return scraper.report
+
+        return get_articles
+
+
+    @patch('articles.scrapers.mashable.Mashable.get_articles', autospec=True)
+    @patch('articles.scrapers.techcrunch.TechCrunch.get_articles', \
+        autospec=True)
+    def test_crawl_report(self, mock_techcrunch, mock_mashable):
+        """Tests if a failing outlet is recorded without stopping the rest."""
+        mock_techcrunch.side_effect = self.stored(3)
+        mock_mashable.side_effect = self.stored(2, ValueError('Broken feed'))
+
+        crawl_id, names = crawl.start_crawl()
+
+        with self.assertLogs('articles.scrapers.crawl', 'ERROR'):
+            runs = [crawl.run_outlet(crawl_id, name) for name in names]
+
+        self.assertEqual(runs[0].items, 3)
+        self.assertEqual(runs[0].error, '')
+        self.assertIn('Broken feed', runs[1].error)
+
+        # The chunks stored before the failure are counted
+        self.assertEqual(runs[1].items, 2)
+
+        report = crawl.crawl_report(crawl_id)
+
+        self.assertEqual(list(report['outlets']), ['TechCrunch', 'Mashable'])
+        self.assertEqual(report['items'], 5)
+        self.assertEqual(report['failures'], 1)
+        self.assertEqual(report['wall_time'] >= 0, True)
+
+        with self.assertLogs('articles.scrapers.crawl', 'INFO') as logs:
+            crawl.log_report(report)
+
+        self.assertEqual(len(logs.output), 3)
+
+
+    def test_crawl_fetch_failures(self):
+        """Tests if the downloads that failed are recorded by host."""
+        crawl_id, _ = crawl.start_crawl(['TechCrunch'])
+        outlet = Outlet.objects.get(name='TechCrunch')
+
+        run = fetcher.FetchRun()
+        run.fail('https://techcrunch.com/a', fetcher.CircuitOpen('Open'))
+        run.fail('https://www.techcrunch.com/b', fetcher.CircuitOpen('Open'))
+        run.fail('https://social.techcrunch.com/c', ValueError('Broken'))
+
+        with self.assertLogs('articles.scrapers.crawl', 'WARNING') as logs:
+            crawl.record_failures(crawl_id, outlet, run)
+
+        self.assertIn(
+            'techcrunch.com 2, social.techcrunch.com 1', logs.output[0]
+        )
+
+        failure = FetchFailure.objects.get(url='https://techcrunch.com/a')
+        self.assertEqual(failure.host, 'techcrunch.com')
+        self.assertEqual(failure.crawl, crawl_id)
+        self.assertEqual(failure.error, 'CircuitOpen: Open')
+
+        # Runs without failures record nothing
+        self.assertEqual(crawl.record_failures(crawl_id, outlet, None), [])
+        self.assertEqual(FetchFailure.objects.count(), 3)
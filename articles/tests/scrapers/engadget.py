@@ -29,10 +29,12 @@ class EngadgetScraperTestCase(TestCase):
         self.assertEqual('http://www.engadget.com/about/editors/jon-snow', url)
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_engadget_get_author(self, mock_get):
         """Tests if an author's information can be found by his/her name."""
-        mock_get.return_value.content = get_file('engadget_author.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('engadget_author.html')
+        ]
 
         self.scraper.author_url = 'example'
         self.scraper.author_page_type = 'html'
@@ -51,12 +53,14 @@ class EngadgetScraperTestCase(TestCase):
             self.assertEqual(result[key], expected[key])
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_engadget_extract_articles(self, mock_get):
         """Tests if an article list can be extracted from xml feed."""
 
         # This mock is used when some function tries to request from the web
-        mock_get.return_value.content = get_file('engadget_author.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('engadget_author.html')
+        ]
 
         # Parses and extract information from Engadget Articles XML feed
         article_feed = parse_mocked('engadget_articles.xml', 'xml')
@@ -66,4 +70,13 @@ class EngadgetScraperTestCase(TestCase):
         self.assertEqual(len(articles_extracted), 25)
 
         # Check data integrity on the first article (mocking makes all equal)
-        self.assertEqual(self.scraper.check_data(articles_extracted[0]), None)
+        article = articles_extracted[0]
+        self.assertEqual(self.scraper.check_data(article.as_dict()), None)
+
+        self.assertEqual(article.title, "'Half-Life 3' fan venture 'Project Borealis' is taking shape")
+        self.assertEqual(
+            article.url,
+            'https://www.engadget.com/2017/12/28/half-life-3-fan-venture-project-borealis-is-taking-shape/'
+        )
+        self.assertEqual([a.name for a in article.authors], ['Rachel England'])
+        self.assertEqual(article.categories[:2], ['av', 'developer'])
@@ -0,0 +1,381 @@
+import threading
+import time
+
+import requests
+
+from mock import patch, MagicMock
+
+from django.test import TestCase, override_settings
+
+from articles.scrapers import fetcher
+
+class FetcherTestCase(TestCase):
+    """This class defines the test suite for the fetching engine."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+        fetcher.BREAKERS.clear()
+        fetcher.LOCAL.run = None
+
+
+    def tearDown(self):
+        """Forgets the test's run, so later downloads are not bounded by it."""
+        fetcher.LOCAL.run = None
+
+
+    def slow_function(self, url):
+        """Pretends to download an url while counting concurrent calls."""
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        time.sleep(0.05)
+
+        with self.lock:
+            self.running -= 1
+
+        if url == 'broken':
+            raise ValueError('Broken url')
+
+        return url.upper()
+
+
+    def test_fetcher_fetch_all(self):
+        """Tests if every url is mapped to its result keeping their order."""
+        urls = ['c', 'a', 'b', 'a', None]
+
+        results = fetcher.fetch_all(urls, self.slow_function, 2)
+
+        self.assertEqual(list(results.items()), [
+            ('c', 'C'), ('a', 'A'), ('b', 'B')
+        ])
+
+
+    def test_fetcher_fetch_all_concurrency(self):
+        """Tests if the number of simultaneous downloads is bounded."""
+        urls = [str(i) for i in range(10)]
+
+        fetcher.fetch_all(urls, self.slow_function, 3)
+
+        self.assertEqual(self.max_running, 3)
+
+
+    def test_fetcher_fetch_all_errors(self):
+        """Tests if a failing url does not spoil the batch."""
+        with self.assertLogs('articles.scrapers.fetcher', 'WARNING'):
+            results = fetcher.fetch_all(['a', 'broken'], self.slow_function)
+
+        self.assertEqual(results['a'], 'A')
+        self.assertEqual(results['broken'], None)
+
+
+    def test_fetcher_fetch_all_empty(self):
+        """Tests if an empty batch does not start the engine."""
+        self.assertEqual(len(fetcher.fetch_all([], self.slow_function)), 0)
+
+
+    def test_fetcher_shared_session(self):
+        """Tests if every download uses the same pooled session."""
+        session = fetcher.get_session()
+
+        self.assertIs(fetcher.get_session(), session)
+
+        adapter = session.get_adapter('https://techcrunch.com')
+        self.assertIs(session.get_adapter('http://mashable.com'), adapter)
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter._pool_block, True)
+
+
+    def test_fetcher_shared_twitter_api(self):
+        """Tests if every timeline is fetched by the same twitter client."""
+        self.assertIs(fetcher.get_twitter_api(), fetcher.get_twitter_api())
+
+
+    @patch('requests.Session.get')
+    def test_fetcher_download_timeout(self, mock_get):
+        """Tests if downloads are given connect and read timeouts."""
+        fetcher.download('url:example')
+
+        mock_get.assert_called_once_with('url:example', timeout=(5, 30))
+
+
+    @override_settings(SCRAPER_RETRY_BACKOFF=0)
+    @patch('requests.Session.get')
+    def test_fetcher_retries(self, mock_get):
+        """Tests if transient errors are retried a few times."""
+        response = MagicMock(status_code=200)
+        mock_get.side_effect = [
+            requests.ConnectionError(), requests.Timeout(), response
+        ]
+
+        self.assertIs(fetcher.download('https://example.com/a'), response)
+        self.assertEqual(mock_get.call_count, 3)
+
+        # Retries are bounded and the failure is kept by the run
+        run = fetcher.start_run()
+        mock_get.side_effect = None
+        mock_get.return_value = MagicMock(status_code=503)
+
+        with self.assertRaises(requests.HTTPError):
+            fetcher.download('https://example.com/b')
+
+        self.assertEqual(mock_get.call_count, 6)
+        self.assertEqual(run.failures[0][0], 'https://example.com/b')
+
+        # Every transient answer gave its connection back
+        self.assertEqual(mock_get.return_value.close.call_count, 3)
+
+
+    @override_settings(SCRAPER_RETRIES=0, SCRAPER_BREAKER_FAILURES=2)
+    @patch('requests.Session.get')
+    def test_fetcher_circuit_breaker(self, mock_get):
+        """Tests if a host failing again and again is left alone."""
+        mock_get.side_effect = requests.ConnectionError()
+
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                fetcher.download('https://example.com/a')
+
+        with self.assertRaises(fetcher.CircuitOpen):
+            fetcher.download('https://www.example.com/b')
+
+        self.assertEqual(mock_get.call_count, 2)
+
+        # Other hosts are not affected
+        mock_get.side_effect = None
+        fetcher.download('https://other.com/a')
+
+        # After a while a single download is let through
+        fetcher.get_breaker('example.com').opened -= 5 * 60
+        fetcher.download('https://example.com/a')
+        fetcher.download('https://example.com/b')
+
+        self.assertEqual(mock_get.call_count, 5)
+
+
+    @patch('requests.Session.get')
+    def test_fetcher_deadline(self, mock_get):
+        """Tests if downloads are bounded by their run's deadline."""
+        fetcher.start_run(2)
+        fetcher.download('url:example')
+
+        timeout = mock_get.call_args[1]['timeout']
+        self.assertLessEqual(max(timeout), 2)
+
+        # The engine's threads download within the same run
+        fetcher.current_run().deadline = time.monotonic() - 1
+
+        results = fetcher.fetch_all(['url:a', 'url:b'])
+
+        self.assertEqual(list(results.values()), [None, None])
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(fetcher.current_run().failures), 2)
+        self.assertIsInstance(
+            fetcher.current_run().failures[0][1], fetcher.DeadlineExceeded
+        )
+
+
+    @patch('articles.scrapers.fetcher.get_session')
+    def test_fetcher_connection_stats(self, mock_session):
+        """Tests if connection reuse is counted by host."""
+        pools = {}
+        for key, host, requests, connections in [
+                ('a', 'techcrunch.com', 10, 2),
+                ('b', 'techcrunch.com', 5, 1),
+                ('c', 'mashable.com', 3, 3)]:
+            pools[key] = MagicMock(
+                host=host,
+                num_requests=requests,
+                num_connections=connections
+            )
+
+        adapter = MagicMock()
+        adapter.poolmanager.pools = pools
+        mock_session.return_value.adapters.values.return_value = [adapter]
+
+        stats = fetcher.connection_stats()
+
+        self.assertEqual(stats['techcrunch.com']['reused'], 12)
+        self.assertEqual(stats['mashable.com']['reused'], 0)
+        self.assertEqual(fetcher.connection_totals()['requests'], 18)
+
+
+    def test_fetcher_body_size(self):
+        """Tests if bodies over their cap fail and their bytes are kept."""
+        run = fetcher.start_run()
+
+        response = MagicMock(url='url:a', headers={})
+        response.iter_content.return_value = [b'a' * 10] * 3
+
+        self.assertEqual(fetcher.read_body(response, max_size=30), b'a' * 30)
+        self.assertEqual((run.downloaded, run.peak), (30, 30))
+
+        # Only a chunk at a time is held while the body is iterated
+        self.assertEqual(len(list(fetcher.iter_body(response))), 3)
+        self.assertEqual((run.downloaded, run.peak), (60, 30))
+
+        with self.assertRaises(fetcher.BodyTooLarge):
+            fetcher.read_body(response, max_size=25)
+
+        self.assertEqual(run.downloaded, 90)
+        self.assertEqual(response.close.call_count, 3)
+
+        # A declared length over the cap fails before anything is read
+        response.headers = {'Content-Length': '1000'}
+
+        with self.assertRaises(fetcher.BodyTooLarge):
+            fetcher.read_body(response, max_size=100)
+
+        self.assertEqual(run.downloaded, 90)
+        self.assertEqual([url for url, _ in run.failures], ['url:a'] * 2)
+
+
+    def test_fetcher_body_deadline(self):
+        """Tests if a body still being read at the deadline fails."""
+        run = fetcher.start_run(60)
+
+        response = MagicMock(url='url:a', headers={})
+        response.iter_content.return_value = [b'a' * 10] * 3
+
+        chunks = fetcher.iter_body(response)
+        self.assertEqual(next(chunks), b'a' * 10)
+
+        run.deadline = time.monotonic() - 1
+
+        with self.assertRaises(fetcher.DeadlineExceeded):
+            next(chunks)
+
+        self.assertEqual(response.close.call_count, 1)
+        self.assertEqual([url for url, _ in run.failures], ['url:a'])
+
+
+    @patch('requests.Session.get')
+    def test_fetcher_bucket_deadline(self, mock_get):
+        """Tests if waiting for a host's turn is bounded by the deadline."""
+        fetcher.limit_host('slow-outlet.com', 0.01, 1)
+        fetcher.start_run(5)
+
+        fetcher.download('https://slow-outlet.com/a')
+
+        # The next token would only come after the deadline
+        start = time.monotonic()
+
+        with self.assertRaises(fetcher.DeadlineExceeded):
+            fetcher.download('https://slow-outlet.com/b')
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(mock_get.call_count, 1)
+
+        # The tokens not waited for are given back, so the next one still
+        # comes a single token away
+        bucket = fetcher.get_bucket('https://slow-outlet.com')
+        self.assertFalse(bucket.acquire(timeout=0))
+        self.assertAlmostEqual(bucket.reserve(), 100, delta=1)
+
+
+    @patch('requests.Session.get')
+    def test_fetcher_waits_use_deadline(self, mock_get):
+        """Tests if a deadline passed while waiting is not a bad timeout."""
+        connections = threading.BoundedSemaphore(1)
+        fetcher.limit_host('patient-outlet.com', 1, 1)
+        run = fetcher.start_run(5)
+
+        def acquire(timeout=None): #pylint: disable=unused-argument
+            """Waits for the host's turn until the deadline has passed."""
+            run.deadline = time.monotonic() - 1
+            return True
+
+        bucket = fetcher.get_bucket('https://patient-outlet.com')
+
+        with patch.object(bucket, 'acquire', acquire), \
+                patch('articles.scrapers.fetcher.CONNECTIONS', connections):
+            with self.assertRaises(fetcher.DeadlineExceeded):
+                fetcher.download('https://patient-outlet.com/a')
+
+            # Nor is one passed while waiting for a connection, whose slot is
+            # given back
+            run.deadline = time.monotonic() + 5
+
+            def acquire_connection(timeout=None): #pylint: disable=unused-argument
+                """Waits for a connection until the deadline has passed."""
+                acquire()
+                return threading.BoundedSemaphore.acquire(connections)
+
+            with patch.object(connections, 'acquire', acquire_connection):
+                with self.assertRaises(fetcher.DeadlineExceeded):
+                    fetcher.download('url:b')
+
+            self.assertTrue(connections.acquire(blocking=False))
+
+        self.assertEqual(mock_get.call_count, 0)
+        self.assertEqual(len(run.failures), 2)
+
+
+    @override_settings(SCRAPER_RETRIES=0)
+    @patch('requests.Session.get')
+    def test_fetcher_connection_slots(self, mock_get):
+        """Tests if streamed responses hold their connection until released."""
+        connections = threading.BoundedSemaphore(1)
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+        mock_get.return_value.iter_content.return_value = [b'a']
+
+        with patch('articles.scrapers.fetcher.CONNECTIONS', connections):
+            response = fetcher.download('url:a', stream=True)
+            self.assertFalse(connections.acquire(blocking=False))
+
+            # No other connection can be had meanwhile, up to the deadline
+            fetcher.start_run(0.1)
+
+            with self.assertRaises(fetcher.DeadlineExceeded):
+                fetcher.download('url:b')
+
+            fetcher.LOCAL.run = None
+            self.assertEqual(fetcher.read_body(response), b'a')
+
+            # Other responses give their connection back at once
+            fetcher.download('url:c')
+            mock_get.side_effect = requests.ConnectionError('Unreachable')
+
+            with self.assertRaises(requests.ConnectionError):
+                fetcher.download('url:d', stream=True)
+
+            self.assertTrue(connections.acquire(blocking=False))
+            connections.release()
+
+
+    def test_fetcher_token_bucket(self):
+        """Tests if the bucket allows a burst and then spaces the requests."""
+        bucket = fetcher.TokenBucket(rate=10, burst=2)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertAlmostEqual(waits[2], 0.1, places=2)
+        self.assertAlmostEqual(waits[3], 0.2, places=2)
+
+
+    def test_fetcher_host_limits(self):
+        """Tests if an outlet's limits apply to its domain and subdomains."""
+        fetcher.limit_host('https://www.example-outlet.com/', 5, 3)
+
+        bucket = fetcher.get_bucket('http://example-outlet.com/feed')
+        self.assertEqual((bucket.rate, bucket.burst), (5, 3))
+
+        sub = fetcher.get_bucket('https://social.example-outlet.com/author/')
+        self.assertIs(sub, bucket)
+
+        self.assertEqual(fetcher.get_bucket('https://other-outlet.com/'), None)
+
+        # Setting the same limits again keeps the bucket, changing them not
+        fetcher.limit_host('example-outlet.com', 5, 3)
+        self.assertIs(fetcher.get_bucket('http://example-outlet.com'), bucket)
+
+        fetcher.limit_host('example-outlet.com', 1, 1)
+        bucket = fetcher.get_bucket('http://example-outlet.com')
+        self.assertEqual((bucket.rate, bucket.burst), (1, 1))
@@ -0,0 +1,144 @@
+from mock import patch
+
+import dateutil.parser
+
+from django.test import TestCase
+
+from articles.models import Outlet, Author, Category
+from articles.scrapers import bloom, identity
+from articles.scrapers.scraper import WebScraper
+
+class IdentityTestCase(TestCase):
+    """This class defines the test suite for the scrapers' identity caches."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.outlet = Outlet.objects.create(name='Fictional Outlet')
+        self.scraper = WebScraper('Fictional Outlet')
+        self.scraper.author_page_type = 'html'
+
+        # The url index is built beforehand so it does not count as queries
+        bloom.get_url_index()
+
+
+    def article(self, i, categories):
+        """Gives an article's data by the given authors and categories."""
+        return {
+            'title': 'Article ' + str(i),
+            'url': 'https://fictional-outlet.com/article-' + str(i),
+            'date': dateutil.parser.parse('Fri, 8 Dec 2017 16:11:37 +0000'),
+            'content': 'Some content.',
+            'authors': [{'name': 'Danilo Woznica'}, {'name': 'Jane Doe'}],
+            'categories': categories,
+        }
+
+
+    def test_identity_outlet(self):
+        """Tests if outlets are looked up once until any of them changes."""
+        with self.assertNumQueries(0):
+            scraper = WebScraper('Fictional Outlet')
+
+        self.assertEqual(scraper.outlet, self.outlet)
+
+        self.outlet.active = False
+        self.outlet.save()
+
+        with self.assertNumQueries(1):
+            scraper = WebScraper('Fictional Outlet')
+
+        self.assertEqual(scraper.outlet.active, False)
+
+        # Missing outlets are not kept
+        self.assertEqual(WebScraper('Other Outlet').outlet, None)
+        Outlet.objects.create(name='Other Outlet', website='other.com')
+        self.assertNotEqual(WebScraper('Other Outlet').outlet, None)
+
+
+    def test_identity_create_articles(self):
+        """Tests if repeated authors and categories cost no extra queries."""
+        self.scraper.create_articles([
+            self.article(0, ['Front-end', 'Design']),
+        ])
+
+        # Only the articles and their relations are stored: savepoint, three
+        # queries for articles (the insert within its own savepoint), two
+        # inserts for relations and the release.
+        with self.assertNumQueries(9):
+            articles = self.scraper.create_articles([
+                self.article(i, ['Design', 'Front-end']) for i in range(1, 6)
+            ])
+
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(articles[4].authors.count(), 2)
+        self.assertEqual(articles[4].categories.count(), 2)
+
+
+    @patch('articles.scrapers.scraper.WebScraper.get_authors_page')
+    def test_identity_get_author(self, mock_page):
+        """Tests if authors stored on this run are not looked up again."""
+        self.scraper.create_articles([self.article(0, [])])
+
+        with self.assertNumQueries(0):
+            author = self.scraper.get_author('Jane Doe')
+            self.scraper.prefetch_authors(['Danilo Woznica', 'Jane Doe'])
+
+        self.assertEqual(author, {'name': 'Jane Doe'})
+        self.assertEqual(mock_page.call_count, 0)
+
+        # A new run forgets them
+        self.scraper.identity.clear()
+
+        with self.assertNumQueries(1):
+            self.scraper.get_author('Jane Doe')
+
+        self.assertNotEqual(
+            self.scraper.identity.get(Author, 'Jane Doe', self.outlet.id), None
+        )
+
+
+    @patch('articles.scrapers.scraper.WebScraper.extract_author')
+    @patch('articles.scrapers.scraper.WebScraper.get_authors_page')
+    @patch('requests.Session.get')
+    def test_identity_resolve_authors(self, mock_get, mock_page, mock_extract):
+        """Tests if every author is resolved once for all his/her articles."""
+        Author.objects.create(name='Danilo Woznica', outlet=self.outlet)
+
+        mock_get.return_value.iter_content.return_value = [
+            b'<html><body></body></html>'
+        ]
+        mock_page.side_effect = lambda name: 'url:' + name
+        mock_extract.return_value = {'about': 'Writes a lot.'}
+
+        found = [
+            (self.article(i, []), ['Danilo Woznica', 'Jane Doe'])
+            for i in range(5)
+        ]
+
+        # A single query finds the stored authors
+        with self.assertNumQueries(1):
+            articles = list(self.scraper.resolve_authors(found))
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(mock_extract.call_count, 1)
+
+        self.assertEqual(articles[4]['authors'], [
+            {'name': 'Danilo Woznica'},
+            {'name': 'Jane Doe', 'about': 'Writes a lot.'},
+        ])
+
+
+    def test_identity_map(self):
+        """Tests if instances are kept by model, scope and key."""
+        identity_map = identity.IdentityMap()
+        category = Category.objects.create(name='Design', slug='design')
+
+        identity_map.add(Category, 'design', category)
+
+        self.assertIs(identity_map.get(Category, 'design'), category)
+        self.assertEqual(identity_map.get(Category, 'design', 1), None)
+        self.assertEqual(identity_map.get(Author, 'design'), None)
+        self.assertEqual(
+            identity_map.find(Category, ['design', 'front-end']),
+            {'design': category}
+        )
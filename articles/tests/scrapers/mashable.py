@@ -4,7 +4,7 @@ from django.test import TestCase
 
 from articles.scrapers.mashable import Mashable
 from articles.tests.utils import get_file, parse_mocked
-from articles.models import Outlet
+from articles.models import Feed, Outlet
 
 class MashableScraperTestCase(TestCase):
     """This class defines the test suite for the Mashable scraper."""
@@ -29,18 +29,12 @@ class MashableScraperTestCase(TestCase):
         self.assertEqual('http://mashable.com/author/jon-snow', url)
 
 
-    def test_mash_author_page_setted(self):
-        """Tests if author's url page is being correctly generated."""
-        self.scraper.author_url = 'completly-different-url'
-
-        url = self.scraper.get_authors_page('Jon Snow')
-        self.assertEqual('completly-different-url', url)
-
-
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_mashable_get_author(self, mock_get):
         """Tests if an author's information can be found by his/her name."""
-        mock_get.return_value.content = get_file('mashable_author.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('mashable_author.html')
+        ]
 
         result = self.scraper.get_author('Adam Rosenberg')
 
@@ -58,15 +52,17 @@ class MashableScraperTestCase(TestCase):
 
 
     @patch('articles.scrapers.scraper.WebScraper.get_author')
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_mashable_extract_articles(self, mock_get1, mock_get2):
         """Tests if an article list can be extracted from twitter feed."""
 
         # This mock is used when some function tries to request from the web.
         # The extract_articles method tries to do this twice, one for gathering
         # article's content from the article's page and another for the author.
-        mock_get1.return_value.content = get_file('mashable_article.html')
-        mock_get2.return_value = self.author
+        mock_get1.return_value.iter_content.return_value = [
+            get_file('mashable_article.html')
+        ]
+        mock_get2.return_value = dict(self.author, name='Adam Rosenberg')
 
         # Parses and extract information from Mashable Articles Twitter feed
         article_feed = parse_mocked('mashable_twitter', 'twitter')
@@ -76,4 +72,133 @@ class MashableScraperTestCase(TestCase):
         self.assertEqual(len(articles_extracted), 19)
 
         # Check data integrity on the first article (mocking makes all equal)
-        self.assertEqual(self.scraper.check_data(articles_extracted[0]), None)
+        article = articles_extracted[0]
+        self.assertEqual(self.scraper.check_data(article.as_dict()), None)
+
+        self.assertEqual(article.title, 'Library of Congress admits defeat, accepts the futility of trying to archive all of Twitter')
+        self.assertEqual(
+            article.url,
+            'http://mashable.com/2017/12/27/library-of-congress-twitter-selective-catalog-2018/'
+        )
+        self.assertEqual([a.name for a in article.authors], ['Adam Rosenberg'])
+        self.assertEqual(article.categories, [
+            'Tech', 'Twitter', 'Library-Of-Congress', 'Social-Media-Companies'
+        ])
+
+
+
+    @patch('twitter.Api.GetUserTimeline')
+    def test_mashable_timeline_cursor(self, mock_twitter):
+        """Tests if only statuses newer than the feed's cursor are asked for."""
+        statuses = parse_mocked('mashable_twitter', 'twitter')
+        mock_twitter.return_value = statuses
+
+        feed = Feed(outlet=self.scraper.outlet, url='mashabletech')
+
+        self.scraper.fetch_timeline(feed)
+        self.assertNotIn('since_id', mock_twitter.call_args_list[0][1])
+        self.assertEqual(feed.cursor, str(max(s.id for s in statuses)))
+
+        # Nothing new was posted since the last run
+        mock_twitter.return_value = []
+
+        self.scraper.fetch_timeline(feed)
+        self.assertEqual(mock_twitter.call_args[1]['since_id'], int(feed.cursor))
+        self.assertEqual(feed.cursor, str(max(s.id for s in statuses)))
+
+
+    @patch('twitter.Api.GetUserTimeline')
+    def test_mashable_timeline_pages(self, mock_twitter):
+        """Tests if older pages are asked for until the cursor is reached."""
+        statuses = sorted(
+            parse_mocked('mashable_twitter', 'twitter'),
+            key=lambda status: status.id, reverse=True
+        )
+        since_id = statuses[5].id
+
+        def timeline(**query):
+            """Gives two statuses at a time, newest first."""
+            return [
+                s for s in statuses
+                if query['since_id'] < s.id <= query.get('max_id', s.id)
+            ][:2]
+
+        mock_twitter.side_effect = timeline
+
+        feed = Feed(
+            outlet=self.scraper.outlet, url='mashabletech', cursor=str(since_id)
+        )
+        found = self.scraper.fetch_timeline(feed)
+
+        self.assertEqual(found, statuses[:5])
+        self.assertEqual(mock_twitter.call_count, 4)
+        self.assertEqual(
+            mock_twitter.call_args_list[1][1]['max_id'], statuses[1].id - 1
+        )
+        self.assertEqual(feed.cursor, str(statuses[0].id))
+
+
+    @patch('twitter.Api.GetUserTimeline')
+    def test_mashable_timeline_first_page(self, mock_twitter):
+        """Tests if a feed without cursor only asks for the newest page."""
+        statuses = sorted(
+            parse_mocked('mashable_twitter', 'twitter'),
+            key=lambda status: status.id, reverse=True
+        )
+
+        def timeline(**query):
+            """Gives two statuses at a time, newest first."""
+            return [
+                s for s in statuses if s.id <= query.get('max_id', s.id)
+            ][:2]
+
+        mock_twitter.side_effect = timeline
+
+        feed = Feed(outlet=self.scraper.outlet, url='mashabletech')
+        found = self.scraper.fetch_timeline(feed)
+
+        self.assertEqual(found, statuses[:2])
+        self.assertEqual(mock_twitter.call_count, 1)
+        self.assertEqual(mock_twitter.call_args[1]['count'], 200)
+        self.assertEqual(feed.cursor, str(statuses[0].id))
+
+
+    @patch('articles.scrapers.scraper.WebScraper.get_author')
+    @patch('requests.Session.get')
+    def test_mashable_extract_articles_once(self, mock_get1, mock_get2):
+        """Tests if articles tweeted more than once are downloaded once."""
+        mock_get1.return_value.iter_content.return_value = [
+            get_file('mashable_article.html')
+        ]
+        mock_get2.return_value = dict(self.author, name='Adam Rosenberg')
+
+        article_feed = parse_mocked('mashable_twitter', 'twitter')
+        list(self.scraper.extract_articles(article_feed + article_feed))
+
+        # The same 19 articles' pages and their author's profile page
+        self.assertEqual(mock_get1.call_count, 20)
+
+
+    @patch('articles.scrapers.scraper.WebScraper.get_author')
+    @patch('requests.Session.get')
+    def test_mashable_extract_articles_stored(self, mock_get1, mock_get2):
+        """Tests if stored articles' pages are only read up to their head."""
+        content = get_file('mashable_article.html')
+        chunks = [content[i:i + 1000] for i in range(0, len(content), 1000)]
+        mock_get1.return_value.iter_content.return_value = chunks
+        mock_get2.return_value = dict(self.author, name='Adam Rosenberg')
+
+        article_feed = parse_mocked('mashable_twitter', 'twitter')
+        articles = list(self.scraper.extract_articles(article_feed))
+
+        self.scraper.create_article(articles[0])
+        mock_get1.reset_mock()
+
+        self.scraper.checkpoint.clear()
+        self.scraper.maybe_stored.clear()
+        self.assertEqual(list(self.scraper.extract_articles(article_feed)), [])
+
+        # Only the head of each page was read, nothing else was downloaded
+        self.assertEqual(mock_get1.call_count, 19)
+        self.assertEqual(mock_get1.return_value.close.call_count, 19)
+        self.assertEqual(len(self.scraper.maybe_stored), 19)
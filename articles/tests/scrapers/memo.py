@@ -0,0 +1,72 @@
+from mock import patch
+
+from lxml import etree
+
+from django.test import TestCase
+
+from articles.models import Outlet
+from articles.scrapers.engadget import Engadget
+from articles.scrapers.memo import PageMemo, page_size
+from articles.tests.utils import get_file, parse_mocked
+
+class PageMemoTestCase(TestCase):
+    """This class defines the test suite for the memo of parsed pages."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.page = etree.fromstring('<div><p>One</p><p>Two</p></div>')
+
+
+    def test_memo_page_size(self):
+        """Tests if pages are sized by their elements."""
+        self.assertEqual(page_size(self.page), 3)
+        self.assertEqual(page_size(self.page[0]), 3)
+        self.assertEqual(page_size({'json': 'body'}), 1)
+
+
+    def test_memo_least_recently_used(self):
+        """Tests if the least recently used pages are dropped first."""
+        memo = PageMemo(max_size=6)
+
+        memo.add('url:a', 'html', self.page)
+        memo.add('url:b', 'html', self.page)
+        self.assertIs(memo.get('url:a', 'html'), self.page)
+
+        memo.add('url:c', 'html', self.page)
+
+        self.assertIn(('url:a', 'html'), memo)
+        self.assertNotIn(('url:b', 'html'), memo)
+        self.assertIn(('url:c', 'html'), memo)
+        self.assertEqual(memo.size, 6)
+
+        self.assertEqual(memo.get('url:b', 'html'), None)
+        self.assertEqual((memo.hits, memo.misses), (1, 1))
+
+
+    def test_memo_too_large(self):
+        """Tests if pages larger than the whole memo are not kept."""
+        memo = PageMemo(max_size=2)
+        memo.add('url:a', 'html', self.page)
+
+        self.assertNotIn(('url:a', 'html'), memo)
+        self.assertEqual(memo.size, 0)
+
+
+    @patch('requests.Session.get')
+    def test_memo_multiple_authors(self, mock_get):
+        """Tests if an article's page is parsed once for all its authors."""
+        Outlet.objects.create(name='Engadget')
+        scraper = Engadget()
+        scraper.article_url = 'https://www.engadget.com/article'
+
+        mock_get.return_value.iter_content.return_value = [
+            get_file('engadget_single_author.html')
+        ]
+
+        # This profile page has no twitter link, so the article's one is used
+        parsed = parse_mocked('example.html', 'html')
+
+        for author_idx in range(3):
+            scraper.extract_author(parsed, author_idx)
+
+        self.assertEqual(mock_get.call_count, 1)
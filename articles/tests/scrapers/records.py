@@ -0,0 +1,71 @@
+import dateutil.parser
+
+from django.test import TestCase
+
+from articles.scrapers.records import ArticleRecord, AuthorRecord
+
+class RecordsTestCase(TestCase):
+    """This class defines the test suite for the articles' records."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.data = {
+            'title': 'Atomic Design with React',
+            'url': 'https://cheesecakelabs.com/blog/atomic-design-react/',
+            'date': dateutil.parser.parse('Fri, 8 Dec 2017 16:11:37 +0000'),
+            'content': 'How one methodology allowed me to create a great...',
+            'authors': [
+                {'name': 'Danilo Woznica', 'twitter': 'twitter.com/danilo'},
+                {'name': 'Francieli Lima'}
+            ],
+            'categories': 'Front-end',
+        }
+
+
+    def test_records_from_dict(self):
+        """Tests if records keep an article's data and give it back."""
+        record = ArticleRecord.from_dict(self.data)
+
+        self.assertEqual(record.categories, ['Front-end'])
+        self.assertIsInstance(record.authors[0], AuthorRecord)
+        self.assertEqual(record.authors[0].fields(), {
+            'twitter': 'twitter.com/danilo'
+        })
+
+        self.assertEqual(record.fields(), {
+            'title': self.data['title'], 'content': self.data['content']
+        })
+
+        self.data['categories'] = ['Front-end']
+        self.assertEqual(record.as_dict(), self.data)
+
+        # Records are not built again
+        self.assertIs(ArticleRecord.from_dict(record), record)
+
+
+    def test_records_slots(self):
+        """Tests if records cannot be given fields they do not have."""
+        record = ArticleRecord.from_dict(self.data)
+
+        self.assertFalse(hasattr(record, '__dict__'))
+
+        with self.assertRaises(AttributeError):
+            record.stranger = 'things'
+
+
+    def test_records_check(self):
+        """Tests if records check the data they are built from."""
+        unacceptable = 'There are unacceptable attributes on your request.'
+        required = 'You must provide all required parameters to add an article.'
+
+        with self.assertRaisesMessage(ValueError, unacceptable):
+            ArticleRecord.from_dict(dict(self.data, stranger='things'))
+
+        with self.assertRaisesMessage(ValueError, required):
+            ArticleRecord.from_dict(dict(self.data, authors=[]))
+
+        with self.assertRaisesMessage(ValueError, required):
+            ArticleRecord.from_dict(dict(self.data, authors=[{'about': 'Hi'}]))
+
+        with self.assertRaisesMessage(ValueError, unacceptable):
+            AuthorRecord.from_dict({'name': 'John', 'John': 'Doe'})
@@ -0,0 +1,185 @@
+import datetime
+import json
+
+import requests
+
+from mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from articles.models import Article, Feed, Outlet
+from articles.scrapers import report
+from articles.scrapers.scraper import WebScraper
+from articles.tests.utils import get_file
+
+class RunReportTestCase(TestCase):
+    """This class defines the test suite for the runs' reports."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.scraper = WebScraper()
+        self.scraper.outlet = Outlet.objects.create(name='Fictional Outlet')
+        self.scraper.feed_url = 'url:example.json'
+        self.scraper.feed_type = 'json'
+
+
+    def extract_articles(self, parsed): #pylint: disable=unused-argument
+        """Pretends to extract seven articles, one of them already stored."""
+        date = timezone.now()
+
+        for i in range(7):
+            url = 'https://fictional-outlet.com/' + str(i)
+            date -= datetime.timedelta(hours=1)
+
+            if self.scraper.reached_watermark(date, url):
+                break
+
+            if self.scraper.already_stored(url):
+                continue
+
+            yield {
+                'title': 'Article ' + str(i), 'url': url, 'date': date,
+                'content': 'Nothing to see.', 'authors': [{'name': 'Ann'}]
+            }
+
+
+    def extract_pages_articles(self, parsed): #pylint: disable=unused-argument
+        """Pretends to extract an article from a page of its own."""
+        url = 'https://failing-outlet.com/1'
+
+        if self.scraper.reached_watermark(timezone.now(), url):
+            return
+
+        records = self.scraper.extract_pages([url], 'html', 'article_info')
+
+        if records[url] is not None:
+            yield records[url]
+
+
+    def test_report_chunked(self):
+        """Tests if iterables are split in lists of a given size."""
+        chunks = list(report.chunked(iter(range(5)), 2))
+        self.assertEqual(chunks, [[0, 1], [2, 3], [4]])
+
+        self.assertEqual(list(report.chunked([], 2)), [])
+
+
+    def test_report_timed(self):
+        """Tests if only the time spent producing the items is counted."""
+        run = report.RunReport()
+
+        items = list(run.timed('extract', iter(range(3))))
+
+        self.assertEqual(items, [0, 1, 2])
+        self.assertEqual(run.times['extract'] >= 0, True)
+        self.assertEqual(run.times['store'], 0)
+
+        self.assertEqual(list(run.as_dict()), [
+            'seen', 'duplicates', 'created', 'failed', 'authors', 'downloaded',
+            'peak', 'times'
+        ])
+
+
+    @override_settings(SCRAPER_INGEST_CHUNK=2)
+    @patch('requests.Session.get')
+    def test_report_get_articles(self, mock_get):
+        """Tests if a run stores its articles in chunks and reports them."""
+        self.scraper.create_article({
+            'title': 'Article 3', 'url': 'https://fictional-outlet.com/3',
+            'date': timezone.now(), 'content': 'Nothing to see.',
+            'authors': [{'name': 'Ann'}]
+        })
+
+        self.scraper.extract_articles = self.extract_articles
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.json')
+        ]
+
+        stored = []
+        create_articles = self.scraper.create_articles
+
+        def counted(batch):
+            """Keeps how many articles each call stores."""
+            stored.append(len(batch))
+            return create_articles(batch)
+
+        with patch.object(self.scraper, 'create_articles', counted):
+            with self.assertLogs('articles.scrapers.report', 'INFO') as logs:
+                run = self.scraper.get_articles()
+
+        self.assertEqual(stored, [2, 2, 2])
+        self.assertEqual(Article.objects.count(), 7)
+
+        self.assertEqual(
+            (run.seen, run.duplicates, run.created, run.authors), (7, 1, 6, 0)
+        )
+        self.assertEqual(run.downloaded, len(get_file('example.json')))
+
+        # A single line is logged with the whole report
+        self.assertEqual(len(logs.output), 1)
+
+        logged = json.loads(logs.output[0].split('run report ')[1])
+        self.assertEqual(logged, json.loads(json.dumps(run.as_dict())))
+
+
+    @override_settings(SCRAPER_RETRIES=0)
+    @patch('requests.Session.get')
+    def test_report_failed_pages(self, mock_get):
+        """Tests if the feed is kept as it was when pages failed."""
+        self.scraper.extract_articles = self.extract_pages_articles
+
+        response = mock_get.return_value
+        response.status_code = 200
+        response.headers = {'ETag': 'abc'}
+        response.iter_content.return_value = [get_file('example.json')]
+
+        def get(url, **kwargs): #pylint: disable=unused-argument
+            """Only the feed can be downloaded."""
+            if url == self.scraper.feed_url:
+                return response
+
+            raise requests.ConnectionError('Unreachable')
+
+        mock_get.side_effect = get
+
+        with self.assertLogs('articles.scrapers.scraper', 'WARNING'):
+            run = self.scraper.get_articles()
+
+        self.assertEqual((run.seen, run.created, run.failed), (1, 0, 1))
+
+        # Neither the watermark nor the validators were saved
+        feed = Feed.objects.get(url=self.scraper.feed_url)
+        self.assertEqual((feed.last_date, feed.etag), (None, ''))
+
+    @override_settings(SCRAPER_RETRIES=0)
+    @patch('requests.Session.get')
+    def test_report_logged_always(self, mock_get):
+        """Tests if the report is logged on unchanged feeds and errors too."""
+        self.scraper.extract_articles = self.extract_articles
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.json')
+        ]
+
+        self.scraper.get_articles()
+
+        # The very same body again: nothing is extracted
+        with self.assertLogs('articles.scrapers.report', 'INFO') as logs:
+            run = self.scraper.get_articles()
+
+        self.assertEqual((run.seen, run.created), (0, 0))
+        self.assertEqual(len(logs.output), 1)
+
+        mock_get.side_effect = requests.ConnectionError('Unreachable')
+
+        with self.assertLogs('articles.scrapers.report', 'INFO') as logs:
+            with self.assertRaises(requests.ConnectionError):
+                self.scraper.get_articles()
+
+        self.assertEqual(len(logs.output), 1)
@@ -0,0 +1,82 @@
+import datetime
+
+import dateutil.parser
+
+from django.test import TestCase, override_settings
+
+from articles.models import Outlet, Article, PollSchedule
+from articles.scrapers import schedule
+
+@override_settings(
+    SCRAPER_POLL_MIN_INTERVAL=600,
+    SCRAPER_POLL_MAX_INTERVAL=86400,
+    SCRAPER_POLL_BACKOFF=2,
+    SCRAPER_POLL_LEASE=3600
+)
+class ScheduleTestCase(TestCase):
+    """This class defines the test suite for the outlets' polling schedule."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        self.outlet = Outlet.objects.create(name='Fictional Outlet')
+        self.now = dateutil.parser.parse('Fri, 8 Dec 2017 16:00:00 +0000')
+
+        # An article every two hours
+        for i in range(5):
+            Article.objects.create(
+                title='Article ' + str(i),
+                url='url:' + str(i),
+                date=self.now - datetime.timedelta(hours=2 * i),
+                content='Some content.',
+                outlet=self.outlet
+            )
+
+
+    def test_schedule_posting_interval(self):
+        """Tests if the time between articles comes from their dates."""
+        self.assertEqual(schedule.posting_interval(self.outlet), 7200)
+
+        other = Outlet.objects.create(name='Other Outlet', website='other.com')
+        self.assertEqual(schedule.posting_interval(other), None)
+
+
+    def test_schedule_record_poll(self):
+        """Tests if empty polls back off up to the maximum interval."""
+        polled = schedule.record_poll(self.outlet, 1, self.now)
+        self.assertEqual(polled.interval, 7200)
+        self.assertEqual(polled.next_poll, self.now + datetime.timedelta(hours=2))
+
+        intervals = []
+        for _ in range(6):
+            intervals += [schedule.record_poll(self.outlet, 0, self.now).interval]
+
+        self.assertEqual(intervals, [14400, 28800, 57600, 86400, 86400, 86400])
+
+        # Finding articles again ends the back off; the four articles found
+        # in two hours are averaged with the posting history.
+        later = self.now + datetime.timedelta(hours=2)
+        polled = schedule.record_poll(self.outlet, 4, later)
+
+        self.assertEqual(polled.empty_polls, 0)
+        self.assertEqual(polled.interval, (7200 + 1800) / 2)
+
+
+    def test_schedule_claim_due_outlets(self):
+        """Tests if due outlets are claimed until their poll is recorded."""
+        names = ['Fictional Outlet']
+
+        self.assertEqual(schedule.claim_due_outlets(names, self.now), names)
+        self.assertEqual(schedule.claim_due_outlets(names, self.now), [])
+
+        lease = PollSchedule.objects.get(outlet=self.outlet).next_poll
+        self.assertEqual(lease, self.now + datetime.timedelta(hours=1))
+
+        schedule.record_poll(self.outlet, 1, self.now)
+
+        later = self.now + datetime.timedelta(hours=2)
+        self.assertEqual(schedule.claim_due_outlets(names, later), names)
+
+        # Inactive outlets are never due
+        Outlet.objects.filter(id=self.outlet.id).update(active=False)
+        later += datetime.timedelta(days=2)
+        self.assertEqual(schedule.claim_due_outlets(names, later), [])
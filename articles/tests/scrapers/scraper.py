@@ -1,10 +1,15 @@
-from mock import patch
+from collections import OrderedDict
+
+from mock import patch, MagicMock
 import dateutil.parser
 
-from django.test import TestCase
+from lxml import etree, html
+
+from django.test import TestCase, override_settings
 
-from articles.models import Outlet, Author, Category, Article
+from articles.models import Outlet, Author, Category, Article, Feed
 from articles.tests.utils import get_file, parse_mocked
+from articles.scrapers import fetcher
 from articles.scrapers.scraper import WebScraper
 
 class WebScraperTestCase(TestCase):
@@ -38,10 +43,12 @@ class WebScraperTestCase(TestCase):
         }
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_ws_parse_xml(self, mock_get):
         """Tests if parsing method can parse xml with mocked data."""
-        mock_get.return_value.content = get_file('example.xml')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.xml')
+        ]
 
         parsed = self.scraper.parse('url:example.xml', 'xml')
 
@@ -49,10 +56,46 @@ class WebScraperTestCase(TestCase):
         self.assertEqual(len(parsed.getchildren()), 21)
 
 
-    @patch('requests.get')
+    def test_ws_iter_items(self):
+        """Tests if feed items are parsed from chunks and then thrown away."""
+        content = get_file('techcrunch_articles.xml')
+        chunks = [content[i:i + 1000] for i in range(0, len(content), 1000)]
+
+        titles = []
+        previous = None
+
+        for item in self.scraper.iter_items(chunks):
+            titles += [self.scraper.get_text_or_attr(item, 'title')]
+
+            # The element given before this one is already cleared
+            if previous is not None:
+                self.assertEqual(len(previous), 0)
+
+            previous = item
+
+        self.assertEqual(len(titles), 20)
+        self.assertEqual(len(set(titles)), 20)
+
+
+    @patch('requests.Session.get')
+    def test_ws_parse_xml_stream(self, mock_get):
+        """Tests if parsing method can stream xml with mocked data."""
+        content = get_file('techcrunch_articles.xml')
+        mock_get.return_value.iter_content.return_value = [content]
+
+        parsed = self.scraper.parse('url:techcrunch_articles.xml', 'xml-stream')
+
+        self.assertEqual(len(list(self.scraper.feed_items(parsed))), 20)
+        self.assertEqual(mock_get.call_args[1]['stream'], True)
+        self.assertEqual(mock_get.return_value.close.call_count, 1)
+
+
+    @patch('requests.Session.get')
     def test_ws_parse_html(self, mock_get):
         """Tests if parsing method can parse html with mocked data."""
-        mock_get.return_value.content = get_file('example.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.html')
+        ]
 
         parsed = self.scraper.parse('url:example.html', 'html')
 
@@ -60,10 +103,76 @@ class WebScraperTestCase(TestCase):
         self.assertEqual(len(parsed.getchildren()), 2)
 
 
-    @patch('requests.get')
+    def test_ws_parse_chunks(self):
+        """Tests if bodies are parsed the same from their chunks."""
+        for file_name, content_type in [('feed.xml', 'xml'), \
+                ('mashable_article.html', 'html'), ('example.json', 'json')]:
+            content = get_file(file_name)
+            chunks = [content[i:i + 100] for i in range(0, len(content), 100)]
+
+            parsed = self.scraper.parse_chunks(chunks, content_type)
+            expected = self.scraper.parse_content(content, content_type)
+
+            if content_type == 'json':
+                self.assertEqual(parsed, expected)
+            else:
+                self.assertEqual(etree.tostring(parsed), \
+                    etree.tostring(expected))
+
+
+    @patch('requests.Session.get')
+    def test_ws_parse_too_large(self, mock_get):
+        """Tests if bodies over their content type's cap fail cleanly."""
+        mock_get.return_value.headers = {}
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.html')
+        ]
+
+        with override_settings(SCRAPER_MAX_BODY_SIZE={'html': 100}):
+            with self.assertRaises(fetcher.BodyTooLarge):
+                self.scraper.parse('url:example.html', 'html')
+
+        self.assertEqual(mock_get.return_value.close.call_count, 1)
+
+
+    def test_ws_read_head(self):
+        """Tests if html is only parsed until its head is over."""
+        content = get_file('mashable_article.html')
+        chunks = iter([content[i:i + 1000] for i in range(0, len(content), 1000)])
+
+        parsed, read = self.scraper.read_head(chunks)
+
+        self.assertEqual(len(parsed.xpath('//meta[@property="og:url"]')), 1)
+        self.assertLess(len(b''.join(read)), len(content))
+        self.assertEqual(b''.join(read + list(chunks)), content)
+
+        # Documents without a head are read up to the limit
+        chunks = [b'<p>' + b'a' * 1000 + b'</p>'] * 10
+        parsed, read = self.scraper.read_head(chunks, max_size=3000)
+        self.assertEqual(len(read), 3)
+
+
+    @patch('requests.Session.get')
+    def test_ws_parse_html_head(self, mock_get):
+        """Tests if parsing method can parse only the head of html pages."""
+        content = get_file('mashable_article.html')
+        mock_get.return_value.iter_content.return_value = [
+            content[i:i + 1000] for i in range(0, len(content), 1000)
+        ]
+
+        parsed = self.scraper.parse('url:mashable_article.html', 'html-head')
+
+        self.assertEqual(self.scraper.canonical_url(parsed), \
+            'http://mashable.com/2017/12/27/library-of-congress-twitter-selective-catalog-2018/')
+        self.assertEqual(mock_get.return_value.close.call_count, 1)
+
+
+    @patch('requests.Session.get')
     def test_ws_parse_json(self, mock_get):
         """Tests if parsing method can parse json with mocked data."""
-        mock_get.return_value.text = get_file('example.json')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.json')
+        ]
 
         parsed = self.scraper.parse('url:example.json', 'json')
 
@@ -71,6 +180,100 @@ class WebScraperTestCase(TestCase):
         self.assertEqual(len(parsed), 6)
 
 
+    @patch('requests.Session.get')
+    def test_ws_prefetch(self, mock_get):
+        """Tests if prefetched pages are handed out by `get_page`."""
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.html')
+        ]
+
+        self.scraper.prefetch(['url:a', 'url:b'], 'html')
+        self.assertEqual(mock_get.call_count, 2)
+
+        parsed = self.scraper.get_page('url:a', 'html')
+        self.assertEqual(len(parsed.getchildren()), 2)
+        self.assertEqual(mock_get.call_count, 2)
+
+        # The page is kept for the rest of the run, also when prefetched again
+        self.scraper.get_page('url:a', 'html')
+        self.scraper.prefetch(['url:a', 'url:b'], 'html')
+        self.assertEqual(mock_get.call_count, 2)
+
+        # But not for the next one
+        self.scraper.pages.clear()
+        self.scraper.get_page('url:a', 'html')
+        self.assertEqual(mock_get.call_count, 3)
+
+
+    @patch('requests.Session.get')
+    def test_ws_get_articles_unchanged_feed(self, mock_get):
+        """Tests if unchanged feeds are not extracted again."""
+        self.scraper.outlet = Outlet.objects.create(name='Fictional Outlet')
+        self.scraper.feed_url = 'url:example.json'
+        self.scraper.feed_type = 'json'
+        self.scraper.extract_articles = MagicMock(return_value=[])
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {'ETag': '"v1"'}
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.json')
+        ]
+
+        # The first run stores the feed's validators
+        self.scraper.get_articles()
+        self.assertEqual(self.scraper.extract_articles.call_count, 1)
+        self.assertEqual(Feed.objects.get(url='url:example.json').etag, '"v1"')
+
+        # The second run sends them and the server says nothing changed
+        mock_get.return_value.status_code = 304
+        self.scraper.get_articles()
+
+        headers = mock_get.call_args[1]['headers']
+        self.assertEqual(headers, {'If-None-Match': '"v1"'})
+        self.assertEqual(self.scraper.extract_articles.call_count, 1)
+
+        # A server ignoring validators sends the same body again
+        mock_get.return_value.status_code = 200
+        self.scraper.get_articles()
+        self.assertEqual(self.scraper.extract_articles.call_count, 1)
+
+
+    def test_ws_reached_watermark(self):
+        """Tests if feed items are compared against the last run's newest."""
+        parse = dateutil.parser.parse
+        self.scraper.outlet = Outlet.objects.create(name='Fictional Outlet')
+
+        # Without a watermark nothing was seen before
+        self.assertEqual(self.scraper.reached_watermark(
+            parse('Fri, 8 Dec 2017 16:00:00 +0000'), 'url:1'
+        ), False)
+
+        self.scraper.watermark = (parse('Fri, 8 Dec 2017 12:00:00 +0000'), 'url:0')
+        self.scraper.newest = None
+
+        items = [
+            ('Fri, 8 Dec 2017 13:00:00 +0000', 'url:2', False),
+            ('Fri, 8 Dec 2017 12:00:00 +0000', 'url:1', True),
+            ('Fri, 8 Dec 2017 14:00:00', 'url:0', True),
+            ('Fri, 8 Dec 2017 11:30:00 +0000', 'url:x', True),
+        ]
+
+        for date, url, expected in items:
+            result = self.scraper.reached_watermark(parse(date), url)
+            self.assertEqual(result, expected)
+
+        self.assertEqual(self.scraper.newest[1], 'url:0')
+
+        # An overlap window lets late edits through
+        self.scraper.outlet.watermark_overlap = 3600
+        self.assertEqual(self.scraper.reached_watermark(
+            parse('Fri, 8 Dec 2017 11:30:00 +0000'), 'url:x'
+        ), False)
+        self.assertEqual(self.scraper.reached_watermark(
+            parse('Fri, 8 Dec 2017 10:30:00 +0000'), 'url:y'
+        ), True)
+
+
     def test_ws_classify_links(self):
         """Tests link cleaning."""
         links = [
@@ -91,10 +294,12 @@ class WebScraperTestCase(TestCase):
         ])
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_ws_html_to_string(self, mock_get):
         """Test if html conversion of a lxml item is working correctly."""
-        mock_get.return_value.content = get_file('example.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('example.html')
+        ]
 
         parsed = self.scraper.parse('url:example.html', 'html')
 
@@ -177,12 +382,14 @@ class WebScraperTestCase(TestCase):
             self.scraper.check_data(self.article_data)
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_ws_get_text_or_attr(self, mock_get):
         """Tests if function is getting text or attribute from, given an lxml
            Item's key"""
 
-        mock_get.return_value.content = get_file('feed.xml')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('feed.xml')
+        ]
 
         parsed = self.scraper.parse('url:feed.xml', 'xml')
 
@@ -202,6 +409,29 @@ class WebScraperTestCase(TestCase):
         self.assertEqual(thumbs, ['https://tctechcrunch2011.files.wordpress.com/2017/12/gettyimages-170409877.jpg?w=210&h=158&crop=1', 'https://tctechcrunch2011.files.wordpress.com/2017/12/gettyimages-170409877.jpg'])
 
 
+    def test_ws_xpath_registry(self):
+        """
+        Tests if XPath expressions are compiled once per scraper class and
+        namespaces.
+        """
+        class OtherScraper(WebScraper):
+            """A scraper with its own XPath registry."""
+            pass
+
+        compiled = self.scraper.xpath('.//dc:creator')
+
+        self.assertIs(WebScraper().xpath('.//dc:creator'), compiled)
+        self.assertIsNot(OtherScraper().xpath('.//dc:creator'), compiled)
+
+        # Changing the namespaces gives another expression
+        self.scraper.nsmap = {'dc': 'https://purl.org/dc/elements/1.1/'}
+        self.assertIsNot(self.scraper.xpath('.//dc:creator'), compiled)
+
+        self.scraper.nsmap = ['dc']
+        with self.assertRaises(ValueError):
+            self.scraper.xpath('.//dc:creator')
+
+
     def test_ws_create_article(self):
         """
         Tests if article creator helper is adding an article and its properties
@@ -256,6 +486,95 @@ class WebScraperTestCase(TestCase):
             self.assertEqual(author_data[key], result[key])
 
 
+    def test_ws_create_articles(self):
+        """
+        Tests if a batch of articles is stored with a fixed number of queries,
+        reusing the authors and categories shared among them.
+        """
+        self.scraper.outlet = Outlet.objects.create(name='Fictional Outlet')
+        Category.objects.create(name='Design', slug='design')
+
+        batch = []
+        for i in range(10):
+            data = dict(self.article_data)
+            data['url'] += str(i)
+            data['categories'] = ['Front-end', 'Design', 'category ' + str(i)]
+            batch += [data]
+
+        # Three queries (select, insert and select the new ones) for articles,
+        # authors and categories, two inserts for their relations, plus the
+        # start and release of a savepoint for the batch and for each insert.
+        with self.assertNumQueries(19):
+            articles = self.scraper.create_articles(batch)
+
+        self.assertEqual([a.url for a in articles], [d['url'] for d in batch])
+        self.assertEqual(Article.objects.count(), 10)
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(Category.objects.count(), 12)
+        self.assertEqual(articles[3].categories.count(), 3)
+        self.assertEqual(articles[3].authors.count(), 2)
+
+        # Storing them again only adds the missing relations
+        batch[0]['authors'] = batch[0]['authors'] + [{'name': 'John Doe'}]
+        articles = self.scraper.create_articles(batch)
+
+        self.assertEqual(Article.objects.count(), 10)
+        self.assertEqual(articles[0].authors.count(), 3)
+        self.assertEqual(articles[1].authors.count(), 2)
+
+
+    @override_settings(SCRAPER_INGEST_CHUNK=2)
+    def test_ws_resolve_authors_chunked(self):
+        """Tests if authors are resolved a chunk of articles at a time."""
+        self.scraper.checkpoint.authors['Ann'] = {'name': 'Ann'}
+        consumed = []
+
+        def found():
+            """Finds three articles by Ann, keeping how many were found."""
+            for i in range(3):
+                consumed.append(i)
+                yield {'url': 'url:' + str(i)}, ['Ann']
+
+        with patch.object(self.scraper, 'prefetch_authors') as prefetch:
+            articles = self.scraper.resolve_authors(found())
+
+            self.assertEqual(next(articles)['authors'], [{'name': 'Ann'}])
+            self.assertEqual(consumed, [0, 1])
+
+            self.assertEqual(len(list(articles)), 2)
+            self.assertEqual(prefetch.call_count, 2)
+
+
+    def test_ws_bulk_get_or_create_race(self):
+        """
+        Tests if instances inserted by another run between the select and the
+        insert are got instead of failing the whole insert.
+        """
+        select = Category.objects.filter
+
+        def racing(**query):
+            """Inserts a category just after the batch looks it up."""
+            found = list(select(**query))
+            Category.objects.create(name='Design', slug='design')
+            return found
+
+        defaults = OrderedDict([
+            ('design', {'name': 'Design'}), ('front-end', {'name': 'Front-end'})
+        ])
+
+        with patch.object(Category.objects, 'filter', racing):
+            categories, created = self.scraper.bulk_get_or_create(
+                Category, 'slug', defaults
+            )
+
+        self.assertEqual(created, {'front-end'})
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(
+            categories['design'], Category.objects.get(slug='design')
+        )
+        self.assertEqual(categories['front-end'].name, 'Front-end')
+
+
     def test_ws_clear_text(self):
         """Tests if lxml items are begin correctly cleaned and merged."""
         parsed = parse_mocked('cheesecakelabs_article.html', 'html')
@@ -273,3 +592,22 @@ class WebScraperTestCase(TestCase):
         content = 'This is all reflected in our great ratings and reviews featured on Cheesecake Labs profile on Clutch with client reviews. The B2B research platform&#8217;s ratings and reviews include a combination of metrics, ranging from experience in the sector and market presence to types of clients and ability to deliver awesome results delivered to clients. Furthermore, Clutch&#8217;s dedicated analysts interviewed our current and past clients to accurately portray our strengths on our profile. We are excited to celebrate these accomplishments and our great clients who showed their appreciation for our work. These honors would not have been possible without the time they took to provide their detailed client reviews.'
 
         self.assertEqual(cleared, content)
+
+
+    def test_ws_clear_text_escaping(self):
+        """
+        Tests if html elements' texts are escaped as they would be serialized,
+        skipping comments and keeping tails, scripts and strings' texts.
+        """
+        parsed = html.fromstring('<div><p>Tom &amp; Jerry &lt;3 café’s\n\t \
+            <b>big</b>  news<!-- hidden --></p> tail<p>x<script>if (a < b) \
+            {}</script></p></div>')
+
+        cleared = self.scraper.clear_text(parsed.xpath('p'))
+        content = 'Tom &amp; Jerry &lt;3 caf&#233;&#8217;s big news tail ' + \
+            'xif (a < b) {}'
+
+        self.assertEqual(cleared, content)
+
+        cleared = self.scraper.clear_text(['<p>Tom\n&amp;  Jerry</p>', None])
+        self.assertEqual(cleared, 'Tom&amp; Jerry')
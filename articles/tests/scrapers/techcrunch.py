@@ -24,12 +24,14 @@ class TechCrunchScraperTestCase(TestCase):
         }
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_tc_extr_author(self, mock_get):
         """
         Tests if an author's information can be found at the article's page.
         """
-        mock_get.return_value.content = get_file('techcrunch_author.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('techcrunch_author.html')
+        ]
 
         parsed_article = parse_mocked('techcrunch_article.html', 'html')
 
@@ -72,12 +74,14 @@ class TechCrunchScraperTestCase(TestCase):
             self.assertEqual(author[key], self.expected[key])
 
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_tc_extr_articles(self, mock_get):
         """Tests if an article list can be extracted from xml feed."""
 
         # This mock is used when some function tries to request from the web
-        mock_get.return_value.content = get_file('techcrunch_author.html')
+        mock_get.return_value.iter_content.return_value = [
+            get_file('techcrunch_author.html')
+        ]
 
         # Parses and extract information from TechCrunch Articles XML feed
         article_feed = parse_mocked('techcrunch_articles.xml', 'xml')
@@ -87,4 +91,51 @@ class TechCrunchScraperTestCase(TestCase):
         self.assertEqual(len(articles_extracted), 20)
 
         # Check data integrity on the first article (mocking makes all equal)
-        self.assertEqual(self.scraper.check_data(articles_extracted[0]), None)
+        article = articles_extracted[0]
+        self.assertEqual(self.scraper.check_data(article.as_dict()), None)
+
+        self.assertEqual(article.title, 'That time I got locked out of my Google account for a month')
+        self.assertEqual(
+            article.url,
+            'https://techcrunch.com/2017/12/22/that-time-i-got-locked-out-of-my-google-account-for-a-month/'
+        )
+        self.assertEqual([a.name for a in article.authors], ['Ron Miller'])
+        self.assertEqual(article.categories, [
+            'Cloud', 'Drama', 'Security', 'TC', 'Google', 'gmail'
+        ])
+
+
+    @patch('requests.Session.get')
+    def test_tc_extr_articles_watermark(self, mock_get):
+        """Tests if the extraction stops at the last run's newest article."""
+        mock_get.return_value.iter_content.return_value = [
+            get_file('techcrunch_author.html')
+        ]
+
+        article_feed = parse_mocked('techcrunch_articles.xml', 'xml')
+        items = article_feed.xpath('//item')
+
+        # Nothing new since the last run: no queries, no downloads
+        self.scraper.watermark = (
+            self.scraper.parse_datetime_passing_errors(
+                self.scraper.get_text_or_attr(items[0], 'pubDate')
+            ),
+            self.scraper.get_text_or_attr(items[0], 'feedburner:origLink')
+        )
+
+        with self.assertNumQueries(0):
+            articles = list(self.scraper.extract_articles(article_feed))
+
+        self.assertEqual(articles, [])
+        self.assertEqual(mock_get.call_count, 0)
+
+        # Only the three articles above the watermark are new
+        self.scraper.watermark = (
+            self.scraper.parse_datetime_passing_errors(
+                self.scraper.get_text_or_attr(items[3], 'pubDate')
+            ),
+            ''
+        )
+
+        articles = list(self.scraper.extract_articles(article_feed))
+        self.assertEqual(len(articles), 3)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+from django.test import TestCase, override_settings
+
+from articles.models import Outlet
+from articles.scrapers import workers
+from articles.scrapers.cheesecakelabs import CheesecakeLabs
+from articles.scrapers.mashable import Mashable
+from articles.tests.utils import get_file
+
+class WorkersTestCase(TestCase):
+    """This class defines the test suite for the parsing pool."""
+
+    def setUp(self):
+        """Defines the test client and other test variables."""
+        Outlet.objects.create(name='Mashable')
+        self.scraper = Mashable()
+        self.config = (Mashable, self.scraper.page_config())
+
+        self.bodies = OrderedDict([
+            ('url:a', get_file('mashable_article.html')),
+            ('url:b', None),
+            ('url:c', b''),
+        ])
+
+
+    def tearDown(self):
+        """Shuts the pool down, if a test started it."""
+        if workers.POOL is not None:
+            workers.POOL.shutdown()
+            workers.POOL = None
+
+
+    def test_workers_inline(self):
+        """Tests if pages are extracted inline while the pool is off."""
+        records = workers.extract_pages(
+            self.config, 'article_info', self.bodies, 'html'
+        )
+
+        self.assertEqual(workers.POOL, None)
+        self.assertEqual(list(records), ['url:a', 'url:b', 'url:c'])
+        self.assertEqual(records['url:a']['authors'][0]['name'], \
+            'Adam Rosenberg')
+
+        # Missing bodies and pages that can't be extracted give None
+        self.assertEqual(records['url:b'], None)
+        self.assertEqual(records['url:c'], None)
+
+
+    @override_settings(SCRAPER_PARSE_WORKERS=2)
+    def test_workers_pool(self):
+        """Tests if the pool gives the same records as the inline path."""
+        inline = workers.extract_page(
+            self.config, 'article_info', self.bodies['url:a'], 'html'
+        )
+
+        records = workers.extract_pages(
+            self.config, 'article_info', self.bodies, 'html'
+        )
+
+        self.assertNotEqual(workers.POOL, None)
+        self.assertEqual(records['url:a'], inline)
+        self.assertEqual(records['url:b'], None)
+
+
+    def test_workers_page_config(self):
+        """Tests if the extraction gets the scraper's configuration."""
+        Outlet.objects.create(name='Cheesecake Labs', website='ckl.io')
+        scraper = CheesecakeLabs()
+        config = scraper.page_config()
+
+        self.assertEqual(config['article_page_type'], 'html')
+        self.assertEqual(config['nsmap'], None)
+        self.assertNotIn('outlet', config)
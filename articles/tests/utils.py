@@ -23,17 +23,14 @@ def get_file(file_name, encoding='utf8'):
 
 
 @patch('twitter.Api.GetUserTimeline')
-@patch('requests.get')
+@patch('requests.Session.get')
 def parse_mocked(file, data_type, mock_get, mock_twitter):
     """Implements a parsing function for mocked data."""
     if data_type == 'twitter':
         pickle_in = open_file(file, 'rb', None)
         mock_twitter.return_value = pickle.load(pickle_in)
 
-    elif data_type == 'json':
-        mock_get.return_value.text = get_file(file)
-
     else:
-        mock_get.return_value.content = get_file(file)
+        mock_get.return_value.iter_content.return_value = [get_file(file)]
 
     return WebScraper.parse('', data_type)
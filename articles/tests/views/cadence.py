@@ -0,0 +1,59 @@
+import dateutil.parser
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from articles.models import Outlet, Article
+from articles.scrapers.cadence import update_cadences
+
+class CadenceViewTestCase(TestCase):
+    """Test suite for the api endpoints related to outlets' cadence."""
+
+    def setUp(self):
+        """Define the test client and other test variables."""
+        self.client = APIClient()
+
+        self.user = User.objects.create(username='nerd', is_staff=True)
+        self.outlet = Outlet.objects.create(name='TechCrunch')
+
+        for i, date in enumerate(['Fri, 8 Dec 2017 12:00:00 +0000',
+                                  'Fri, 8 Dec 2017 16:00:00 +0000']):
+            Article.objects.create(
+                title='Article ' + str(i),
+                url='url:' + str(i),
+                date=dateutil.parser.parse(date),
+                content='Some content.',
+                outlet=self.outlet
+            )
+
+        update_cadences()
+
+        self.epoint = reverse('cadences')
+
+
+    def test_retrieve_cadences_unlogged(self):
+        """Test if an unlogged user can retrieve the outlets' cadence."""
+        request = self.client.get(self.epoint)
+
+        self.assertEqual(request.status_code, status.HTTP_200_OK)
+
+        cadence = request.data['results'][0]
+        self.assertEqual(cadence['outlet']['name'], 'TechCrunch')
+        self.assertEqual(cadence['articles'], 2)
+        self.assertEqual(cadence['mean'], 4 * 3600)
+        self.assertEqual(len(cadence['hours']), 168)
+
+
+    def test_update_cadences_logged(self):
+        """Test if the cadence endpoint is read-only, even for admins."""
+        self.client.force_authenticate(user=self.user)
+
+        request = self.client.post(self.epoint, {'articles': 10})
+
+        self.assertEqual(
+            request.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
+        )
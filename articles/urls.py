@@ -9,6 +9,7 @@ urlpatterns = [
     path('authors/', views.AuthorsRetrieveView.as_view(), name='authors'),
     path('categories/', views.CategoriesRetrieveView.as_view(), name='categories'),
     path('outlets/', views.OutletsRetrieveView.as_view(), name='outlets'),
+    path('cadences/', views.CadencesRetrieveView.as_view(), name='cadences'),
 
     path('article/<int:pk>/', views.ArticleRUDView.as_view(), name='article'),
     path('author/<int:pk>/', views.AuthorRUDView.as_view(), name='author'),
@@ -3,9 +3,10 @@ from django.shortcuts import render
 from rest_framework import generics, permissions
 
 from articles.serializers import ArticleRetrieveSerializer, AuthorSerializer, \
-    CategorySerializer, OutletSerializer, ArticleSerializer
+    CategorySerializer, OutletSerializer, ArticleSerializer, \
+    OutletCadenceSerializer
 
-from articles.models import Article, Author, Category, Outlet
+from articles.models import Article, Author, Category, Outlet, OutletCadence
 
 from articles.filters import ArticleFilter, AuthorFilter, CategoryFilter, \
     OutletFilter
@@ -44,6 +45,12 @@ class OutletsRetrieveView(generics.ListAPIView):
     filter_class = OutletFilter
 
 
+class CadencesRetrieveView(generics.ListAPIView):
+    """This class handles the http GET, requests for showing all cadences."""
+    queryset = OutletCadence.objects.select_related('outlet').order_by('id')
+    serializer_class = OutletCadenceSerializer
+
+
 
 class IsAdminForUpdateAndDelete(permissions.BasePermission):
     """Custom permission class to allow non-admin users to retrieve an item."""
@@ -0,0 +1,114 @@
+"""
+This is a standalone django script comparing `WebScraper.clear_text` with the
+way it used to clean html elements: serializing them back with
+`html.tostring`, stripping their tags with Django's `strip_tags` and removing
+break lines and double spaces with two regular expressions. Both must give the
+same text for every element of the html fixtures in `articles/tests/files`,
+and they are timed on the largest `about` / `description` like bodies.
+
+Usage: python benchmarks/clear_text.py [repetitions]
+"""
+
+import os
+import re
+import sys
+import time
+
+import django
+
+from lxml import etree, html
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cklabs.settings")
+
+django.setup()
+
+from django.utils.html import strip_tags
+
+from articles.scrapers.scraper import WebScraper
+
+FILES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'articles', 'tests', 'files'
+)
+
+# The elements the scrapers clean, by fixture
+CASES = [
+    ('cheesecakelabs_article.html', './/div[@class="entry__content "]/p'),
+    ('mashable_article.html',
+     './/section[@class="article-content blueprint"]/p'),
+    ('techcrunch_author.html', '//div[contains(@class, "profile-text")]/p'),
+    ('engadget_author.html', './/div[@class="t-d3"]'),
+    ('techcrunch_article.html', '//div[contains(@class, "article-entry")]'),
+]
+
+
+def legacy_clear_text(items):
+    """The cleaning path used before reading the text nodes directly."""
+    if not isinstance(items, list):
+        items = [items]
+
+    content = ''
+
+    for item in items:
+        if isinstance(item, html.HtmlElement):
+            item = html.tostring(item).decode('utf8')
+
+        if isinstance(item, etree._Element): #pylint: disable=protected-access
+            item = item.text
+
+        if item is not None:
+            content += strip_tags(item) + ' '
+
+    content = re.sub('[\n\t]', '', content)
+    content = re.sub('[ ]{2,}', ' ', content).strip()
+
+    return content
+
+
+def load(file_name):
+    """Parses a html fixture."""
+    with open(os.path.join(FILES, file_name), 'rb') as fixture:
+        return html.fromstring(fixture.read())
+
+
+def measure(function, items, repetitions):
+    """Cleans the items a few times and returns the time per run."""
+    start = time.perf_counter()
+
+    for _ in range(repetitions):
+        function(items)
+
+    return (time.perf_counter() - start) / repetitions
+
+
+def main():
+    """Cleans every case with both paths and compares them."""
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    # Both paths must give the same text for every single element
+    for file_name in os.listdir(FILES):
+        if file_name.endswith('.html'):
+            for element in load(file_name).iter():
+                assert legacy_clear_text(element) == \
+                    WebScraper.clear_text(element), file_name
+
+    print('{:>28} {:>8} {:>12} {:>10} {:>8}'.format(
+        'fixture', 'chars', 'legacy (us)', 'fast', 'speedup'
+    ))
+
+    for file_name, xpath in CASES:
+        items = load(file_name).xpath(xpath)
+        chars = len(WebScraper.clear_text(items))
+
+        legacy = measure(legacy_clear_text, items, repetitions)
+        fast = measure(WebScraper.clear_text, items, repetitions)
+
+        print('{:>28} {:>8} {:>12.1f} {:>10.1f} {:>7.1f}x'.format(
+            file_name, chars, legacy * 1e6, fast * 1e6, legacy / fast
+        ))
+
+
+if __name__ == '__main__':
+    main()
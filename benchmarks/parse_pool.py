@@ -0,0 +1,114 @@
+"""
+This is a standalone django script measuring the throughput (pages per
+second) of extracting article pages on the parsing pool of
+`articles/scrapers/workers.py`, by how many processes it has. The bodies are
+the html article fixtures in `articles/tests/files`, repeated as many times as
+asked; 0 workers means the pages are extracted inline. The records given by
+every pool must be the same as the inline ones.
+
+Usage: python benchmarks/parse_pool.py [pages] [workers, comma separated]
+"""
+
+import os
+import sys
+import time
+
+from collections import OrderedDict
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cklabs.settings")
+
+django.setup()
+
+from django.conf import settings
+
+from articles.scrapers import workers
+from articles.scrapers.cheesecakelabs import CheesecakeLabs
+from articles.scrapers.mashable import Mashable
+
+FILES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'articles', 'tests', 'files'
+)
+
+# The article pages each scraper extracts, by fixture
+CASES = [
+    ('cheesecakelabs_article.html', CheesecakeLabs),
+    ('mashable_article.html', Mashable),
+]
+
+
+def load(file_name):
+    """Reads a html fixture's body."""
+    with open(os.path.join(FILES, file_name), 'rb') as fixture:
+        return fixture.read()
+
+
+def start_pool(count):
+    """Replaces the parsing pool by one with `count` processes."""
+    if workers.POOL is not None:
+        workers.POOL.shutdown()
+        workers.POOL = None
+
+    settings.SCRAPER_PARSE_WORKERS = count
+
+    # Start the processes beforehand, so they are not timed
+    pool = workers.get_pool()
+    if pool:
+        list(pool.map(abs, range(count)))
+
+
+def measure(scraper_class, bodies):
+    """Extracts every body once and returns the records and pages/second."""
+    start = time.perf_counter()
+
+    records = workers.extract_pages(
+        (scraper_class, {'nsmap': None}), 'article_info', bodies, 'html'
+    )
+
+    return records, len(bodies) / (time.perf_counter() - start)
+
+
+def main():
+    """Extracts every case with each pool and compares them."""
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    counts = [0, 1, 2, 4, os.cpu_count()]
+    if len(sys.argv) > 2:
+        counts = [int(count) for count in sys.argv[2].split(',')]
+
+    counts = sorted(set(counts))
+
+    print('{} cpus, {} pages per fixture'.format(os.cpu_count(), pages))
+    print('{:>28} {:>8} {:>12} {:>8}'.format(
+        'fixture', 'workers', 'pages/s', 'speedup'
+    ))
+
+    for file_name, scraper_class in CASES:
+        body = load(file_name)
+        bodies = OrderedDict(
+            ('url:{}'.format(i), body) for i in range(pages)
+        )
+
+        start_pool(0)
+        inline, baseline = measure(scraper_class, bodies)
+
+        for count in counts:
+            start_pool(count)
+            records, rate = measure(scraper_class, bodies)
+
+            # Every pool must give the very same records
+            assert records == inline, (file_name, count)
+
+            print('{:>28} {:>8} {:>12.1f} {:>7.2f}x'.format(
+                file_name, count, rate, rate / baseline
+            ))
+
+    start_pool(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+This is a standalone django script comparing the database round trips needed
+to store a feed's articles one by one, the way `create_article` used to, and
+in a single batch with `WebScraper.create_articles`. It runs on a throwaway
+test database.
+
+Usage: python benchmarks/persistence.py [number of articles]
+"""
+
+import os
+import sys
+import time
+
+import dateutil.parser
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cklabs.settings")
+
+django.setup()
+
+from django.db import connection
+from django.template.defaultfilters import slugify, title
+from django.test.utils import CaptureQueriesContext
+
+from articles.models import Author, Category, Outlet, Article
+from articles.scrapers.scraper import WebScraper
+
+
+def legacy_create_article(scraper, data):
+    """The per-article persistence path used before batching."""
+    data = dict(data)
+    url = data.pop('url')
+    categories = data.pop('categories', [])
+
+    article = {key: data[key] for key in data if isinstance(data[key], str)}
+    article['date'] = data.pop('date')
+    article['outlet_id'] = scraper.outlet.id
+
+    article, _ = Article.objects.get_or_create(url=url, defaults=article)
+
+    for author_info in data['authors']:
+        author = {k: author_info[k] for k in author_info if k != 'name'}
+        author, _ = Author.objects.get_or_create(
+            name=author_info['name'],
+            outlet_id=scraper.outlet.id,
+            defaults=author
+        )
+        article.authors.add(author)
+
+    for cat_name in categories:
+        category, _ = Category.objects.get_or_create(
+            slug=slugify(cat_name),
+            defaults={'name': title(cat_name)}
+        )
+        article.categories.add(category)
+
+    return article
+
+
+def synthetic_articles(prefix, count):
+    """Builds articles sharing a few authors and categories, like a feed."""
+    date = dateutil.parser.parse('Fri, 8 Dec 2017 16:11:37 +0000')
+
+    return [{
+        'title': 'Article ' + str(i),
+        'url': 'https://outlet.com/' + prefix + '/' + str(i),
+        'date': date,
+        'content': 'Some content.',
+        'authors': [
+            {'name': 'Author ' + str(i % 5), 'about': 'Writes.'},
+            {'name': 'Author ' + str((i + 1) % 5)},
+        ],
+        'categories': ['Tag ' + str((i + j) % 10) for j in range(3)],
+    } for i in range(count)]
+
+
+def measure(function, articles):
+    """Runs a persistence function and returns its queries and time."""
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        function(articles)
+        elapsed = time.perf_counter() - start
+
+    return len(queries), elapsed
+
+
+def main():
+    """Stores the same kind of batch with both paths and compares them."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        scraper = WebScraper()
+        scraper.outlet = Outlet.objects.create(name='Benchmark Outlet')
+
+        legacy = measure(
+            lambda batch: [legacy_create_article(scraper, d) for d in batch],
+            synthetic_articles('legacy', count)
+        )
+
+        batch = measure(
+            scraper.create_articles, synthetic_articles('batch', count)
+        )
+
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+    print('{} articles, 2 authors and 3 categories each'.format(count))
+    print('{:>10} {:>10} {:>12} {:>10}'.format(
+        'path', 'queries', 'per article', 'ms'
+    ))
+
+    for name, (queries, elapsed) in [('one by one', legacy), ('batch', batch)]:
+        print('{:>10} {:>10} {:>12.2f} {:>10.1f}'.format(
+            name, queries, queries / count, elapsed * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
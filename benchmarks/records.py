@@ -0,0 +1,216 @@
+"""
+This is a standalone django script comparing the plain dictionaries the
+extractors used to hand to `WebScraper.create_articles` with the slotted
+records of `articles/scrapers/records.py`. For thousands of synthetic articles
+it measures how long checking them and splitting them into the articles',
+authors' and categories' fields takes, and how much memory their containers
+take (the strings and dates they hold are the same for both). Both paths must
+give the very same fields.
+
+The containers' sizes are only what each kept article takes. They are not an
+allocation saving: the extractors still build a dictionary first and the
+record is built from it, so the dictionaries are allocated anyway.
+
+Usage: python benchmarks/records.py [number of articles]
+"""
+
+import gc
+import os
+import sys
+import time
+
+from collections import OrderedDict
+
+import dateutil.parser
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cklabs.settings")
+
+django.setup()
+
+from articles.scrapers.records import ArticleRecord
+
+
+def legacy_check_data(data):
+    """The check made on every dictionary before the records."""
+    required = {
+        'article': ['title', 'url', 'date', 'content', 'authors'],
+        'authors': ['name']
+    }
+
+    accepted = {
+        'article': required['article'] + ['categories', 'thumb'],
+        'authors': required['authors'] + ['twitter', 'avatar', 'facebook',\
+            'linkedin', 'about', 'profile', 'website']
+    }
+
+    req = required['article'][::]
+
+    for key in data:
+        if key not in accepted['article']:
+            raise ValueError('unacceptable')
+
+        if key in required['article']:
+            req.remove(key)
+
+    if req:
+        raise ValueError('required')
+
+    for author in data['authors']:
+        req = required['authors'][::]
+
+        for key in author:
+            if key not in accepted['authors']:
+                raise ValueError('unacceptable')
+
+            if key in required['authors']:
+                req.remove(key)
+
+        if req:
+            raise ValueError('required')
+
+    if not data['authors']:
+        raise ValueError('required')
+
+
+def legacy_split(articles):
+    """Checks and splits dictionaries the way `create_articles` used to."""
+    for data in articles:
+        legacy_check_data(data)
+
+    fields = OrderedDict()
+    authors = OrderedDict()
+    links = []
+
+    for data in articles:
+        url = data['url']
+
+        article = {k: data[k] for k in data if isinstance(data[k], str)}
+        del article['url']
+        article['date'] = data['date']
+
+        fields.setdefault(url, article)
+
+        for author_info in data['authors']:
+            author = {k: author_info[k] for k in author_info if k != 'name'}
+            authors.setdefault(author_info['name'], author)
+
+        links += [(url, [a['name'] for a in data['authors']])]
+
+    return fields, authors, links
+
+
+def records_split(records):
+    """Splits the articles' records the way `create_articles` does now."""
+    fields = OrderedDict()
+    authors = OrderedDict()
+    links = []
+
+    for record in records:
+        url = record.url
+
+        article = record.fields()
+        article['date'] = record.date
+
+        fields.setdefault(url, article)
+
+        for author in record.authors:
+            if author.name not in authors:
+                authors[author.name] = author.fields()
+
+        links += [(url, [a.name for a in record.authors])]
+
+    return fields, authors, links
+
+
+def synthetic_articles(count):
+    """Builds articles with a couple of authors and categories, like a feed."""
+    date = dateutil.parser.parse('Fri, 8 Dec 2017 16:11:37 +0000')
+
+    return [{
+        'title': 'Article ' + str(i),
+        'url': 'https://outlet.com/' + str(i),
+        'date': date,
+        'content': 'Some content.',
+        'thumb': 'https://outlet.com/' + str(i) + '.jpg',
+        'authors': [
+            {'name': 'Author ' + str(i % 5), 'about': 'Writes.'},
+            {'name': 'Author ' + str((i + 1) % 5), 'twitter': 'twitter.com'},
+        ],
+        'categories': ['Tag ' + str((i + j) % 10) for j in range(3)],
+    } for i in range(count)]
+
+
+def container_size(article):
+    """Sums the sizes of an article's containers and its authors' ones."""
+    if isinstance(article, dict):
+        authors, categories = article['authors'], article['categories']
+    else:
+        authors, categories = article.authors, article.categories
+
+    return sys.getsizeof(article) + sys.getsizeof(authors) + \
+        sys.getsizeof(categories) + sum(sys.getsizeof(a) for a in authors)
+
+
+def measure(function, *args, repeat=5):
+    """
+    Runs a function a few times and returns its result and best time. The
+    garbage collector is off meanwhile, as `timeit` does, so its passes over
+    everything allocated so far are not timed.
+    """
+    best = None
+    gc.disable()
+
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function(*args)
+            elapsed = time.perf_counter() - start
+
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+
+    return result, best
+
+
+def main():
+    """Builds, checks and splits the same articles with both paths."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    dicts = synthetic_articles(count)
+
+    # Records are checked once, when the extractors build them
+    records, build = measure(
+        lambda: [ArticleRecord.from_dict(data) for data in dicts]
+    )
+
+    # Checking and splitting them, once extracted
+    _, check = measure(lambda: [legacy_check_data(data) for data in dicts])
+    legacy, legacy_time = measure(legacy_split, dicts)
+    split, split_time = measure(records_split, records)
+
+    assert legacy == split
+
+    print('{} articles, 2 authors and 3 categories each'.format(count))
+    print('{:>26} {:>12} {:>12}'.format('', 'dicts', 'records'))
+    print('{:>26} {:>12.2f} {:>12.2f}'.format(
+        'check and split (us/item)', legacy_time / count * 1e6,
+        (build + split_time) / count * 1e6
+    ))
+    print('{:>26} {:>12.2f} {:>12.2f}'.format(
+        '  of which checking', check / count * 1e6, build / count * 1e6
+    ))
+    print('{:>26} {:>12.0f} {:>12.0f}'.format(
+        'containers (bytes/item)', sum(map(container_size, dicts)) / count,
+        sum(map(container_size, records)) / count
+    ))
+    print('\nContainers are what each kept article takes, not allocations '
+          'saved: every\nrecord is built from a dictionary, which is allocated '
+          'all the same.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+This is a standalone django script comparing the time spent extracting the
+fields of each feed item (and author page) from the fixtures in
+`articles/tests/files`, using `get_text_or_attr` the way it used to be, which
+compiled its expression on every call, and the compiled XPath registry.
+
+Usage: python benchmarks/xpath.py [repetitions]
+"""
+
+import os
+import sys
+import time
+
+import django
+
+from lxml import etree, html
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cklabs.settings")
+
+django.setup()
+
+from articles.scrapers.scraper import WebScraper
+
+FILES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'articles', 'tests', 'files'
+)
+
+# The lookups each scraper does on every feed item or author page
+CASES = [
+    ('techcrunch_articles.xml', 'item', None, [
+        ('title', None), ('category', None), ('feedburner:origLink', None),
+        ('pubDate', None), ('media:thumbnail', 'url'), ('dc:creator', None),
+    ]),
+    ('engadget_articles.xml', 'item', {
+        'dc': 'https://purl.org/dc/elements/1.1/'
+    }, [
+        ('title', None), ('category', None), ('link', None),
+        ('pubDate', None), ('description', None), ('dc:creator', None),
+    ]),
+    ('engadget_author.html', None, None, [
+        ('div/span/a', 'href'), ('meta[@property="og:url"]', 'content'),
+        ('meta[@name="twitter:image"]', 'content'),
+    ]),
+    ('mashable_article.html', None, None, [
+        ('meta[@property="og:title"]', 'content'),
+        ('meta[@property="og:url"]', 'content'),
+        ('meta[@name="author"]', 'content'),
+        ('meta[@name="keywords"]', 'content'),
+    ]),
+]
+
+
+def legacy_get_text_or_attr(scraper, item, key, attr=None):
+    """The lookup path used before the XPath registry."""
+    nsmap = {
+        'dc': 'http://purl.org/dc/elements/1.1/',
+        'media': 'http://search.yahoo.com/mrss/',
+        'feedburner': 'http://rssnamespace.org/feedburner/ext/1.0',
+    }
+
+    if scraper.nsmap:
+        nsmap.update(scraper.nsmap)
+
+    search = item.xpath('.//' + key, namespaces=nsmap)
+
+    if attr:
+        items = [found.get(attr) for found in search]
+    else:
+        items = [found.text for found in search]
+
+    if len(items) == 1:
+        return items[0]
+
+    return items
+
+
+def load(file_name, tag):
+    """Parses a fixture, giving its feed items or its whole page."""
+    with open(os.path.join(FILES, file_name), 'rb') as fixture:
+        content = fixture.read()
+
+    if tag:
+        return etree.fromstring(content).xpath('//' + tag)
+
+    return [html.fromstring(content)]
+
+
+def measure(function, scraper, items, lookups, repetitions):
+    """Runs every lookup on every item and returns the time per item."""
+    start = time.perf_counter()
+
+    for _ in range(repetitions):
+        for item in items:
+            for key, attr in lookups:
+                function(scraper, item, key, attr)
+
+    return (time.perf_counter() - start) / (repetitions * len(items))
+
+
+def main():
+    """Extracts every fixture's items with both paths and compares them."""
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print('{:>24} {:>6} {:>12} {:>12} {:>8}'.format(
+        'fixture', 'items', 'legacy (us)', 'compiled', 'speedup'
+    ))
+
+    for file_name, tag, nsmap, lookups in CASES:
+        scraper = WebScraper()
+        scraper.nsmap = nsmap
+        items = load(file_name, tag)
+
+        # Both paths must find exactly the same things
+        for item in items:
+            for key, attr in lookups:
+                assert legacy_get_text_or_attr(scraper, item, key, attr) == \
+                    scraper.get_text_or_attr(item, key, attr)
+
+        legacy = measure(
+            legacy_get_text_or_attr, scraper, items, lookups, repetitions
+        )
+
+        compiled = measure(
+            WebScraper.get_text_or_attr, scraper, items, lookups, repetitions
+        )
+
+        print('{:>24} {:>6} {:>12.1f} {:>12.1f} {:>7.1f}x'.format(
+            file_name, len(items), legacy * 1e6, compiled * 1e6,
+            legacy / compiled
+        ))
+
+
+if __name__ == '__main__':
+    main()
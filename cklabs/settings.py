@@ -85,6 +85,88 @@ REST_FRAMEWORK = {
 }
 
 
+# Scrapers' fetching configs
+SCRAPER_CONCURRENCY = int(os.environ.get('SCRAPER_CONCURRENCY', 8))
+SCRAPER_MAX_CONNECTIONS = 16
+SCRAPER_POOL_HOSTS = 10
+SCRAPER_POOL_SIZE = 4
+SCRAPER_CONNECT_TIMEOUT = 5
+SCRAPER_READ_TIMEOUT = 30
+SCRAPER_CHUNK_SIZE = 16 * 1024
+
+# Bytes read at most from a page when only its head is parsed
+SCRAPER_HEAD_MAX_SIZE = 64 * 1024
+
+# Downloads of bodies larger than these (in bytes) fail; streamed ones may be
+# larger, since they are never held at once
+SCRAPER_MAX_BODY_SIZE = {
+    'html': 5 * 1024 * 1024,
+    'html-head': 5 * 1024 * 1024,
+    'xml': 10 * 1024 * 1024,
+    'json': 10 * 1024 * 1024,
+    'xml-stream': 50 * 1024 * 1024,
+}
+
+# Every run must be over within its deadline (in seconds). Transient errors
+# are retried with a backoff doubling from `SCRAPER_RETRY_BACKOFF` seconds,
+# and hosts failing that many times in a row are left alone for a while.
+SCRAPER_RUN_DEADLINE = 15 * 60
+SCRAPER_RETRIES = 2
+SCRAPER_RETRY_BACKOFF = 1
+SCRAPER_BREAKER_FAILURES = 5
+SCRAPER_BREAKER_COOLDOWN = 5 * 60
+
+
+# The response cache is only used if a directory is given
+SCRAPER_CACHE_DIR = os.environ.get('SCRAPER_CACHE_DIR')
+SCRAPER_CACHE_MAX_SIZE = 200 * 1024 * 1024
+SCRAPER_CACHE_TTL = {
+    'html': 7 * 24 * 60 * 60,
+    'xml': 15 * 60,
+    'json': 15 * 60,
+}
+
+
+# Index of the stored articles' urls, rebuilt from the database if not saved
+SCRAPER_URL_INDEX = os.environ.get('SCRAPER_URL_INDEX')
+SCRAPER_URL_INDEX_CAPACITY = 1000000
+SCRAPER_URL_INDEX_ERROR_RATE = 0.001
+
+
+# Seconds an outlet looked up by name is kept by each worker
+SCRAPER_IDENTITY_TTL = 300
+
+
+# Elements of the parsed pages kept along a scraper's run (article pages have
+# from a few hundred to a few thousand)
+SCRAPER_PAGE_MEMO_SIZE = 100000
+
+
+# Processes where article pages are parsed and extracted (0 extracts them on
+# the calling thread, which celery's prefork workers require)
+SCRAPER_PARSE_WORKERS = int(os.environ.get('SCRAPER_PARSE_WORKERS', 0))
+
+
+# An interrupted run's progress is saved every few pages or authors, and it is
+# resumed by the outlet's next run within a day
+SCRAPER_CHECKPOINT_EVERY = 10
+SCRAPER_CHECKPOINT_TTL = 24 * 60 * 60
+
+# Articles stored at once while a run goes on, see `articles.scrapers.report`
+SCRAPER_INGEST_CHUNK = 50
+
+
+# Outlets are polled as often as they post, within these bounds (in seconds),
+# backing off after empty polls; see `articles.scrapers.schedule`.
+SCRAPER_POLL_MIN_INTERVAL = 15 * 60
+SCRAPER_POLL_MAX_INTERVAL = 24 * 60 * 60
+SCRAPER_POLL_BACKOFF = 2
+SCRAPER_POLL_HISTORY = 20
+
+# Seconds an outlet being polled is not polled again, unless its run is over
+SCRAPER_POLL_LEASE = 60 * 60
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {